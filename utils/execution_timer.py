@@ -22,15 +22,816 @@
             main_context()
             time.sleep(1)
             duration_ns: int = timer.get_duration_ns()
+
+        # Using statistics of a decorated function (every call is timed from its own start)
+        @ExecutionTimer(display_time=False)
+        def work():
+            time.sleep(0.01)
+        for _ in range(100):
+            work()
+        summary: TimerSummary = work.stats.summary()
+        print(summary.count, summary.mean_ns, summary.p95_ns)
+
+        # Using span tracing (nested timers form a tree, also across threads and asyncio tasks)
+        tracer: SpanTracer = start_tracing()
+        with ExecutionTimer(name='pipeline', display_time=False):
+            with ExecutionTimer(name='extract', display_time=False):
+                time.sleep(0.1)
+            with ExecutionTimer(name='synthesize', display_time=False):
+                time.sleep(0.2)
+        stop_tracing()
+        tracer.save_chrome_trace('pipeline_trace.json')  # chrome://tracing or ui.perfetto.dev
+        tracer.save_speedscope('pipeline.speedscope.json')  # www.speedscope.app
+
+        # Using with coroutines and async generators (wall time, time running and time suspended)
+        @ExecutionTimer()
+        async def synthesize():
+            await asyncio.sleep(1)
+
+        async with ExecutionTimer():  # wall time only, the steps of the awaiting task are not visible here
+            await synthesize()
+
+        # Using with generators (the iteration is timed: items/s, time to the first item, latency of every item,
+        # time spent in the producer versus the consumer), also for any iterable with `iterate`
+        @ExecutionTimer(display_time=False)
+        def chunks(text):
+            yield from chunk_text(text)
+        for chunk in chunks(text):
+            synthesize(chunk)
+        print(chunks.stream.summary())
+
+        timer = ExecutionTimer(display_time=False)
+        for root, dirs, files in timer.iterate(os.walk('books'), 'walk'):
+            ...
+        print(timer.get_stream_stats('walk'))
+
+        # Using the lean mode for hot functions (only perf_counter_ns, own overhead subtracted)
+        @ExecutionTimer(lean=True)
+        def hot(x):
+            return x * 2
+        for i in range(1_000_000):
+            hot(i)
+        print(hot.stats.summary().mean_ns)
+
+        # Using sampling (only every 100th call is timed, count and total are extrapolated)
+        @ExecutionTimer(lean=True, every_n=100)
+        def hotter(x):
+            return x * 2
+
+        # Using CPU, thread and memory metrics (each one is switched on separately)
+        with ExecutionTimer(measure_process_time=True, measure_memory=True, measure_rss=True) as timer:
+            data = [str(i) for i in range(1_000_000)]
+        print(timer.get_metrics())
+
+        # Using a latency threshold (calls slower than 0.5 s are profiled and dumped to working_space/output/profiles)
+        @ExecutionTimer(display_time=False, profile_threshold_ns=500_000_000)
+        def synthesize(chunk):
+            ...
+
+        # Using the benchmark (auto-scaled loops, median and MAD, comparison with a baseline JSON file)
+        result: BenchResult = ExecutionTimer.bench(sorted, list(range(1000)), warmup=3, repeat=7, min_time=0.2,
+                                                   baseline='benchmarks.json', tolerance=0.10)
+        if result.regression:
+            print(f"{result.name} is {result.change:.0%} slower than the baseline")
+
+        # Using the history (every finished run is stored in SQLite, see utils.timer_history for the reports)
+        history: TimerHistory = TimerHistory('working_space/output/timer_history.sqlite3')
+        @ExecutionTimer(display_time=False, history=history, tags={'stage': 'tts'})
+        def synthesize(chunk):
+            ...
 """
 
+import cProfile
+import gc
+import inspect
+import json
+import os
+import pstats
+import random
+import reprlib
+import statistics
+import sys
+import tracemalloc
+from array import array
+from io import StringIO
+from contextvars import ContextVar, Token
 from datetime import datetime
-from time import perf_counter_ns
-from typing import Optional, Tuple, Any, Callable
+from functools import wraps
+from itertools import count, cycle
+from threading import Lock, current_thread, get_ident
+from time import perf_counter_ns, process_time_ns, thread_time_ns
+from operator import length_hint
+from typing import (Dict, Generator, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Any, Awaitable,
+                    Callable, TYPE_CHECKING)
+from weakref import WeakSet
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from rich.console import Console
 
+try:
+    import psutil
+except ImportError:  # psutil is optional, without it RSS is read from /proc (Linux only)
+    psutil = None
+
+if TYPE_CHECKING:
+    from utils.timer_history import TimerHistory
+
+try:
+    from constant.constant import WORKING_SPACE_OUTPUT
+except ImportError:  # run outside of the project root
+    WORKING_SPACE_OUTPUT = os.path.join(os.getcwd(), 'working_space', 'output')
+
+
+class TimerSummary(NamedTuple):
+    name: str
+    count: int
+    total_ns: int
+    min_ns: int
+    max_ns: int
+    mean_ns: float
+    p50_ns: int
+    p95_ns: int
+    p99_ns: int
+    running_ns: int
+    longest_step_ns: int
+    stepped: int
+    sampled: int
+    metrics: Dict[str, int]
+
+
+class BenchResult(NamedTuple):
+    name: str
+    loops: int
+    repeat: int
+    median_ns: float
+    mad_ns: float
+    min_ns: float
+    max_ns: float
+    baseline_ns: Optional[float]
+    change: Optional[float]
+    regression: bool
+
+
+class StreamSummary(NamedTuple):
+    name: str
+    runs: int
+    items: int
+    total_ns: int
+    producer_ns: int
+    consumer_ns: int
+    items_per_s: float
+    first_item_ns: float
+    first_item_max_ns: int
+    item_p50_ns: int
+    item_p95_ns: int
+    item_p99_ns: int
+    item_max_ns: int
+
+
+class TimerStats:
+    """
+    TimerStats keeps running aggregates of durations: count, total, min, max
+    and a compact log-linear histogram for percentiles.
+
+    With sampling only a part of the calls is added: count, total and running time are extrapolated
+    by `sample_rate`, the other aggregates are those of the timed calls.
+
+    Optional metrics of the calls (process and thread CPU time, RSS delta) are summed,
+    of the peak memory the largest is kept.
+
+    For coroutines the time actually running (total) and the longest uninterrupted step are kept too,
+    a long step means the event loop was blocked. A synchronous call runs in one step.
+    Calls whose steps are unknown (`async with` blocks) are left out of both, `stepped` counts the others.
+
+    The histogram keeps 32 buckets per power of two, so a percentile is accurate
+    to about 3% whatever the number of calls, in at most about a thousand counters.
+
+    Examples:
+        >>> stats = TimerStats('work')
+        >>> for duration_ns in (100, 200, 300):
+        ...     stats.add(duration_ns)
+        >>> stats.summary().count
+        3
+    """
+
+    __slots__ = ('name', 'count', 'total_ns', 'min_ns', 'max_ns', 'running_ns', 'longest_step_ns', 'stepped',
+                 'sample_rate', 'metrics', 'recorder', '_buckets', '_lock', '__weakref__')
+
+    BUCKET_BITS: int = 6
+
+    def __init__(self, name: str = '') -> None:
+        self.name: str = name
+        self.count: int = 0
+        self.total_ns: int = 0
+        self.min_ns: int = 0
+        self.max_ns: int = 0
+        self.running_ns: int = 0
+        self.longest_step_ns: int = 0
+        self.stepped: int = 0
+        self.sample_rate: float = 1.0
+        self.metrics: Dict[str, int] = {}
+        self.recorder: Optional[LeanRecorder] = None
+        self._buckets: Dict[int, int] = {}
+        self._lock: Lock = Lock()
+
+    @classmethod
+    def _bucket(cls, duration_ns: int) -> int:
+        """Returns the histogram bucket of a duration: the exponent and the top 6 bits of the value"""
+        shift: int = max(duration_ns.bit_length() - cls.BUCKET_BITS, 0)
+        return (shift << cls.BUCKET_BITS) | (duration_ns >> shift)
+
+    @classmethod
+    def _bucket_value(cls, bucket: int) -> int:
+        """Returns the middle of the range of durations in a bucket"""
+        shift: int = bucket >> cls.BUCKET_BITS
+        mantissa: int = bucket & ((1 << cls.BUCKET_BITS) - 1)
+        return (mantissa << shift) + ((1 << shift) >> 1)
+
+    def add(self, duration_ns: int, running_ns: Optional[int] = None, longest_step_ns: Optional[int] = None,
+            metrics: Optional[Dict[str, int]] = None, steps_known: bool = True) -> None:
+        """
+            Adds one measured duration, with the running time and the longest step of a coroutine
+            (both the duration if not given, `steps_known=False` - unknown, e.g. of an `async with` block)
+        """
+        duration_ns = max(duration_ns, 0)
+        bucket: int = self._bucket(duration_ns)
+        with self._lock:
+            if metrics:
+                for key, value in metrics.items():
+                    if key == 'memory_peak_bytes':
+                        self.metrics[key] = max(self.metrics.get(key, 0), value)
+                    else:
+                        self.metrics[key] = self.metrics.get(key, 0) + value
+            if steps_known:
+                self.stepped += 1
+                self.running_ns += duration_ns if running_ns is None else running_ns
+                step_ns: int = duration_ns if longest_step_ns is None else longest_step_ns
+                if step_ns > self.longest_step_ns:
+                    self.longest_step_ns = step_ns
+            if not self.count or duration_ns < self.min_ns:
+                self.min_ns = duration_ns
+            if duration_ns > self.max_ns:
+                self.max_ns = duration_ns
+            self.count += 1
+            self.total_ns += duration_ns
+            self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+
+    def add_many(self, durations: List[int]) -> None:
+        """Adds many measured durations of synchronous calls at once"""
+        if not durations:
+            return
+        bits: int = self.BUCKET_BITS
+        counts: Dict[int, int] = {}
+        for duration_ns in durations:
+            shift: int = duration_ns.bit_length() - bits
+            bucket: int = (shift << bits) | (duration_ns >> shift) if shift > 0 else duration_ns
+            counts[bucket] = counts.get(bucket, 0) + 1
+        low: int = min(durations)
+        high: int = max(durations)
+        total: int = sum(durations)
+        with self._lock:
+            if not self.count or low < self.min_ns:
+                self.min_ns = low
+            if high > self.max_ns:
+                self.max_ns = high
+            if high > self.longest_step_ns:
+                self.longest_step_ns = high
+            self.count += len(durations)
+            self.stepped += len(durations)
+            self.total_ns += total
+            self.running_ns += total
+            buckets: Dict[int, int] = self._buckets
+            for bucket, count in counts.items():
+                buckets[bucket] = buckets.get(bucket, 0) + count
+
+    def percentile(self, percent: float) -> int:
+        """Returns the approximate duration below which `percent` percent of the calls fall"""
+        if self.recorder is not None:
+            self.recorder.flush()
+        with self._lock:
+            if not self.count:
+                return 0
+            rank: float = self.count * percent / 100
+            seen: int = 0
+            for bucket in sorted(self._buckets):
+                seen += self._buckets[bucket]
+                if seen >= rank:
+                    return min(max(self._bucket_value(bucket), self.min_ns), self.max_ns)
+            return self.max_ns
+
+    def buckets(self) -> List[Tuple[int, int]]:
+        """Returns the histogram as (duration, number of timed calls) pairs sorted by duration"""
+        if self.recorder is not None:
+            self.recorder.flush()
+        with self._lock:
+            return [(self._bucket_value(bucket), self._buckets[bucket]) for bucket in sorted(self._buckets)]
+
+    def summary(self) -> TimerSummary:
+        """Returns all aggregates at once"""
+        if self.recorder is not None:
+            self.recorder.flush()
+        scale: float = 1 / self.sample_rate
+        return TimerSummary(
+            self.name, round(self.count * scale), round(self.total_ns * scale), self.min_ns, self.max_ns,
+            self.total_ns / self.count if self.count else 0.0,
+            self.percentile(50), self.percentile(95), self.percentile(99),
+            round(self.running_ns * scale), self.longest_step_ns, round(self.stepped * scale), self.count,
+            {key: value if key == 'memory_peak_bytes' else round(value * scale) for key, value in self.metrics.items()}
+        )
+
+    def reset(self) -> None:
+        """Forgets all measured durations"""
+        with self._lock:
+            self.count = self.total_ns = self.min_ns = self.max_ns = 0
+            self.running_ns = self.longest_step_ns = self.stepped = 0
+            self.metrics.clear()
+            self._buckets.clear()
+
+    @classmethod
+    def merged(cls, name: str, parts: Iterable['TimerStats']) -> 'TimerStats':
+        """
+            Returns new statistics combining the parts, e.g. all timers of one name.
+            Sampled parts are extrapolated by their sample rate, so the result has the sample rate 1.
+        """
+        merged: TimerStats = cls(name)
+        for part in parts:
+            if part.recorder is not None:
+                part.recorder.flush()
+            scale: float = 1 / part.sample_rate
+            with part._lock:
+                if not part.count:
+                    continue
+                if not merged.count or part.min_ns < merged.min_ns:
+                    merged.min_ns = part.min_ns
+                merged.max_ns = max(merged.max_ns, part.max_ns)
+                merged.longest_step_ns = max(merged.longest_step_ns, part.longest_step_ns)
+                merged.count += round(part.count * scale)
+                merged.total_ns += round(part.total_ns * scale)
+                merged.running_ns += round(part.running_ns * scale)
+                merged.stepped += round(part.stepped * scale)
+                for key, value in part.metrics.items():
+                    if key == 'memory_peak_bytes':
+                        merged.metrics[key] = max(merged.metrics.get(key, 0), value)
+                    else:
+                        merged.metrics[key] = merged.metrics.get(key, 0) + round(value * scale)
+                for bucket, calls in part._buckets.items():
+                    merged._buckets[bucket] = merged._buckets.get(bucket, 0) + round(calls * scale)
+        return merged
+
+
+class StreamStats:
+    """
+    StreamStats keeps the aggregates of timed iterations of a generator or any iterable:
+    `runs` - one duration per iteration, from the first item requested until it is exhausted or closed,
+    with the time spent in the producer as its running time (the rest is time spent in the consumer),
+    `items` - the latency of every item (time in the producer until the item was ready),
+    `first_item` - the time to the first item of every iteration.
+
+    Examples:
+        >>> stream = StreamStats(TimerStats('chunks'))
+        >>> stream.add_run(total_ns=10_000, producer_ns=6_000, latencies=[4_000, 1_000, 1_000])
+        >>> stream.summary().items, stream.summary().consumer_ns
+        (3, 4000)
+    """
+
+    __slots__ = ('name', 'runs', 'items', 'first_item')
+
+    def __init__(self, runs: TimerStats) -> None:
+        self.name: str = runs.name
+        self.runs: TimerStats = runs
+        self.items: TimerStats = TimerStats(f'{runs.name}.item')
+        self.first_item: TimerStats = TimerStats(f'{runs.name}.first_item')
+
+    def add_run(self, total_ns: int, producer_ns: int, latencies: List[int], first_item_ns: Optional[int] = None,
+                longest_item_ns: int = 0, metrics: Optional[Dict[str, int]] = None) -> None:
+        """
+            Adds one iteration: its wall time, the time spent in the producer and the item latencies
+            not added yet with `add_items` (the first item is the first of `latencies` if not given,
+            `longest_item_ns` - the longest of the latencies added before).
+        """
+        if first_item_ns is None and latencies:
+            first_item_ns = latencies[0]
+        if first_item_ns is not None:
+            self.first_item.add(first_item_ns)
+        self.add_items(latencies)
+        self.runs.add(total_ns, producer_ns, max(max(latencies, default=0), longest_item_ns), metrics)
+
+    def add_items(self, latencies: List[int]) -> None:
+        """Adds item latencies of a long iteration before its end"""
+        self.items.add_many(latencies)
+
+    def summary(self) -> StreamSummary:
+        """Returns all aggregates at once, the consumer time is the wall time not spent in the producer"""
+        runs: TimerSummary = self.runs.summary()
+        items: TimerSummary = self.items.summary()
+        first_item: TimerSummary = self.first_item.summary()
+        return StreamSummary(
+            self.name, runs.count, items.count, runs.total_ns, runs.running_ns, runs.total_ns - runs.running_ns,
+            items.count / runs.total_ns * 1_000_000_000 if runs.total_ns else 0.0,
+            first_item.mean_ns, first_item.max_ns, items.p50_ns, items.p95_ns, items.p99_ns, items.max_ns
+        )
+
+    def reset(self) -> None:
+        """Forgets all measured iterations"""
+        self.runs.reset()
+        self.items.reset()
+        self.first_item.reset()
+
+
+def format_ns(duration_ns: float) -> str:
+    """Formats a duration with a unit from ns to s, e.g. '12.345 ms'"""
+    for unit, scale in (('s', 1_000_000_000), ('ms', 1_000_000), ('µs', 1_000)):
+        if duration_ns >= scale:
+            return f'{duration_ns / scale:.3f} {unit}'
+    return f'{duration_ns:.0f} ns'
+
+
+def current_rss() -> Optional[int]:
+    """Returns the resident set size of the process in bytes, or None if it cannot be read"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm', encoding='ascii') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+_profiler_active: bool = False
+_profiler_lock: Lock = Lock()
+
+# Starting values of the open timers measuring memory: tracemalloc is started with the first one (unless it was
+# tracing already) and stopped after the last one, the peak so far is folded into all of them before every reset
+_memory_starts: List[Dict[str, Any]] = []
+_memory_started: bool = False
+_memory_lock: Lock = Lock()
+
+
+_lean_overhead_ns: Optional[int] = None
+
+
+def calibrate_overhead(samples: int = 20_001) -> int:
+    """
+        Measures the time the lean timer adds to every measurement (two `perf_counter_ns` calls with nothing
+        between them), as the median of `samples` measurements. It runs once, on the first lean timer.
+    """
+    global _lean_overhead_ns
+    if _lean_overhead_ns is None:
+        clock: Callable[[], int] = perf_counter_ns
+        durations: List[int] = []
+        for _ in range(samples):
+            start_ns: int = clock()
+            durations.append(clock() - start_ns)
+        durations.sort()
+        _lean_overhead_ns = durations[len(durations) // 2]
+    return _lean_overhead_ns
+
+
+class LeanRecorder:
+    """
+    LeanRecorder stores raw durations in a preallocated array and folds them into a TimerStats,
+    minus the calibrated timer overhead, only when the array is full or statistics are requested.
+
+    A slot is taken with `next(positions)`, which is atomic, so several threads can record at once;
+    only a sample taken while another thread folds a full array may be lost.
+    """
+
+    __slots__ = ('stats', 'overhead_ns', 'durations', 'positions', '_lock')
+
+    def __init__(self, stats: TimerStats, capacity: int = 65_536) -> None:
+        self.stats: TimerStats = stats
+        self.overhead_ns: int = calibrate_overhead()
+        self.durations: array = array('q', bytes(8 * capacity))
+        self.positions: Iterator[int] = iter(range(capacity))
+        self._lock: Lock = Lock()
+        stats.recorder = self
+
+    def record(self, duration_ns: int) -> None:
+        try:
+            self.durations[next(self.positions)] = duration_ns
+        except StopIteration:
+            self.overflow(duration_ns)
+
+    def overflow(self, duration_ns: int) -> None:
+        """Folds the full array into the statistics and records the duration that did not fit"""
+        self.flush()
+        self.record(duration_ns)
+
+    def flush(self) -> None:
+        """Folds the stored durations into the statistics and empties the array"""
+        with self._lock:
+            count: int = len(self.durations) - length_hint(self.positions)
+            overhead_ns: int = self.overhead_ns
+            durations: List[int] = [
+                duration_ns - overhead_ns if duration_ns > overhead_ns else 0
+                for duration_ns in self.durations[:count]
+            ]
+            self.positions = iter(range(len(self.durations)))
+        if durations:
+            self.stats.add_many(durations)
+
+
+class Span:
+    """
+    Span is one timed block in the span tree of a `SpanTracer`.
+    """
+
+    __slots__ = ('name', 'parent', 'children', 'lane', 'start_ns', 'end_ns')
+
+    def __init__(self, name: str, parent: Optional['Span'], lane: Tuple[int, int], start_ns: int) -> None:
+        self.name: str = name
+        self.parent: Optional[Span] = parent
+        self.children: List[Span] = []
+        self.lane: Tuple[int, int] = lane
+        self.start_ns: int = start_ns
+        self.end_ns: int = start_ns
+
+    @property
+    def duration_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+    def __repr__(self) -> str:
+        return f'Span({self.name!r}, {self.duration_ns} ns, {len(self.children)} children)'
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar('execution_timer_span', default=None)
+
+
+def _current_lane() -> Tuple[int, int]:
+    """Returns the thread and the asyncio task (0 outside of a task) a span runs in"""
+    task: Any = None
+    asyncio: Any = sys.modules.get('asyncio')
+    if asyncio is not None:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+    return get_ident(), id(task) if task is not None else 0
+
+
+class SpanTracer:
+    """
+    SpanTracer collects the spans of `ExecutionTimer` blocks into a parent/child tree.
+
+    The current span is kept in a context variable, so every thread and every asyncio task
+    has its own chain of open spans and a task started inside a span becomes its child.
+    Finished spans can be exported as Chrome trace events (chrome://tracing, ui.perfetto.dev)
+    or in the speedscope format (www.speedscope.app).
+
+    Examples:
+        >>> tracer = SpanTracer()
+        >>> with ExecutionTimer(name='pipeline', display_time=False, tracer=tracer):
+        ...     with ExecutionTimer(name='chunk', display_time=False, tracer=tracer):
+        ...         pass
+        >>> [(span.name, [child.name for child in span.children]) for span in tracer.roots()]
+        [('pipeline', ['chunk'])]
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self.origin_ns: int = perf_counter_ns()
+        self._lane_names: Dict[Tuple[int, int], str] = {}
+        self._lock: Lock = Lock()
+
+    def start(self, name: str) -> Tuple[Span, Token]:
+        """Opens a span as a child of the current one and makes it current"""
+        lane: Tuple[int, int] = _current_lane()
+        if lane not in self._lane_names:
+            with self._lock:
+                task_name: str = f' task {len(self._lane_names)}' if lane[1] else ''
+                self._lane_names.setdefault(lane, current_thread().name + task_name)
+        span: Span = Span(name, _current_span.get(), lane, perf_counter_ns())
+        return span, _current_span.set(span)
+
+    def finish(self, span: Span, token: Token) -> None:
+        """Closes a span and restores its parent as the current one"""
+        span.end_ns = perf_counter_ns()
+        try:
+            _current_span.reset(token)
+        except ValueError:  # closed in another context than it was opened in
+            _current_span.set(span.parent)
+        if span.parent is not None:
+            span.parent.children.append(span)
+        self.spans.append(span)
+
+    def roots(self) -> List[Span]:
+        """Returns the finished spans without a parent, in the order they started"""
+        return sorted((span for span in self.spans if span.parent is None), key=lambda span: span.start_ns)
+
+    def clear(self) -> None:
+        """Forgets all finished spans"""
+        with self._lock:
+            self.spans.clear()
+            self._lane_names.clear()
+            self.origin_ns = perf_counter_ns()
+
+    def _lane_ids(self) -> Dict[Tuple[int, int], int]:
+        return {lane: number for number, lane in enumerate(self._lane_names, 1)}
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Returns the spans as Chrome trace events, one row per thread and asyncio task"""
+        pid: int = os.getpid()
+        lane_ids: Dict[Tuple[int, int], int] = self._lane_ids()
+        events: List[Dict[str, Any]] = [
+            {'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': lane_ids[lane], 'args': {'name': name}}
+            for lane, name in self._lane_names.items()
+        ]
+        for span in sorted(self.spans, key=lambda span: span.start_ns):
+            events.append({
+                'name': span.name, 'cat': 'ExecutionTimer', 'ph': 'X', 'pid': pid, 'tid': lane_ids[span.lane],
+                'ts': (span.start_ns - self.origin_ns) / 1000, 'dur': span.duration_ns / 1000,
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def to_speedscope(self, name: str = 'ExecutionTimer') -> Dict[str, Any]:
+        """Returns the spans in the speedscope file format, one evented profile per thread and asyncio task"""
+        frames: Dict[str, int] = {}
+        profiles: List[Dict[str, Any]] = []
+        for lane, lane_name in self._lane_names.items():
+            spans: List[Span] = sorted((span for span in self.spans if span.lane == lane),
+                                       key=lambda span: (span.start_ns, -span.end_ns))
+            if not spans:
+                continue
+            events: List[Dict[str, Any]] = []
+            stack: List[Span] = []
+            for span in spans:
+                while stack and stack[-1].end_ns <= span.start_ns:
+                    closed: Span = stack.pop()
+                    events.append({'type': 'C', 'frame': frames[closed.name], 'at': closed.end_ns - self.origin_ns})
+                frame: int = frames.setdefault(span.name, len(frames))
+                events.append({'type': 'O', 'frame': frame, 'at': span.start_ns - self.origin_ns})
+                stack.append(span)
+            while stack:
+                closed = stack.pop()
+                events.append({'type': 'C', 'frame': frames[closed.name], 'at': closed.end_ns - self.origin_ns})
+            profiles.append({
+                'type': 'evented', 'name': lane_name, 'unit': 'nanoseconds',
+                'startValue': events[0]['at'], 'endValue': events[-1]['at'], 'events': events,
+            })
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': [{'name': frame_name} for frame_name in frames]},
+            'profiles': profiles,
+            'name': name,
+            'exporter': 'ExecutionTimer',
+        }
+
+    def save_chrome_trace(self, file_path: str) -> None:
+        with open(file_path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_chrome_trace(), file)
+
+    def save_speedscope(self, file_path: str) -> None:
+        with open(file_path, 'w', encoding='utf-8') as file:
+            json.dump(self.to_speedscope(), file)
+
+
+class StepTimedAwaitable:
+    """
+    StepTimedAwaitable awaits a coroutine step by step, measuring how long each step runs
+    before the coroutine is suspended again. Time between the steps is time suspended.
+    """
+
+    __slots__ = ('coroutine', 'running_ns', 'longest_step_ns')
+
+    def __init__(self, coroutine: Awaitable) -> None:
+        self.coroutine: Any = coroutine
+        self.running_ns: int = 0
+        self.longest_step_ns: int = 0
+
+    def _add_step(self, start_ns: int) -> None:
+        step_ns: int = perf_counter_ns() - start_ns
+        self.running_ns += step_ns
+        if step_ns > self.longest_step_ns:
+            self.longest_step_ns = step_ns
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        coroutine: Any = self.coroutine
+        value: Any = None
+        error: Optional[BaseException] = None
+        while True:
+            start_ns: int = perf_counter_ns()
+            try:
+                yielded: Any = coroutine.send(value) if error is None else coroutine.throw(error)
+            except StopIteration as stop:
+                self._add_step(start_ns)
+                return stop.value
+            except BaseException:
+                self._add_step(start_ns)
+                raise
+            self._add_step(start_ns)
+            value, error = None, None
+            try:
+                value = yield yielded
+            except GeneratorExit:
+                coroutine.close()
+                raise
+            except BaseException as exc:  # thrown into the awaiting task, e.g. CancelledError
+                error = exc
+
+
+class TimerRegistry:
+    """
+    TimerRegistry collects the statistics of all ExecutionTimers of the process by name:
+    the TimerStats of every decorated function (held weakly, they go away with the function)
+    and one TimerStats per name for the blocks timed as context managers.
+    Timers of the same name are merged when read, so each name is one row of a report.
+
+    Examples:
+        >>> with ExecutionTimer(name='extract', display_time=False):
+        ...     pass
+        >>> TIMER_REGISTRY.summaries()['extract'].count
+        1
+        >>> 'extract' in [summary.name for summary in TIMER_REGISTRY.top(5, key='p95_ns')]
+        True
+    """
+
+    def __init__(self) -> None:
+        self._stats: Dict[str, WeakSet] = {}
+        self._blocks: Dict[str, TimerStats] = {}
+        self._lock: Lock = Lock()
+
+    def register(self, stats: TimerStats) -> None:
+        """Adds the statistics of a timer under their name"""
+        with self._lock:
+            self._stats.setdefault(stats.name, WeakSet()).add(stats)
+
+    def block_stats(self, name: str) -> TimerStats:
+        """Returns the statistics of the context manager blocks of a name, creating them on first use"""
+        stats: Optional[TimerStats] = self._blocks.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._blocks.get(name)
+                if stats is None:
+                    stats = self._blocks[name] = TimerStats(name)
+                    self._stats.setdefault(name, WeakSet()).add(stats)
+        return stats
+
+    def names(self) -> List[str]:
+        """Returns the names of the registered timers"""
+        with self._lock:
+            return [name for name, parts in self._stats.items() if parts]
+
+    def stats(self, name: str) -> TimerStats:
+        """Returns the merged statistics of all timers of a name"""
+        with self._lock:
+            parts: List[TimerStats] = list(self._stats.get(name, ()))
+        return TimerStats.merged(name, parts)
+
+    def all_stats(self) -> List[TimerStats]:
+        """Returns the merged statistics of every name that has measured something"""
+        merged: List[TimerStats] = [self.stats(name) for name in self.names()]
+        return [stats for stats in merged if stats.count]
+
+    def summaries(self) -> Dict[str, TimerSummary]:
+        """Returns the summaries of every name that has measured something"""
+        return {stats.name: stats.summary() for stats in self.all_stats()}
+
+    def top(self, n: int = 10, key: str = 'total_ns') -> List[TimerSummary]:
+        """Returns the summaries of the `n` hottest names by a TimerSummary field: total_ns, count, p95_ns, ..."""
+        if key not in TimerSummary._fields:
+            raise ValueError(f"Unknown summary field: {key}")
+        return sorted(self.summaries().values(), key=lambda summary: getattr(summary, key), reverse=True)[:n]
+
+    def reset(self) -> None:
+        """Forgets the measurements of all registered timers"""
+        with self._lock:
+            parts: List[TimerStats] = [stats for group in self._stats.values() for stats in group]
+        for stats in parts:
+            stats.reset()
+
+
+# Process-wide registry every ExecutionTimer reports into
+TIMER_REGISTRY: TimerRegistry = TimerRegistry()
+
+# Turned on by `silence_displays`, e.g. while a live dashboard shows all the timers
+_displays_silenced: bool = False
+
+
+def silence_displays(silenced: bool = True) -> bool:
+    """Turns the EXECUTION TIME boxes of all timers off (or back on) and returns the previous setting"""
+    global _displays_silenced
+    previous: bool = _displays_silenced
+    _displays_silenced = silenced
+    return previous
+
+
+_active_tracer: Optional[SpanTracer] = None
+
+
+def start_tracing(tracer: Optional[SpanTracer] = None) -> SpanTracer:
+    """Turns on span tracing for all ExecutionTimers without their own tracer and returns the tracer"""
+    global _active_tracer
+    _active_tracer = tracer if tracer is not None else SpanTracer()
+    return _active_tracer
+
+
+def stop_tracing() -> Optional[SpanTracer]:
+    """Turns off span tracing started with `start_tracing` and returns the tracer with the collected spans"""
+    global _active_tracer
+    tracer: Optional[SpanTracer] = _active_tracer
+    _active_tracer = None
+    return tracer
+
 
 @dataclass(slots=True)
 class ExecutionTimer:
@@ -38,24 +839,84 @@ class ExecutionTimer:
     ExecutionTimer measures execution time of code blocks.
 
     Examples:
-        >>> # Using as a context manager
-        >>> with ExecutionTimer():
-        ...     main_context()
-        ...     time.sleep(1)
-
-        >>> # Using as a decorator
-        >>> @ExecutionTimer()
-        ... def main_decorator():
-        ...     print('Example as decorator')
-        ...     time.sleep(1)
-        ...
-        >>> main_decorator()
-
-        >>> # Using with time retrieval
-        >>> with ExecutionTimer(display_time=False) as timer:
-        ...     main_context()
-        ...     time.sleep(1)
-        ...     duration_ns: int = timer.get_duration_ns()
+        # Using as a context manager
+        with ExecutionTimer():
+            main_context()
+            time.sleep(1)
+
+        # Using as a decorator
+        @ExecutionTimer()
+        def main_decorator():
+            print('Example as decorator')
+            time.sleep(1)
+        main_decorator()
+
+        # Using with time retrieval
+        with ExecutionTimer(display_time=False) as timer:
+            main_context()
+            time.sleep(1)
+            duration_ns: int = timer.get_duration_ns()
+
+        # Using statistics of a decorated function
+        @ExecutionTimer(display_time=False)
+        def work():
+            time.sleep(0.01)
+        work()
+        print(work.stats.summary().count)  # 1
+
+        # Using with coroutines (also `async with ExecutionTimer():`)
+        @ExecutionTimer(display_time=False)
+        async def fetch():
+            await asyncio.sleep(0.1)
+        asyncio.run(fetch())
+        summary = fetch.stats.summary()
+        print(summary.total_ns - summary.running_ns)  # time suspended
+
+        # Using with generators: the iteration is timed, producer time is the running time of `stats`
+        @ExecutionTimer(display_time=False)
+        def numbers(n):
+            yield from range(n)
+        print(sum(numbers(1000)))  # 499500
+        summary = numbers.stream.summary()
+        print(summary.items, summary.items_per_s, summary.first_item_ns, summary.item_p95_ns)
+        print(summary.producer_ns, summary.consumer_ns)
+        timer = ExecutionTimer(display_time=False)
+        files = [name for _, _, names in timer.iterate(os.walk('.'), 'walk') for name in names]
+        print(timer.get_stream_stats('walk')['walk'].items_per_s)
+
+        # Using the lean mode (no dates, no display, calibrated overhead subtracted)
+        @ExecutionTimer(lean=True)
+        def hot(x):
+            return x * 2
+        hot(21)
+        print(hot.stats.summary().count)  # 1
+
+        # Using sampling (sample_rate=0.01 times a random 1% of the calls)
+        @ExecutionTimer(lean=True, every_n=100)
+        def hotter(x):
+            return x * 2
+        for i in range(1000):
+            hotter(i)
+        print(hotter.stats.summary().count, hotter.stats.summary().sampled)  # 1000 10
+
+        # Using CPU, thread and memory metrics
+        with ExecutionTimer(display_time=False, measure_process_time=True, measure_memory=True) as timer:
+            data = [str(i) for i in range(100_000)]
+        print(sorted(timer.get_metrics()))  # ['memory_peak_bytes', 'process_time_ns']
+
+        # Using a latency threshold: calls are profiled with cProfile (profile_every_n=10 - every 10th call)
+        # and only those slower than the threshold are dumped as .pstats with a .txt of the arguments
+        @ExecutionTimer(display_time=False, profile_threshold_ns=500_000_000, profile_keep=20)
+        def synthesize(chunk):
+            time.sleep(1)
+        synthesize('Ala ma kota')  # working_space/output/profiles/synthesize_<date>_1000ms.pstats and .txt
+
+        # Using the history: name, tags, start, duration and process CPU time of every run go to SQLite
+        # (not in the lean mode), `python -m utils.timer_history report` shows the trends
+        history = TimerHistory()
+        with ExecutionTimer(name='pipeline', history=history, tags={'book': 'pan_tadeusz'}):
+            main_context()
+        history.close()
     """
 
     start_date: Optional[datetime] = None
@@ -64,34 +925,593 @@ class ExecutionTimer:
     end_time_ns: Optional[int] = None
     display_time: bool = True
     console: Console = Console()
+    name: Optional[str] = None
+    stats: Dict[str, TimerStats] = field(default_factory=dict)
+    streams: Dict[str, StreamStats] = field(default_factory=dict)
+    tracer: Optional[SpanTracer] = None
+    running_ns: Optional[int] = None
+    longest_step_ns: Optional[int] = None
+    lean: bool = False
+    capacity: int = 65_536
+    sample_rate: float = 1.0
+    every_n: int = 1
+    measure_process_time: bool = False
+    measure_thread_time: bool = False
+    measure_memory: bool = False
+    measure_rss: bool = False
+    process_time_ns: Optional[int] = None
+    thread_time_ns: Optional[int] = None
+    memory_peak_bytes: Optional[int] = None
+    rss_delta_bytes: Optional[int] = None
+    profile_threshold_ns: Optional[int] = None
+    profile_every_n: int = 1
+    profile_dir: Optional[str] = None
+    profile_keep: int = 20
+    profile_path: Optional[str] = None
+    history: Optional['TimerHistory'] = None
+    tags: Optional[Dict[str, Any]] = None
+    _span: Optional[Tuple[SpanTracer, Span, Token]] = field(default=None, init=False, repr=False)
+    _metric_starts: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False)
+    _profiler: Optional[cProfile.Profile] = field(default=None, init=False, repr=False)
+    _profile_counter: Optional[Iterator[int]] = field(default=None, init=False, repr=False)
+    _call_args: Optional[Tuple[tuple, dict]] = field(default=None, init=False, repr=False)
+    _in_call: bool = field(default=False, init=False, repr=False)
+    _async_block: bool = field(default=False, init=False, repr=False)
 
     def __post_init__(self) -> None:
-        self.start_date = datetime.now()
+        if not 0 < self.sample_rate <= 1:
+            raise ValueError(f"sample_rate must be in (0, 1], got {self.sample_rate}")
+        if self.every_n < 1:
+            raise ValueError(f"every_n must be at least 1, got {self.every_n}")
+        if self.profile_threshold_ns is not None:
+            self._profile_counter = count()
+        if self.history is not None:
+            self.measure_process_time = True
+        if self.lean:
+            self.display_time = False
+            calibrate_overhead()
+        else:
+            self.start_date = datetime.now()
         self.start_time_ns = perf_counter_ns()
 
     def __enter__(self) -> 'ExecutionTimer':
+        if self.lean:
+            self.end_time_ns = None
+            self.start_time_ns = perf_counter_ns()
+            return self
+        tracer: Optional[SpanTracer] = self.tracer or _active_tracer
+        if tracer is not None:
+            self._span = (tracer, *tracer.start(self.name or 'ExecutionTimer'))
+        self.start_date = datetime.now()
+        self.end_date = None
+        self.end_time_ns = None
+        self.running_ns = None
+        self.longest_step_ns = None
+        self._async_block = False
+        if self.measure_process_time or self.measure_thread_time or self.measure_memory or self.measure_rss:
+            self._start_metrics()
+        if self.profile_threshold_ns is not None:
+            self._start_profiler()
+        self.start_time_ns = perf_counter_ns()
         return self
 
     def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        if self.lean:
+            self.end_time_ns = perf_counter_ns()
+            return
         try:
-            self.end_date = datetime.now()
             self.end_time_ns = perf_counter_ns()
-            if self.display_time:
+            if self._profiler is not None:
+                self._finish_profiler()
+            self.end_date = datetime.now()
+            if self._metric_starts is not None:
+                self._finish_metrics()
+            if self._span is not None:
+                tracer, span, token = self._span
+                self._span = None
+                tracer.finish(span, token)
+            if not self._in_call:
+                TIMER_REGISTRY.block_stats(self.name or 'block').add(
+                    self.end_time_ns - self.start_time_ns, self.running_ns, self.longest_step_ns, self.get_metrics(),
+                    steps_known=self.running_ns is not None or not self._async_block)
+            if self.history is not None:
+                self.history.record(self.name or 'block', self.tags, self.start_date,
+                                    self.end_time_ns - self.start_time_ns, self.process_time_ns)
+            if self.display_time and not _displays_silenced:
                 self._display_time()
         except AttributeError:
             print('An error occurred: __exit__')
 
+    def _start_metrics(self) -> None:
+        """Reads the starting values of the switched on metrics"""
+        starts: Dict[str, Any] = {}
+        if self.measure_memory:
+            self._start_memory(starts)
+        if self.measure_rss:
+            starts['rss'] = current_rss()
+        if self.measure_process_time:
+            starts['process_time'] = process_time_ns()
+        if self.measure_thread_time:
+            starts['thread_time'] = thread_time_ns()
+        self._metric_starts = starts
+        self.process_time_ns = self.thread_time_ns = self.memory_peak_bytes = self.rss_delta_bytes = None
+
+    def _finish_metrics(self) -> None:
+        """Computes the switched on metrics from their starting values"""
+        starts: Dict[str, Any] = self._metric_starts
+        self._metric_starts = None
+        if 'thread_time' in starts:
+            self.thread_time_ns = thread_time_ns() - starts['thread_time']
+        if 'process_time' in starts:
+            self.process_time_ns = process_time_ns() - starts['process_time']
+        if 'rss' in starts:
+            rss: Optional[int] = current_rss()
+            if rss is not None and starts['rss'] is not None:
+                self.rss_delta_bytes = rss - starts['rss']
+        if 'memory' in starts:
+            self._finish_memory(starts)
+
+    @staticmethod
+    def _start_memory(starts: Dict[str, Any]) -> None:
+        """
+            Stores the traced memory at the start as the baseline of this timer. The peak of tracemalloc is reset
+            for it only after the peak so far has been folded into every open timer, so nested and concurrent
+            timers keep their own peaks.
+        """
+        global _memory_started
+        with _memory_lock:
+            if not _memory_starts and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _memory_started = True
+            current, peak = tracemalloc.get_traced_memory()
+            for other in _memory_starts:
+                if peak > other['memory_peak']:
+                    other['memory_peak'] = peak
+            tracemalloc.reset_peak()
+            starts['memory'] = starts['memory_peak'] = current
+            _memory_starts.append(starts)
+
+    def _finish_memory(self, starts: Dict[str, Any]) -> None:
+        """Computes the peak over the baseline and stops tracemalloc after the last timer that started it"""
+        global _memory_started
+        with _memory_lock:
+            peak: int = max(starts['memory_peak'], tracemalloc.get_traced_memory()[1])
+            for i, other in enumerate(_memory_starts):
+                if other is starts:
+                    del _memory_starts[i]
+                    break
+            if not _memory_starts and _memory_started:
+                tracemalloc.stop()
+                _memory_started = False
+        self.memory_peak_bytes = max(peak - starts['memory'], 0)
+
+    def _start_profiler(self) -> None:
+        """Starts cProfile for this call, unless another timer is profiling or it is not the Nth call"""
+        global _profiler_active
+        self.profile_path = None
+        if next(self._profile_counter) % self.profile_every_n:
+            return
+        with _profiler_lock:
+            if _profiler_active:
+                return
+            _profiler_active = True
+        self._profiler = cProfile.Profile()
+        self._profiler.enable()
+
+    def _finish_profiler(self) -> None:
+        """Stops cProfile and dumps the profile if the call was slower than the threshold"""
+        global _profiler_active
+        profiler: cProfile.Profile = self._profiler
+        profiler.disable()
+        self._profiler = None
+        with _profiler_lock:
+            _profiler_active = False
+        duration_ns: int = self.end_time_ns - self.start_time_ns
+        if duration_ns >= self.profile_threshold_ns:
+            self.profile_path = self._dump_profile(profiler, duration_ns)
+
+    def _dump_profile(self, profiler: cProfile.Profile, duration_ns: int) -> str:
+        """
+            Writes <name>_<date>_<ms>ms.pstats and a .txt with the call arguments and the top of the profile
+            to `profile_dir` (working_space/output/profiles by default), keeping the newest `profile_keep` dumps.
+        """
+        directory: str = self.profile_dir or os.path.join(WORKING_SPACE_OUTPUT, 'profiles')
+        os.makedirs(directory, exist_ok=True)
+        prefix: str = ''.join(char if char.isalnum() or char in '-_' else '_' for char in self.name or 'block')
+        base: str = os.path.join(
+            directory, f'{prefix}_{datetime.now():%Y%m%d_%H%M%S_%f}_{duration_ns // 1_000_000}ms')
+        profiler.dump_stats(base + '.pstats')
+
+        report: StringIO = StringIO()
+        report.write(f'{self.name or "block"}: {duration_ns / 1_000_000:.3f} ms '
+                     f'(threshold {self.profile_threshold_ns / 1_000_000:.3f} ms)\n')
+        if self._call_args is not None:
+            args, kwargs = self._call_args
+            report.write(f'args: {reprlib.repr(args)}\nkwargs: {reprlib.repr(kwargs)}\n')
+        report.write('\n')
+        pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(25)
+        with open(base + '.txt', 'w', encoding='utf-8') as file:
+            file.write(report.getvalue())
+
+        dumps: List[str] = sorted(
+            (os.path.join(directory, file_name) for file_name in os.listdir(directory)
+             if file_name.startswith(prefix + '_') and file_name.endswith('.pstats')),
+            key=lambda path: (os.path.getmtime(path), path))
+        for old in dumps[:max(len(dumps) - self.profile_keep, 0)]:
+            for extension_path in (old, old[:-len('.pstats')] + '.txt'):
+                try:
+                    os.remove(extension_path)
+                except OSError:
+                    pass
+        return base + '.pstats'
+
+    def get_metrics(self) -> Dict[str, int]:
+        """
+            Returns the measured optional metrics: process_time_ns, thread_time_ns, memory_peak_bytes
+            (peak of memory allocated by Python over the start, from tracemalloc) and rss_delta_bytes.
+            For a coroutine the CPU times include the other tasks run by the event loop meanwhile.
+        """
+        metrics: Dict[str, Optional[int]] = {
+            'process_time_ns': self.process_time_ns,
+            'thread_time_ns': self.thread_time_ns,
+            'memory_peak_bytes': self.memory_peak_bytes,
+            'rss_delta_bytes': self.rss_delta_bytes,
+        }
+        return {key: value for key, value in metrics.items() if value is not None}
+
+    async def __aenter__(self) -> 'ExecutionTimer':
+        """
+            Starts timing an `async with` block. The steps of the awaiting task cannot be seen from here,
+            so unless a wrapper sets `running_ns`, the block has no running time or longest step.
+        """
+        self.__enter__()
+        self._async_block = True
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.__exit__(exc_type, exc_val, exc_tb)
+
     def __call__(self, func: Callable) -> Callable:
+        name: str = self.name or func.__qualname__
+        stats: Optional[TimerStats] = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = TimerStats(name)
+            TIMER_REGISTRY.register(stats)
+
+        if inspect.isgeneratorfunction(func):
+            wrapper: Callable = self._wrap_generator_function(func, name, stats)
+        elif self.lean and not inspect.iscoroutinefunction(func) and not inspect.isasyncgenfunction(func):
+            wrapper = self._wrap_lean_function(func, stats)
+        elif inspect.iscoroutinefunction(func):
+            wrapper = self._wrap_coroutine_function(func, name, stats)
+        elif inspect.isasyncgenfunction(func):
+            wrapper = self._wrap_async_generator_function(func, name, stats)
+        else:
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                # A new timer for every call, so recursive and concurrent calls do not share the start
+                timer: ExecutionTimer = self._call_timer(name)
+                if timer.profile_threshold_ns is not None:
+                    timer._call_args = (args, kwargs)
+                try:
+                    with timer:
+                        result: Any = func(*args, **kwargs)
+                finally:
+                    stats.add(timer.get_duration_ns(), metrics=timer.get_metrics())
+                return result
+        if self.every_n > 1 or self.sample_rate < 1:
+            wrapper = self._wrap_sampled(func, wrapper, stats)
+        wrapper.stats = stats
+        if name in self.streams:
+            wrapper.stream = self.streams[name]
+        return wrapper
+
+    def _sampling_pattern(self) -> Tuple[List[bool], float]:
+        """
+            Returns the repeated pattern of timed calls and the exact fraction of timed calls in it:
+            one in `every_n`, or a fixed random pattern with `sample_rate` of the calls timed.
+            The random pattern is stratified (one timed call at a random place of every 1 / `sample_rate` calls),
+            so any run of calls has within one of its expected number of timed calls.
+        """
+        if self.every_n > 1:
+            return [True] + [False] * (self.every_n - 1), 1 / self.every_n
+        length: int = min(max(1024, round(16 / self.sample_rate)), 1 << 20)
+        timed: int = max(round(length * self.sample_rate), 1)
+        rng: random.Random = random.Random()
+        pattern: List[bool] = [False] * length
+        for stratum in range(timed):
+            pattern[rng.randrange(stratum * length // timed, (stratum + 1) * length // timed)] = True
+        return pattern, timed / length
+
+    def _wrap_sampled(self, func: Callable, timed: Callable, stats: TimerStats) -> Callable:
+        """Calls the timed wrapper only for the sampled calls, the others call the function directly"""
+        pattern: List[bool]
+        pattern, stats.sample_rate = self._sampling_pattern()
+        decide: Callable[[], bool] = cycle(pattern).__next__
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if decide():
+                    return await timed(*args, **kwargs)
+                return await func(*args, **kwargs)
+        else:
+            @wraps(func)
+            def wrapper(*args: Any, **kwargs: Any) -> Any:
+                if decide():
+                    return timed(*args, **kwargs)
+                return func(*args, **kwargs)
+        return wrapper
+
+    def _call_timer(self, name: str, profile: bool = True) -> 'ExecutionTimer':
+        """
+            Returns a new timer with the settings of this one for a single call of a decorated function.
+            Coroutines are not profiled: cProfile would also record the other tasks run while they wait.
+        """
+        timer: ExecutionTimer = ExecutionTimer(
+            display_time=self.display_time, console=self.console, name=name, tracer=self.tracer,
+            measure_process_time=self.measure_process_time, measure_thread_time=self.measure_thread_time,
+            measure_memory=self.measure_memory, measure_rss=self.measure_rss,
+            profile_threshold_ns=self.profile_threshold_ns if profile else None,
+            profile_every_n=self.profile_every_n, profile_dir=self.profile_dir, profile_keep=self.profile_keep,
+            history=self.history, tags=self.tags)
+        timer._in_call = True
+        if profile and self._profile_counter is not None:
+            timer._profile_counter = self._profile_counter
+        return timer
+
+    def _wrap_lean_function(self, func: Callable, stats: TimerStats) -> Callable:
+        """Records only the perf_counter_ns difference of every call into a preallocated array"""
+        recorder: LeanRecorder = LeanRecorder(stats, self.capacity)
+        durations: array = recorder.durations
+        clock: Callable[[], int] = perf_counter_ns
+
+        @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            with self:
-                result: Any = func(*args, **kwargs)
-            return result
+            start_ns: int = clock()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration_ns: int = clock() - start_ns
+                try:
+                    durations[next(recorder.positions)] = duration_ns
+                except StopIteration:
+                    recorder.overflow(duration_ns)
+        return wrapper
+
+    def _wrap_coroutine_function(self, func: Callable, name: str, stats: TimerStats) -> Callable:
+        """Times the awaited execution of a coroutine, step by step"""
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            timer: ExecutionTimer = self._call_timer(name, profile=False)
+            steps: StepTimedAwaitable = StepTimedAwaitable(func(*args, **kwargs))
+            try:
+                async with timer:
+                    try:
+                        return await steps
+                    finally:
+                        timer.running_ns, timer.longest_step_ns = steps.running_ns, steps.longest_step_ns
+            finally:
+                stats.add(timer.get_duration_ns(), steps.running_ns, steps.longest_step_ns, timer.get_metrics())
         return wrapper
 
+    def _wrap_async_generator_function(self, func: Callable, name: str, stats: TimerStats) -> Callable:
+        """
+            Times an async generator from the first item to its end; running time counts only its own steps.
+            Values sent and exceptions thrown (athrow) are passed on to the generator like in `_timed_iteration`.
+        """
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            generator: Any = func(*args, **kwargs)
+            timer: ExecutionTimer = self._call_timer(name, profile=False)
+            running_ns: int = 0
+            longest_step_ns: int = 0
+            try:
+                async with timer:
+                    try:
+                        value: Any = None
+                        thrown: Optional[BaseException] = None
+                        while True:
+                            steps: StepTimedAwaitable = StepTimedAwaitable(
+                                generator.asend(value) if thrown is None else generator.athrow(thrown))
+                            thrown = None
+                            try:
+                                item: Any = await steps
+                            except StopAsyncIteration:
+                                break
+                            finally:
+                                running_ns += steps.running_ns
+                                longest_step_ns = max(longest_step_ns, steps.longest_step_ns)
+                            try:
+                                value = yield item
+                            except GeneratorExit:
+                                raise
+                            except BaseException as error:
+                                thrown, value = error, None
+                    finally:
+                        await generator.aclose()
+                        timer.running_ns, timer.longest_step_ns = running_ns, longest_step_ns
+            finally:
+                stats.add(timer.get_duration_ns(), running_ns, longest_step_ns, timer.get_metrics())
+        return wrapper
+
+    def _wrap_generator_function(self, func: Callable, name: str, stats: TimerStats) -> Callable:
+        """Times the iteration of the generators returned by the function, not only their creation"""
+        stream: StreamStats = self.streams.setdefault(name, StreamStats(stats))
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Generator[Any, Any, Any]:
+            # Returns the timing generator itself, one generator layer less per item than `yield from`
+            return self._timed_iteration(func(*args, **kwargs), stream, owned=True)
+        return wrapper
+
+    def iterate(self, iterable: Any, name: Optional[str] = None) -> Generator[Any, Any, Any]:
+        """
+            Yields the items of an iterable, timing the iteration like a decorated generator function:
+            items/second, time to the first item, latency of every item and producer versus consumer time.
+            The iterable stays the caller's: it is not closed when the iteration ends or is closed.
+
+            Args:
+                - iterable - any iterable, e.g. a generator of chunks or os.walk(...)
+                - name - name of the statistics in `streams` and `stats` (default: the timer name)
+        """
+        name = name or self.name or type(iterable).__name__
+        stream: StreamStats = self.streams.get(name)
+        if stream is None:
+            stats: Optional[TimerStats] = self.stats.get(name)
+            if stats is None:
+                stats = self.stats[name] = TimerStats(name)
+                TIMER_REGISTRY.register(stats)
+            stream = self.streams[name] = StreamStats(stats)
+        return self._timed_iteration(iter(iterable), stream)
+
+    def _timed_iteration(self, iterator: Iterator[Any], stream: StreamStats, owned: bool = False
+                         ) -> Generator[Any, Any, Any]:
+        """
+            Passes the items (and the values sent) through, measuring the time spent in the producer for every item.
+            The rest of the wall time, between yielding an item and the request for the next one, is the consumer's.
+            Exceptions thrown in are thrown into the iterator like `yield from` does. GeneratorExit closes it only
+            if it is `owned` (the generator of a decorated function), an iterable given to `iterate` stays open.
+            Latencies are added in batches, so an item costs two clock reads and an append.
+        """
+        timer: Optional[ExecutionTimer] = None if self.lean else self._call_timer(stream.name, profile=False)
+        clock: Callable[[], int] = perf_counter_ns
+        next_item: Callable[[], Any] = iterator.__next__
+        send: Callable[[Any], Any] = getattr(iterator, 'send', None) or (lambda _: next_item())
+        throw: Optional[Callable[[BaseException], Any]] = getattr(iterator, 'throw', None)
+        thrown: Optional[BaseException] = None
+        latencies: List[int] = []
+        append: Callable[[int], None] = latencies.append
+        first_item_ns: Optional[int] = None
+        longest_item_ns: int = 0
+        producer_ns: int = 0
+        if timer is not None:
+            timer.__enter__()
+        start_ns: int = clock()
+        step_ns: int = start_ns
+        value: Any = None
+        try:
+            while True:
+                try:
+                    if thrown is None:
+                        item: Any = next_item() if value is None else send(value)
+                    else:
+                        item, thrown = throw(thrown), None
+                except BaseException:
+                    # The last request (StopIteration or an error) was spent in the producer too
+                    producer_ns += clock() - step_ns
+                    raise
+                append(clock() - step_ns)
+                if len(latencies) >= 4096:
+                    if first_item_ns is None:
+                        first_item_ns = latencies[0]
+                    longest_item_ns = max(longest_item_ns, max(latencies))
+                    producer_ns += sum(latencies)
+                    stream.add_items(latencies)
+                    latencies.clear()
+                try:
+                    value = yield item
+                except GeneratorExit:
+                    close: Optional[Callable[[], None]] = getattr(iterator, 'close', None) if owned else None
+                    if close is not None:
+                        close()
+                    raise
+                except BaseException as error:
+                    if throw is None:
+                        raise
+                    thrown, value = error, None
+                step_ns = clock()
+        except StopIteration as stop:
+            return stop.value
+        finally:
+            total_ns: int = clock() - start_ns
+            producer_ns += sum(latencies)
+            metrics: Optional[Dict[str, int]] = None
+            if timer is not None:
+                timer.running_ns = producer_ns
+                timer.longest_step_ns = max(max(latencies, default=0), longest_item_ns)
+                timer.__exit__(None, None, None)
+                total_ns, metrics = timer.get_duration_ns(), timer.get_metrics()
+            stream.add_run(total_ns, producer_ns, latencies, first_item_ns, longest_item_ns, metrics)
+
+    @staticmethod
+    def bench(func: Callable, *args: Any, warmup: int = 3, repeat: int = 7, min_time: float = 0.2,
+              name: Optional[str] = None, baseline: Optional[str] = None, tolerance: float = 0.10,
+              update_baseline: bool = False, display: bool = True, console: Optional[Console] = None,
+              **kwargs: Any) -> BenchResult:
+        """
+            Benchmarks `func(*args, **kwargs)`: after `warmup` calls the number of loops is doubled until one run
+            takes at least `min_time` seconds, then `repeat` runs are timed with the garbage collector off.
+            The result is the median time per call and the median absolute deviation (MAD) of the runs.
+
+            With `baseline` (a JSON file) the median is compared with the stored one of the same name and a run
+            slower by more than `tolerance` (0.10 - 10%) is flagged as a regression; `update_baseline` stores
+            the new result (a name missing in the file is always stored).
+        """
+        name = name or getattr(func, '__qualname__', repr(func))
+        for _ in range(warmup):
+            func(*args, **kwargs)
+
+        def run(loops: int) -> int:
+            iterations: range = range(loops)
+            start_ns: int = perf_counter_ns()
+            for _ in iterations:
+                func(*args, **kwargs)
+            return perf_counter_ns() - start_ns
+
+        gc_enabled: bool = gc.isenabled()
+        gc.disable()
+        try:
+            loops: int = 1
+            while run(loops) < min_time * 1_000_000_000 and loops < 1 << 30:
+                loops *= 2
+            times: List[float] = [run(loops) / loops for _ in range(max(repeat, 1))]
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        median_ns: float = statistics.median(times)
+        mad_ns: float = statistics.median(abs(time_ns - median_ns) for time_ns in times)
+        baseline_ns: Optional[float] = None
+        change: Optional[float] = None
+        if baseline is not None:
+            stored: Dict[str, Any] = {}
+            if os.path.exists(baseline):
+                with open(baseline, encoding='utf-8') as file:
+                    stored = json.load(file)
+            if name in stored:
+                baseline_ns = stored[name]['median_ns']
+                change = median_ns / baseline_ns - 1
+            if update_baseline or name not in stored:
+                stored[name] = {'median_ns': median_ns, 'mad_ns': mad_ns, 'loops': loops,
+                                'date': datetime.now().isoformat(timespec='seconds')}
+                with open(baseline, 'w', encoding='utf-8') as file:
+                    json.dump(stored, file, indent=4)
+
+        result: BenchResult = BenchResult(name, loops, len(times), median_ns, mad_ns, min(times), max(times),
+                                          baseline_ns, change, change is not None and change > tolerance)
+        if display:
+            style: str = 'bright_red bold' if result.regression else 'white bold'
+            comparison: str = '' if change is None else f' [{style}]{change:+.1%} vs baseline'
+            (console or Console()).print(
+                f'[bright_red bold][[bold white]BENCH[bright_red bold]] [bold bright_yellow]{name}[white bold]: '
+                f'{median_ns:,.0f} ns/call ± {mad_ns:,.0f} (MAD), {loops} loops x {len(times)}{comparison}')
+        return result
+
+    def get_stats(self, name: Optional[str] = None) -> Dict[str, TimerSummary]:
+        """Returns the aggregates of the functions decorated with this timer, or only of `name`"""
+        return {key: stats.summary() for key, stats in self.stats.items() if name is None or key == name}
+
+    def get_stream_stats(self, name: Optional[str] = None) -> Dict[str, StreamSummary]:
+        """Returns the iteration aggregates of the decorated generator functions and `iterate` calls"""
+        return {key: stream.summary() for key, stream in self.streams.items() if name is None or key == name}
+
     def get_duration_ns(self) -> int:
-        """Returns raw duration in nanoseconds"""
+        """Returns raw duration in nanoseconds (in the lean mode minus the calibrated timer overhead)"""
         if not self.end_time_ns:
             self.end_time_ns = perf_counter_ns()
+        if self.lean:
+            return max(self.end_time_ns - self.start_time_ns - calibrate_overhead(), 0)
         return self.end_time_ns - self.start_time_ns
 
     @staticmethod
@@ -179,12 +1599,39 @@ class ExecutionTimer:
             f'[bright_red bold][[bold white]TIME[bright_red bold]]  [white bold]{minutes_alt:.9f} minutes')
         self.console.print(
             f'[bright_red bold][[bold white]TIME[bright_red bold]]  [white bold]{seconds_alt:.9f} seconds')
+        if self.running_ns is not None:
+            suspended_s: float = (self.get_duration_ns() - self.running_ns) / 1_000_000_000
+            self.console.print(
+                f'[bright_red bold][[bold white]RUN[bright_red bold]]   '
+                f'[white bold]{self.running_ns / 1_000_000_000:.9f} seconds running')
+            self.console.print(
+                f'[bright_red bold][[bold white]WAIT[bright_red bold]]  [white bold]{suspended_s:.9f} seconds suspended')
+            self.console.print(
+                f'[bright_red bold][[bold white]STEP[bright_red bold]]  '
+                f'[white bold]{self.longest_step_ns / 1_000_000_000:.9f} seconds longest step')
+        if self.process_time_ns is not None:
+            self.console.print(
+                f'[bright_red bold][[bold white]CPU[bright_red bold]]   '
+                f'[white bold]{self.process_time_ns / 1_000_000_000:.9f} seconds process CPU')
+        if self.thread_time_ns is not None:
+            self.console.print(
+                f'[bright_red bold][[bold white]THR[bright_red bold]]   '
+                f'[white bold]{self.thread_time_ns / 1_000_000_000:.9f} seconds thread CPU')
+        if self.memory_peak_bytes is not None:
+            self.console.print(
+                f'[bright_red bold][[bold white]MEM[bright_red bold]]   '
+                f'[white bold]{self.memory_peak_bytes / 1024 / 1024:.3f} MiB peak allocated')
+        if self.rss_delta_bytes is not None:
+            self.console.print(
+                f'[bright_red bold][[bold white]RSS[bright_red bold]]   '
+                f'[white bold]{self.rss_delta_bytes / 1024 / 1024:+.3f} MiB resident')
 
 
 def main() -> None:
     """
         Examples of using ExecutionTimer as a decorator and context manager
     """
+    import asyncio
     import time
 
     @ExecutionTimer()
@@ -206,6 +1653,96 @@ def main() -> None:
         duration_ns: int = timer.get_duration_ns()
         print(f"\nRaw duration: {duration_ns} nanoseconds")
 
+    @ExecutionTimer(display_time=False)
+    def main_statistics() -> None:
+        time.sleep(0.01)
+
+    for _ in range(20):
+        main_statistics()
+    print(f"\nStatistics: {main_statistics.stats.summary()}")
+
+    tracer: SpanTracer = start_tracing()
+    with ExecutionTimer(name='pipeline', display_time=False):
+        for _ in range(3):
+            main_statistics()
+    stop_tracing()
+    print(f"\nSpan tree: {tracer.roots()} -> {tracer.roots()[0].children}")
+
+    @ExecutionTimer()
+    async def main_coroutine() -> None:
+        print('\nExample as coroutine decorator (0.5 s suspended, 0.2 s blocking the event loop)')
+        await asyncio.sleep(0.5)
+        time.sleep(0.2)
+
+    async def main_async_context() -> None:
+        async with ExecutionTimer():
+            await main_coroutine()
+
+    asyncio.run(main_async_context())
+
+    with ExecutionTimer(measure_process_time=True, measure_thread_time=True, measure_memory=True, measure_rss=True):
+        print('\nExample with CPU, thread and memory metrics')
+        data: List[str] = [str(i) for i in range(1_000_000)]
+        time.sleep(0.2)
+        del data
+
+    @ExecutionTimer(display_time=False)
+    def main_generator(items: int) -> Generator[int, None, None]:
+        for item in range(items):
+            time.sleep(0.002)
+            yield item
+
+    for _ in main_generator(50):
+        time.sleep(0.001)
+    stream: StreamSummary = main_generator.stream.summary()
+    print(f"\nGenerator: {stream.items} items, {stream.items_per_s:.0f} items/s, "
+          f"first item after {stream.first_item_ns / 1_000_000:.3f} ms, "
+          f"item p95 {stream.item_p95_ns / 1_000_000:.3f} ms, "
+          f"producer {stream.producer_ns / 1_000_000:.0f} ms, consumer {stream.consumer_ns / 1_000_000:.0f} ms")
+
+
+def benchmark_timer_overhead(calls: int = 1_000_000) -> None:
+    """
+        Benchmark function: time added to every call of a trivial function by the default and the lean decorator
+    """
+    def bare(x: int) -> int:
+        return x
+
+    default: Callable = ExecutionTimer(display_time=False)(bare)
+    lean: Callable = ExecutionTimer(lean=True)(bare)
+    sampled: Callable = ExecutionTimer(lean=True, every_n=100)(bare)
+    results: Dict[str, float] = {}
+    for label, func in (('bare', bare), ('default', default), ('lean', lean), ('sampled', sampled)):
+        start_ns: int = perf_counter_ns()
+        for i in range(calls):
+            func(i)
+        results[label] = (perf_counter_ns() - start_ns) / calls
+    print(f"calibrated overhead: {calibrate_overhead()} ns")
+    for label in ('default', 'lean', 'sampled'):
+        print(f"{label}: {results[label] - results['bare']:.0f} ns/call overhead "
+              f"({results[label]:.0f} ns/call, bare {results['bare']:.0f} ns/call)")
+    print(f"lean mean duration after calibration: {lean.stats.summary().mean_ns:.0f} ns "
+          f"(the call of the bare function, {results['bare']:.0f} ns)")
+
+
+def benchmark_stream_overhead(items: int = 1_000_000) -> None:
+    """
+        Benchmark function: time added to every item of a trivial generator by the timed iteration
+    """
+    def bare(n: int) -> Generator[int, None, None]:
+        yield from range(n)
+
+    timed: Callable = ExecutionTimer(display_time=False)(bare)
+    results: Dict[str, float] = {}
+    for label, func in (('bare', bare), ('timed', timed)):
+        start_ns: int = perf_counter_ns()
+        for _ in func(items):
+            pass
+        results[label] = (perf_counter_ns() - start_ns) / items
+    print(f"timed iteration: {results['timed'] - results['bare']:.0f} ns/item overhead "
+          f"({results['timed']:.0f} ns/item, bare {results['bare']:.0f} ns/item)")
+    print(f"measured: {timed.stream.summary()}")
+
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,113 @@
+"""
+    Module `number_backends` provides language backends for converting numbers into words.
+    A backend is a class with the methods `number_in_words`, `thing_in_words`, `amount_in_words`
+    and `convert_numbers_in_text`, kept in its own module with the tables of its language.
+    The module of a backend is imported only when the language is first requested,
+    so a process that uses one language loads only that language.
+
+    -*- coding: utf-8 -*-
+
+    * Languages:
+        pl - `utils.number_in_words.NumberInWords` (default)
+        en - `utils.number_in_words_en.NumberInWordsEn`
+        de - `utils.number_in_words_de.NumberInWordsDe`
+
+    * Example usage of function `get_backend` (shared instance with default settings):
+        from utils.number_backends import get_backend
+        english: NumberInWordsBackend = get_backend('en')
+        result1: str = english.number_in_words(1234)
+            # Outputs: "one thousand two hundred thirty-four"
+
+        result2: str = get_backend('de').amount_in_words(21.5, fmt=1)
+            # Outputs: "einundzwanzig Euro fünfzig Cent"
+
+    * Example usage of function `backend_class` (own instance with other settings):
+        polish: NumberInWordsBackend = backend_class('pl')(extended=True)
+
+    * Example usage of function `register_backend`:
+        register_backend('cs', 'my_package.number_in_words_cs', 'NumberInWordsCs')
+"""
+
+from importlib import import_module
+from threading import Lock
+from typing import Dict, List, Protocol, Tuple, Type, Union
+
+
+# Language: (module, class) of the backend, imported on first use
+LANGUAGE_BACKENDS: Dict[str, Tuple[str, str]] = {
+    'pl': ('utils.number_in_words', 'NumberInWords'),
+    'en': ('utils.number_in_words_en', 'NumberInWordsEn'),
+    'de': ('utils.number_in_words_de', 'NumberInWordsDe'),
+}
+
+_backend_classes: Dict[str, type] = {}
+_backends: Dict[str, 'NumberInWordsBackend'] = {}
+_backends_lock: Lock = Lock()
+
+
+class NumberInWordsBackend(Protocol):
+    """
+        Interface of a language backend.
+    """
+
+    def number_in_words(self, number: Union[int, float, str]) -> str:
+        ...
+
+    def thing_in_words(self, number: int, thing: List[str]) -> str:
+        ...
+
+    def amount_in_words(self, number: float, fmt: int = 0, currency: str = ...) -> str:
+        ...
+
+    def convert_numbers_in_text(self, text: str) -> str:
+        ...
+
+
+def register_backend(language: str, module: str, class_name: str) -> None:
+    """
+        Registers (or replaces) the backend of a language. Nothing is imported until the language is requested.
+
+        Args:
+            - language - language code, e.g. 'cs'
+            - module - dotted path of the module with the backend class
+            - class_name - name of the backend class in the module
+    """
+    with _backends_lock:
+        LANGUAGE_BACKENDS[language] = (module, class_name)
+        _backend_classes.pop(language, None)
+        _backends.pop(language, None)
+
+
+def backend_class(language: str = 'pl') -> Type[NumberInWordsBackend]:
+    """
+        Returns the backend class of a language, importing its module on first use.
+    """
+    cls: type = _backend_classes.get(language)
+    if cls is None:
+        if language not in LANGUAGE_BACKENDS:
+            raise ValueError(f"Unknown language: {language}")
+        module, class_name = LANGUAGE_BACKENDS[language]
+        cls = getattr(import_module(module), class_name)
+        _backend_classes[language] = cls
+    return cls
+
+
+def get_backend(language: str = 'pl') -> NumberInWordsBackend:
+    """
+        Returns the shared backend instance of a language with default settings, creating it on first use.
+    """
+    backend: NumberInWordsBackend = _backends.get(language)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.get(language)
+            if backend is None:
+                backend = backend_class(language)()
+                _backends[language] = backend
+    return backend
+
+
+def loaded_backends() -> List[str]:
+    """
+        Returns the languages whose backends have been imported so far.
+    """
+    return list(_backend_classes)
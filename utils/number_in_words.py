@@ -2,6 +2,7 @@
     Module `NumberInWords` provides a class `NumberInWords` 
         that converts numbers into Polish words.
     It offers several functions that can be used in various contexts.
+    It is the Polish backend of `utils.number_backends` (English and German: `get_backend('en')`, `get_backend('de')`).
 
     -*- coding: utf-8 -*-
 
@@ -19,7 +20,7 @@
         case3: int = number_in_words._case(23)    # Outputs: 1
 
     * Example usage of function `number_in_words`:
-    Inputs: int, float, str (string works with long (30 digits, 15 on both sides) floating point numbers)
+    Inputs: int, float, str (strings of any length, scale names are generated: biliard, trylion, tryliard, ...)
         result1: str = number_in_words.number_in_words(123_456_789_012_345)
         result2: str = number_in_words.number_in_words(0.123_456_789_012_345)
         result3: str = number_in_words.number_in_words('123_456_789_012_345.123_456_789_012_345')
@@ -39,18 +40,287 @@
         result8: str = number_in_words.amount_in_words(567.89, fmt=1)
             # Outputs: "pięćset sześćdziesiąt siedem złotych osiemdziesiąt dziewięć groszy"
 
+    * Example usage of function `amount_in_words` and `currency_amounts_in_words` with other currencies:
+    Currencies: PLN (default), EUR, USD, GBP, CHF, more can be added to CURRENCIES
+        result16: str = number_in_words.amount_in_words(21.05, fmt=1, currency='EUR')
+            # Outputs: "dwadzieścia jeden euro pięć centów"
+
+        result17: List[str] = number_in_words.currency_amounts_in_words([(2, 'USD'), (1, 'GBP')], fmt=1)
+            # Outputs: ["dwa dolary zero centów", "jeden funt zero pensów"]
+
+    * Example usage of function `ordinal_in_words`:
+        result12: str = number_in_words.ordinal_in_words(2024, 'm_gen')
+            # Outputs: "dwa tysiące dwudziestego czwartego"
+
+    * Example usage of `convert_numbers_in_text` with dates, times, ordinals, Roman numerals and units:
+        extended: NumberInWords = NumberInWords(extended=True)
+        result13: str = extended.convert_numbers_in_text('15.08.2024 o 12:30 przeszedł 3 km (50%), XIV wiek')
+            # Outputs: "piętnasty sierpnia dwa tysiące dwudziestego czwartego o dwunasta trzydzieści
+            #           przeszedł trzy kilometry (pięćdziesiąt procent), czternasty wiek"
+
+    * Example usage of functions `words_in_number` and `convert_words_in_text` (words to numbers):
+        result14: int = number_in_words.words_in_number('sto dwadzieścia trzy tysiące')
+            # Outputs: 123000
+        result15: str = number_in_words.convert_words_in_text('Mam dwa tysiące trzysta złotych i pięć groszy')
+            # Outputs: "Mam 2300 złotych i 5 groszy"
+
+    * Example usage of functions `numbers_in_words` and `amounts_in_words` (batch conversion):
+    Inputs: any iterable, or a NumPy array if NumPy is installed; results keep the input order
+        result10: List[str] = number_in_words.numbers_in_words([5, 21, 5])
+            # Outputs: ["pięć", "dwadzieścia jeden", "pięć"]
+
+        result11: List[str] = number_in_words.amounts_in_words(numpy.array([1234.56, 567.89]), fmt=1)
+            # Outputs: ["tysiąc dwieście trzydzieści cztery złote pięćdziesiąt sześć groszy",
+            #           "pięćset sześćdziesiąt siedem złotych osiemdziesiąt dziewięć groszy"]
+
+    * Example usage of the opt-in conversion cache (`number_in_words` and `thing_in_words`):
+        cached: NumberInWords = NumberInWords(cache_size=1024)
+        cached.number_in_words(2024)
+        cached.number_in_words('2024')
+        print(cached.cache_info())
+            # Outputs: "CacheInfo(hits=1, misses=1, evictions=0, maxsize=1024, currsize=1)"
+        cached.cache_clear()
+
     * Example usage of function `convert_numbers_in_text`:
         result9: str = number_in_words.convert_numbers_in_text('Rozdział 69.2_3 / 4 (test96).')
             # Outputs: "Rozdział sześćdziesiąt dziewięć przecinek dwa_trzy / cztery (test dziewięćdziesiąt sześć)."
+
+    * Example usage of functions `convert_numbers_in_stream` and `convert_numbers_in_file` (large texts):
+        for part in number_in_words.convert_numbers_in_stream(open('book.txt', encoding='utf-8')):
+            sys.stdout.write(part)
+
+        number_in_words.convert_numbers_in_file('subtitles.srt', 'subtitles_pl.srt', workers=4)
+            # Reads and writes in 1 MiB buffers, blocks are converted in 4 processes and written in order
+
+    * Example usage of function `benchmark_number_in_words`:
+        benchmark_number_in_words(repeat=100_000)
+            # Outputs: "number_in_words(123456): exact: ... ns/call, float/repr: ... ns/call (same words)"
+            # for int, float, str, Decimal and scientific inputs
+
+    * Example usage of function `benchmark_amounts_in_words`:
+        benchmark_amounts_in_words(count=100_000)
+            # Outputs: "amount_in_words: ... ns/amount" and "currency_amounts_in_words: ... ns/amount"
+
+    * Example usage of function `benchmark_convert_numbers_in_text`:
+        benchmark_convert_numbers_in_text(size_mb=4.0)
+            # Outputs: "convert_numbers_in_text: 4.00 MB in ... s (... MB/s)"
 """
 
 import re
+import sys
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass, field
-from typing import List, Union
+from decimal import Decimal
+from functools import lru_cache, partial
+from threading import Lock
+from time import perf_counter_ns
+from typing import (Any, Callable, Deque, Dict, Hashable, Iterable, Iterator, List, Match,
+                    NamedTuple, Optional, Pattern, Sequence, Tuple, Union)
 
 from six import u
 
 
+NUMBER_TOKEN_PATTERN: Pattern = re.compile(r'\d+(?:[.,]\d+)*')
+# Ints up to this many bits (about 3000 digits) are split into three-digit groups through str(),
+# larger ones in halves by powers of 1000, as str() refuses ints over 4300 digits since Python 3.11
+STR_INT_BITS: int = 10_000
+
+
+# Latin prefixes of the Polish long scale: 10^(6n) is "<prefix>lion", 10^(6n+3) is "<prefix>liard"
+SCALE_PREFIXES: List[str] = [
+    "", "mi", "bi", "try", "kwadry", "kwinty", "seksty", "septy", "okty", "nony"
+]
+SCALE_UNIT_PREFIXES: List[str] = [
+    "", "un", "duo", "tre", "kwattuor", "kwin", "seks", "septen", "okto", "nowem"
+]
+SCALE_TEN_PREFIXES: List[str] = [
+    "", "decy", "wiginty", "tryginty", "kwadraginty", "kwinkwaginty",
+    "seksaginty", "septuaginty", "oktoginty", "nonaginty"
+]
+SCALE_HUNDRED_PREFIXES: List[str] = [
+    "", "centy", "ducenty", "trecenty", "kwadryngenty", "kwingenty",
+    "sescenty", "septyngenty", "oktyngenty", "nongenty"
+]
+
+
+def _scale_prefix(n: int) -> str:
+    """
+        Returns the Latin prefix of the n-th "-lion" (1 - mi, 2 - bi, 11 - undecy, 100 - centy, ...).
+        Numbers from 1000 up are built from the prefixes of their three-digit groups joined with "li",
+        an empty group being "ni".
+    """
+    if n >= 1000:
+        groups: List[str] = []
+        while n > 0:
+            n, group = divmod(n, 1000)
+            groups.append(_scale_prefix(group) if group else "ni")
+        return "li".join(reversed(groups))
+    if n < 10:
+        return SCALE_PREFIXES[n]
+    return SCALE_UNIT_PREFIXES[n % 10] + SCALE_TEN_PREFIXES[n // 10 % 10] + SCALE_HUNDRED_PREFIXES[n // 100]
+
+
+@lru_cache(maxsize=None)
+def scale_name_forms(index: int) -> List[str]:
+    """
+        Returns the three grammatical forms of the scale word for the three-digit group at `index`
+        (2 - milion, 3 - miliard, 4 - bilion, 5 - biliard, 6 - trylion, ...).
+
+        >>> scale_name_forms(7)
+        ['tryliard', 'tryliardy', 'tryliardów']
+        >>> scale_name_forms(22)[0]
+        'undecylion'
+    """
+    stem: str = _scale_prefix(index // 2) + ("liard" if index % 2 else "lion")
+    return [u(stem), u(stem + "y"), u(stem + "ów")]
+
+
+@lru_cache(maxsize=64)
+def _power_of_thousand(exponent: int) -> int:
+    """
+        Returns 1000 ** exponent, kept for the halvings of the next large int.
+    """
+    return 1000 ** exponent
+
+
+# Endings of ordinal numbers (adjectives) in the forms used by `NumberInWords.ordinal_in_words`:
+# masculine, feminine and neuter nominative, masculine and feminine genitive, masculine locative
+ORDINAL_FORMS: Tuple[str, ...] = ('m_nom', 'f_nom', 'n_nom', 'm_gen', 'f_gen', 'm_loc')
+ORDINAL_ENDINGS: Dict[str, Tuple[str, ...]] = {
+    'hard': ('y', 'a', 'e', 'ego', 'ej', 'ym'),     # piąty, piąta, piąte, piątego, piątej, piątym
+    'velar': ('i', 'a', 'ie', 'iego', 'iej', 'im'),  # drugi, druga, drugie, drugiego, drugiej, drugim
+    'soft': ('i', 'ia', 'ie', 'iego', 'iej', 'im'),  # trzeci, trzecia, trzecie, trzeciego, trzeciej, trzecim
+}
+# Endings written after a hyphen in ordinals such as 1-szy, 2-go, 3-cia, 10-tego, 7-mym
+ORDINAL_SUFFIXES: List[str] = [
+    'szy', 'sza', 'sze', 'szego', 'szej', 'szym', 'gi', 'ga', 'gie', 'go', 'giego', 'giej', 'gim',
+    'ci', 'cia', 'cie', 'ciego', 'ciej', 'cim', 'ty', 'ta', 'te', 'tego', 'tej', 'tym',
+    'my', 'ma', 'me', 'mego', 'mej', 'mym', 'y', 'a', 'e', 'ego', 'ej', 'ym'
+]
+# Forms of one and two accepted by the words-to-number parser besides the masculine ones in `UNITS`
+NUMBER_WORD_VARIANTS: Dict[str, int] = {
+    'jedna': 1, 'jedno': 1, 'dwie': 2
+}
+ROMAN_VALUES: Dict[str, int] = {
+    'I': 1, 'V': 5, 'X': 10, 'L': 50, 'C': 100, 'D': 500, 'M': 1000
+}
+
+
+def inflect_ordinal(words: str, form: str) -> str:
+    """
+        Returns an ordinal number given in the masculine nominative (e.g. "dwudziesty drugi")
+        in one of `ORDINAL_FORMS`.
+
+        >>> inflect_ordinal('dwudziesty trzeci', 'f_gen')
+        'dwudziestej trzeciej'
+    """
+    index: int = ORDINAL_FORMS.index(form)
+    inflected: List[str] = []
+    for word in words.split(' '):
+        if word.endswith('y'):
+            inflected.append(word[:-1] + ORDINAL_ENDINGS['hard'][index])
+        elif word.endswith(('gi', 'ki')):
+            inflected.append(word[:-1] + ORDINAL_ENDINGS['velar'][index])
+        else:
+            inflected.append(word[:-1] + ORDINAL_ENDINGS['soft'][index])
+    return u(" ").join(inflected)
+
+
+def roman_to_int(roman: str) -> int:
+    """
+        Returns the value of a Roman numeral.
+
+        >>> roman_to_int('XIV')
+        14
+    """
+    total: int = 0
+    for i, char in enumerate(roman):
+        value: int = ROMAN_VALUES[char]
+        if i + 1 < len(roman) and value < ROMAN_VALUES[roman[i + 1]]:
+            total -= value
+        else:
+            total += value
+    return total
+
+
+class CacheInfo(NamedTuple):
+    """
+        Statistics of the `NumberInWords` conversion cache.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class LRUCache:
+    """
+        Bounded, thread-safe least-recently-used cache with hit, miss and eviction counters.
+
+        >>> cache = LRUCache(maxsize=1)
+        >>> cache.get_or_compute('a', lambda: 1)
+        1
+        >>> cache.get_or_compute('b', lambda: 2)
+        2
+        >>> cache.cache_info()
+        CacheInfo(hits=0, misses=2, evictions=1, maxsize=1, currsize=1)
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize: int = maxsize
+        self._data: OrderedDict = OrderedDict()
+        self._lock: Lock = Lock()
+        self._hits: int = 0
+        self._misses: int = 0
+        self._evictions: int = 0
+
+    def __getstate__(self) -> Dict[str, int]:
+        # Only the size is pickled (e.g. for worker processes), a copy starts empty
+        return {'maxsize': self.maxsize}
+
+    def __setstate__(self, state: Dict[str, int]) -> None:
+        self.__init__(state['maxsize'])
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+            Returns the cached value for `key`, computing and storing it on a miss.
+            The value is computed outside the lock, so a slow conversion does not block other threads.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self._hits += 1
+                return self._data[key]
+            self._misses += 1
+
+        value: Any = compute()
+
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+        return value
+
+    def cache_info(self) -> CacheInfo:
+        """
+            Returns hits, misses, evictions, maximum and current size of the cache.
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self._data))
+
+    def cache_clear(self) -> None:
+        """
+            Removes all entries and resets the statistics.
+        """
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
 @dataclass
 class NumberInWords:
     """
@@ -68,7 +338,9 @@ class NumberInWords:
         >>> number_in_words.number_in_words(123_456_789_012_345)
         'sto dwadzieścia trzy biliony czterysta pięćdziesiąt sześć miliardów siedemset osiemdziesiąt dziewięć milionów dwanaście tysięcy trzysta czterdzieści pięć'
         >>> number_in_words.number_in_words(0.123_456_789_012_345)
-        'zero przecinek sto dwadzieścia trzy kwadryliony czterysta pięćdziesiąt sześć trylionów siedemset osiemdziesiąt dziewięć biliardów dwanaście milionów trzysta czterdzieści pięć'
+        'zero przecinek sto dwadzieścia trzy biliony czterysta pięćdziesiąt sześć miliardów siedemset osiemdziesiąt dziewięć milionów dwanaście tysięcy trzysta czterdzieści pięć'
+        >>> number_in_words.number_in_words('123456789012345678901234567')
+        'sto dwadzieścia trzy kwadryliony czterysta pięćdziesiąt sześć tryliardów siedemset osiemdziesiąt dziewięć trylionów dwanaście biliardów trzysta czterdzieści pięć bilionów sześćset siedemdziesiąt osiem miliardów dziewięćset jeden milionów dwieście trzydzieści cztery tysiące pięćset sześćdziesiąt siedem'
         >>> number_in_words.thing_in_words(5, ["jabłko", "jabłka", "jabłek"])
         'pięć jabłek'
         >>> number_in_words.thing_in_words(21, ["jabłko", "jabłka", "jabłek"])
@@ -109,7 +381,7 @@ class NumberInWords:
         [u("milion"), u("miliony"), u("milionów")],
         [u("miliard"), u("miliardy"), u("miliardów")],
         [u("bilion"), u("biliony"), u("bilionów")],
-        # Add more if needed
+        # Larger scales are generated by `scale_name_forms`
     ])
     ZLOTYS: list = field(default_factory=lambda: [
                          u("złoty"), u("złote"), u("złotych")
@@ -117,6 +389,174 @@ class NumberInWords:
     GROSZES: list = field(default_factory=lambda: [
                           u("grosz"), u("grosze"), u("groszy")
                           ])
+    # Code: [major unit forms, minor unit forms], PLN is taken from ZLOTYS and GROSZES
+    CURRENCIES: dict = field(default_factory=lambda: {
+        'EUR': [[u("euro"), u("euro"), u("euro")],
+                [u("cent"), u("centy"), u("centów")]],
+        'USD': [[u("dolar"), u("dolary"), u("dolarów")],
+                [u("cent"), u("centy"), u("centów")]],
+        'GBP': [[u("funt"), u("funty"), u("funtów")],
+                [u("pens"), u("pensy"), u("pensów")]],
+        'CHF': [[u("frank"), u("franki"), u("franków")],
+                [u("centym"), u("centymy"), u("centymów")]],
+    })
+    ORDINAL_UNITS: list = field(default_factory=lambda: [
+        u("zerowy"), u("pierwszy"), u("drugi"), u("trzeci"),
+        u("czwarty"), u("piąty"), u("szósty"),
+        u("siódmy"), u("ósmy"), u("dziewiąty")
+    ])
+    ORDINAL_TEENS: list = field(default_factory=lambda: [
+        u("dziesiąty"), u("jedenasty"), u("dwunasty"),
+        u("trzynasty"), u("czternasty"), u("piętnasty"),
+        u("szesnasty"), u("siedemnasty"), u("osiemnasty"),
+        u("dziewiętnasty")
+    ])
+    ORDINAL_TENS: list = field(default_factory=lambda: [
+        u(""), u("dziesiąty"), u("dwudziesty"), u("trzydziesty"),
+        u("czterdziesty"), u("pięćdziesiąty"), u("sześćdziesiąty"),
+        u("siedemdziesiąty"), u("osiemdziesiąty"), u("dziewięćdziesiąty")
+    ])
+    ORDINAL_HUNDREDS: list = field(default_factory=lambda: [
+        u(""), u("setny"), u("dwusetny"), u("trzechsetny"),
+        u("czterechsetny"), u("pięćsetny"), u("sześćsetny"),
+        u("siedemsetny"), u("osiemsetny"), u("dziewięćsetny")
+    ])
+    ORDINAL_THOUSANDS: list = field(default_factory=lambda: [
+        u(""), u("tysięczny"), u("dwutysięczny"), u("trzytysięczny"),
+        u("czterotysięczny"), u("pięciotysięczny"), u("sześciotysięczny"),
+        u("siedmiotysięczny"), u("ośmiotysięczny"), u("dziewięciotysięczny")
+    ])
+    MONTHS: list = field(default_factory=lambda: [
+        u(""), u("stycznia"), u("lutego"), u("marca"), u("kwietnia"),
+        u("maja"), u("czerwca"), u("lipca"), u("sierpnia"),
+        u("września"), u("października"), u("listopada"), u("grudnia")
+    ])
+    # Symbol: [one, 2-4, 5+, fraction], e.g. 1 kilometr, 2 kilometry, 5 kilometrów, 2,5 kilometra
+    MEASURE_UNITS: dict = field(default_factory=lambda: {
+        u("%"): [u("procent"), u("procent"), u("procent"), u("procent")],
+        u("‰"): [u("promil"), u("promile"), u("promili"), u("promila")],
+        u("km/h"): [u("kilometr na godzinę"), u("kilometry na godzinę"),
+                    u("kilometrów na godzinę"), u("kilometra na godzinę")],
+        u("km"): [u("kilometr"), u("kilometry"), u("kilometrów"), u("kilometra")],
+        u("m"): [u("metr"), u("metry"), u("metrów"), u("metra")],
+        u("cm"): [u("centymetr"), u("centymetry"), u("centymetrów"), u("centymetra")],
+        u("mm"): [u("milimetr"), u("milimetry"), u("milimetrów"), u("milimetra")],
+        u("kg"): [u("kilogram"), u("kilogramy"), u("kilogramów"), u("kilograma")],
+        u("g"): [u("gram"), u("gramy"), u("gramów"), u("grama")],
+        u("mg"): [u("miligram"), u("miligramy"), u("miligramów"), u("miligrama")],
+        u("t"): [u("tona"), u("tony"), u("ton"), u("tony")],
+        u("l"): [u("litr"), u("litry"), u("litrów"), u("litra")],
+        u("ml"): [u("mililitr"), u("mililitry"), u("mililitrów"), u("mililitra")],
+        u("h"): [u("godzina"), u("godziny"), u("godzin"), u("godziny")],
+        u("min"): [u("minuta"), u("minuty"), u("minut"), u("minuty")],
+        u("s"): [u("sekunda"), u("sekundy"), u("sekund"), u("sekundy")],
+        u("°C"): [u("stopień Celsjusza"), u("stopnie Celsjusza"),
+                  u("stopni Celsjusza"), u("stopnia Celsjusza")],
+        u("°"): [u("stopień"), u("stopnie"), u("stopni"), u("stopnia")],
+        u("zł"): [u("złoty"), u("złote"), u("złotych"), u("złotego")],
+        u("gr"): [u("grosz"), u("grosze"), u("groszy"), u("grosza")],
+        u("€"): [u("euro"), u("euro"), u("euro"), u("euro")],
+        u("$"): [u("dolar"), u("dolary"), u("dolarów"), u("dolara")],
+        u("kB"): [u("kilobajt"), u("kilobajty"), u("kilobajtów"), u("kilobajta")],
+        u("MB"): [u("megabajt"), u("megabajty"), u("megabajtów"), u("megabajta")],
+        u("GB"): [u("gigabajt"), u("gigabajty"), u("gigabajtów"), u("gigabajta")],
+        u("tys."): [u("tysiąc"), u("tysiące"), u("tysięcy"), u("tysiąca")],
+        u("mln"): [u("milion"), u("miliony"), u("milionów"), u("miliona")],
+        u("mld"): [u("miliard"), u("miliardy"), u("miliardów"), u("miliarda")],
+    })
+    FEMININE_MEASURE_UNITS: list = field(default_factory=lambda: [
+        u("t"), u("h"), u("min"), u("s")
+    ])
+    # Word after a Roman numeral: form of the ordinal (after "w"/"we" genitive becomes locative)
+    ROMAN_CONTEXT: dict = field(default_factory=lambda: {
+        u("wiek"): 'm_nom', u("wieku"): 'm_gen', u("w."): 'm_nom',
+        u("tom"): 'm_nom', u("tomu"): 'm_gen', u("tomie"): 'm_loc',
+        u("rozdział"): 'm_nom', u("rozdziału"): 'm_gen', u("rozdziale"): 'm_loc',
+        u("część"): 'f_nom', u("części"): 'f_gen',
+        u("klasa"): 'f_nom', u("klasy"): 'f_gen', u("klasie"): 'f_gen',
+    })
+    cache_size: int = 0
+    extended: bool = False
+    _cache: Optional[LRUCache] = field(init=False, repr=False, default=None)
+    _triple_words: list = field(init=False, repr=False)
+    _triple_cases: list = field(init=False, repr=False)
+    _currency_words: dict = field(init=False, repr=False)
+    _ordinal_words: dict = field(init=False, repr=False)
+    _text_pattern: Pattern = field(init=False, repr=False)
+    _word_trie: dict = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.cache_size > 0:
+            self._cache = LRUCache(self.cache_size)
+        self._triple_words = [self._number_in_words_3digits(n) for n in range(1000)]
+        self._triple_cases = [self._case(n) for n in range(1000)]
+        self._currency_words = {}
+        self._ordinal_words = {form: self._ordinal_table(form) for form in ORDINAL_FORMS}
+        self._text_pattern = self._compile_text_pattern() if self.extended else NUMBER_TOKEN_PATTERN
+        self._word_trie = self._build_word_trie()
+
+    def _build_word_trie(self, max_scale: int = 21) -> Dict[str, Any]:
+        """
+            This method builds a character trie of all number words (every form of the scale words up to
+            `max_scale` three-digit groups, i.e. decyliard) for the words-to-number parser. A node maps
+            a character to the next node, the key '' holds (kind, value) of a complete word.
+        """
+        words: Dict[str, Tuple[str, int]] = {u("zero"): ('zero', 0)}
+        words.update((word, ('unit', value)) for value, word in enumerate(self.UNITS) if word)
+        words.update((word, ('ten', value * 10)) for value, word in enumerate(self.TENS) if word)
+        words.update((word, ('teen', value + 10)) for value, word in enumerate(self.TEENS))
+        words.update((word, ('hundred', value * 100)) for value, word in enumerate(self.HUNDREDS) if word)
+        words.update((word, ('unit', value)) for word, value in NUMBER_WORD_VARIANTS.items())
+        for index in range(1, max_scale + 1):
+            words.update((word, ('scale', index)) for word in self._big(index))
+
+        trie: Dict[str, Any] = {}
+        for word, entry in words.items():
+            node: Dict[str, Any] = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = entry
+        return trie
+
+    def _ordinal_table(self, form: str) -> Dict[str, List[str]]:
+        """
+            This method precomputes the ordinals 0-99, the round hundreds and the round thousands in one form.
+        """
+        low: List[str] = list(self.ORDINAL_UNITS) + list(self.ORDINAL_TEENS)
+        for n in range(20, 100):
+            low.append(self.ORDINAL_TENS[n // 10] +
+                       (u(" ") + self.ORDINAL_UNITS[n % 10] if n % 10 else u("")))
+        return {
+            'low': [inflect_ordinal(words, form) for words in low],
+            'hundreds': [inflect_ordinal(words, form) if words else words for words in self.ORDINAL_HUNDREDS],
+            'thousands': [inflect_ordinal(words, form) if words else words for words in self.ORDINAL_THOUSANDS],
+        }
+
+    def _compile_text_pattern(self) -> Pattern:
+        """
+            This method compiles the single pattern used by `convert_numbers_in_text` when `extended` is set.
+            Every category is one named alternative, handled by the method `_text_<name>`, so adding
+            a category adds an alternative, not another pass over the text.
+        """
+        def alternatives(words: Iterable[str]) -> str:
+            return '|'.join(re.escape(word) for word in sorted(words, key=len, reverse=True))
+
+        return re.compile('|'.join([
+            r'(?P<date>(?P<date_day>3[01]|[12]\d|0?[1-9])\.(?P<date_month>1[0-2]|0?[1-9])\.'
+            r'(?P<date_year>\d{4})(?![.,]?\d))',
+            r'(?P<iso_date>(?P<iso_year>\d{4})-(?P<iso_month>1[0-2]|0[1-9])-'
+            r'(?P<iso_day>3[01]|[12]\d|0[1-9])(?!\d))',
+            r'(?P<time>(?P<time_hour>2[0-3]|[01]?\d):(?P<time_minute>[0-5]\d)'
+            r'(?::(?P<time_second>[0-5]\d))?(?![\d:]))',
+            r'(?P<ordinal>(?P<ordinal_number>\d+)-(?P<ordinal_suffix>' +
+            alternatives(ORDINAL_SUFFIXES) + r')(?![\w-]))',
+            r'(?P<roman>(?P<roman_prep>\bwe?[ \u00a0]+)?\b(?P<roman_number>(?=[IVXLCDM])'
+            r'M{0,3}(?:CM|CD|D?C{0,3})(?:XC|XL|L?X{0,3})(?:IX|IV|V?I{0,3}))'
+            r'(?P<roman_space>[ \u00a0]+)(?P<roman_context>' + alternatives(self.ROMAN_CONTEXT) + r')(?!\w))',
+            r'(?P<unit>(?P<unit_number>\d+(?:[.,]\d+)?)(?P<unit_space>[ \u00a0]?)(?P<unit_symbol>' +
+            alternatives(self.MEASURE_UNITS) + r')(?!\w))',
+            r'(?P<number>' + NUMBER_TOKEN_PATTERN.pattern + r')',
+        ]))
 
     def _number_in_words_3digits(self, number: int) -> str:
         """
@@ -138,6 +578,78 @@ class NumberInWords:
                 words.append(self.UNITS[unit])
         return u(" ").join(words)
 
+    @staticmethod
+    def _digit_triples(digits: str) -> List[int]:
+        """
+            This method splits a string of decimal digits into its three-digit groups, least significant first.
+            Long strings are sliced, so the time stays linear in the number of digits.
+        """
+        triples: List[int] = []
+        if len(digits) <= 18:
+            number: int = int(digits)
+            while number > 0:
+                number, triple = divmod(number, 1000)
+                triples.append(triple)
+            return triples
+        for end in range(len(digits), 0, -3):
+            triples.append(int(digits[max(0, end - 3):end]))
+        return triples
+
+    @staticmethod
+    def _int_triples(number: int, count: int = 0) -> List[int]:
+        """
+            This method splits a non-negative int into its three-digit groups, least significant first,
+            padded with zero groups to `count`. Ints over `STR_INT_BITS` are divided by 1000 ** (half of
+            their groups) and both halves are split recursively, so there is no limit on the number of digits.
+        """
+        if number.bit_length() <= STR_INT_BITS:
+            triples: List[int] = NumberInWords._digit_triples(str(number)) if number else []
+        else:
+            half: int = (number.bit_length() * 30103 // 100000 + 3) // 6
+            high, low = divmod(number, _power_of_thousand(half))
+            triples = NumberInWords._int_triples(low, half) + NumberInWords._int_triples(high)
+        if len(triples) < count:
+            triples.extend([0] * (count - len(triples)))
+        return triples
+
+    @staticmethod
+    def _parse_digits(part: str) -> str:
+        """
+            This method returns the digits of an integer string without leading zeros ('0' for zero).
+            Plain ASCII digits are taken as they are, anything else (signs, underscores, spaces) goes through int().
+        """
+        if part.isascii() and part.isdigit():
+            return part.lstrip('0') or '0'
+        return str(int(part))
+
+    def _big(self, index: int) -> List[str]:
+        """
+            This method returns the three forms of the scale word for the three-digit group at `index`
+            (1 - thousands, 2 - millions, ...), from `BIG` or generated for larger groups.
+        """
+        if index < len(self.BIG):
+            return self.BIG[index]
+        return scale_name_forms(index)
+
+    def _triples_in_words(self, triples: Sequence[int]) -> str:
+        """
+            This method converts a number given as its three-digit groups (least significant first) into words in Polish.
+            The words of every group come from the cache of all 1000 three-digit numbers.
+        """
+        words: List[str] = []
+        for i in range(len(triples) - 1, -1, -1):
+            n: int = triples[i]
+            if n == 0:
+                continue
+            if i == 0:
+                words.append(self._triple_words[n])
+            elif n == 1:
+                words.append(self._big(i)[0])
+            else:
+                words.append(self._triple_words[n] + u(" ") +
+                             self._big(i)[self._triple_cases[n]])
+        return u(" ").join(words)
+
     def _case(self, number: int) -> int:
         """
             This method determines the grammatical case for a given number. It's used to correctly form the word for thousands, millions, etc. in Polish.
@@ -147,52 +659,130 @@ class NumberInWords:
         unit: int = number % 10
         return 2 if (number // 10) % 10 == 1 and unit > 1 or not 2 <= unit <= 4 else 1
 
-    def number_in_words(self, number: Union[int, float, str]) -> str:
+    def _currency_forms(self, currency: str) -> Tuple[List[str], List[str]]:
+        """
+            This method returns the precomputed words of a currency, built on first use:
+            the major unit by the last two digits of the amount (index 100 - exactly one)
+            and the minor units 0-99 in words together with the unit.
+        """
+        forms: Optional[Tuple[List[str], List[str]]] = self._currency_words.get(currency)
+        if forms is None:
+            if currency == 'PLN':
+                major, minor = self.ZLOTYS, self.GROSZES
+            elif currency in self.CURRENCIES:
+                major, minor = self.CURRENCIES[currency]
+            else:
+                raise ValueError(f"Unknown currency: {currency}")
+            forms = (
+                [major[self._case(n + 100)] for n in range(100)] + [major[0]],
+                [self._number_in_words(n) + u(" ") + minor[self._triple_cases[n]] for n in range(100)],
+            )
+            self._currency_words[currency] = forms
+        return forms
+
+    def cache_info(self) -> CacheInfo:
+        """
+            This method returns the statistics of the conversion cache (all zeros if the cache is disabled).
+        """
+        if self._cache is None:
+            return CacheInfo(0, 0, 0, 0, 0)
+        return self._cache.cache_info()
+
+    def cache_clear(self) -> None:
+        """
+            This method empties the conversion cache and resets its statistics.
+        """
+        if self._cache is not None:
+            self._cache.cache_clear()
+
+    @staticmethod
+    def _cache_key(number: Union[int, float, str, Decimal]) -> Hashable:
+        """
+            This method normalizes a number into the cache key, so 5, 5.0 and Decimal('5.0') share one entry.
+            Strings are not validated yet, so they are keyed as they are ('5.0.0' must not find the entry of '5.0').
+            Ints too long for str() are their own key.
+        """
+        if number.__class__ is int and number.bit_length() > STR_INT_BITS:
+            return number
+        if isinstance(number, str):
+            return str, number
+        key: str = str(number).replace(',', '.')
+        return key[:-2] if key.endswith('.0') else key
+
+    def number_in_words(self, number: Union[int, float, str, Decimal]) -> str:
         """
             This method converts a number (including decimal numbers) into words in Polish.
+            If the instance was created with `cache_size`, results are kept in a bounded LRU cache.
+        """
+        if self._cache is not None:
+            return self._cache.get_or_compute(
+                self._cache_key(number), lambda: self._number_in_words(number))
+        return self._number_in_words(number)
+
+    @staticmethod
+    def _plain_notation(number: Union[int, float, str, Decimal]) -> str:
+        """
+            This method returns a number as a string in plain positional notation.
+            Scientific notation ('1e-05', 1e+20) and `Decimal` values are expanded exactly through `Decimal`,
+            so the digits are never rounded through a float.
         """
-        if isinstance(number, (int, float)):
+        if isinstance(number, Decimal):
+            return format(number, 'f')
+        if not isinstance(number, str):
             number = str(number)
+        if 'e' in number or 'E' in number:
+            return format(Decimal(number.replace(',', '.')), 'f')
+        return number
+
+    def _digits_in_words(self, digits: str) -> str:
+        """
+            This method converts the digits returned by `_parse_digits` into words in Polish
+            (negative numbers have no words).
+        """
+        if digits == '0':
+            return u("zero")
+        if digits[0] == '-':
+            return u("")
+        return self._triples_in_words(self._digit_triples(digits))
+
+    def _number_in_words(self, number: Union[int, float, str, Decimal]) -> str:
+        """
+            This method converts a number into words in Polish, without the cache.
+            Leading zeros of the fractional part are read out, so 0.05 is "zero przecinek zero pięć".
+        """
+        if number.__class__ is int:
+            if number > 0:
+                return self._triples_in_words(self._int_triples(number))
+            return self._digits_in_words(str(number))
+        number = self._plain_notation(number)
 
         if '.' in number:
-            integer_part: int
-            decimal_part: int
-            integer_part, decimal_part = map(int, number.split('.'))
+            integer_str: str
+            decimal_str: str
+            integer_str, decimal_str = number.split('.')
         elif ',' in number:
-            integer_part: int
-            decimal_part: int
-            integer_part, decimal_part = map(int, number.split(','))
+            integer_str: str
+            decimal_str: str
+            integer_str, decimal_str = number.split(',')
         else:
-            integer_part: int = int(number)
-            decimal_part: int = 0
+            return self._digits_in_words(self._parse_digits(number))
 
-        words: List[str] = []
-        if integer_part == 0:
-            words.append(u("zero"))
+        words: str = self._digits_in_words(self._parse_digits(integer_str))
+        if decimal_str.isascii() and decimal_str.isdigit():
+            decimal_digits: str = decimal_str.lstrip('0')
+            if not decimal_digits:
+                return words
+            decimal_zeros: int = len(decimal_str) - len(decimal_digits)
+            if decimal_zeros:
+                words += u(" przecinek") + u(" zero") * decimal_zeros
+            else:
+                words += u(" przecinek")
         else:
-            triples: List[int] = []
-            while integer_part > 0:
-                triples.append(integer_part % 1000)
-                integer_part //= 1000
-            for i, n in enumerate(triples):
-                if n > 0:
-                    if i > 0 and n == 1:
-                        p: int = self._case(n)
-                        w: str = self.BIG[i][p]
-                        words.append(w)
-                    elif i > 0:
-                        p: int = self._case(n)
-                        w: str = self.BIG[i][p]
-                        words.append(
-                            self._number_in_words_3digits(n) + u(" ") + w)
-                    else:
-                        words.append(self._number_in_words_3digits(n))
-            words.reverse()
-
-        if decimal_part != 0:
-            words.extend(
-                (u("przecinek"), self.number_in_words(str(decimal_part))))
-        return u(" ").join(words)
+            decimal_digits: str = self._parse_digits(decimal_str)
+            if decimal_digits == '0':
+                return words
+            words += u(" przecinek")
+        return (words + u(" ") + self._digits_in_words(decimal_digits)).strip()
 
     def thing_in_words(self, number: int, thing: List[str]) -> str:
         """
@@ -205,9 +795,14 @@ class NumberInWords:
                 - thing - array of cases [coś, cosie, cosiów]
 
         """
+        if self._cache is not None:
+            # The number is converted without the cache, so one call counts one hit or miss
+            return self._cache.get_or_compute(
+                (self._cache_key(number), tuple(thing)),
+                lambda: self._number_in_words(number) + u(" ") + thing[self._case(number)])
         return self.number_in_words(number) + u(" ") + thing[self._case(number)]
 
-    def amount_in_words(self, number: float, fmt: int = 0) -> str:
+    def amount_in_words(self, number: float, fmt: int = 0, currency: str = 'PLN') -> str:
         """
             This method converts a monetary amount into words in Polish. The amount is given as a float, where the integer part is the number of zlotys and the fractional part is the number of groszes. The fmt parameter determines how groszes are formatted: if fmt is 0, groszes are in the form xx/100, otherwise they are converted into words.
 
@@ -216,56 +811,528 @@ class NumberInWords:
             Args:
                 - number - float, number of zlotys with groszes after the comma
                 - fmt - (format) if 0, then groszes in the form xx/100, in words in p. case
+                - currency - currency code: PLN or one of CURRENCIES (EUR, USD, GBP, CHF)
         """
+        major, minor = self._currency_forms(currency)
         lzlotys: int = int(number)
         lgroszes: int = int(number * 100 + 0.5) % 100
         if fmt != 0:
-            grosz_in_words: str = self.thing_in_words(lgroszes, self.GROSZES)
+            grosz_in_words: str = minor[lgroszes]
         else:
             grosz_in_words: str = u("%d/100") % lgroszes
-        return self.thing_in_words(lzlotys, self.ZLOTYS) + u(" ") + grosz_in_words
+        return (self.number_in_words(lzlotys) + u(" ") + major[100 if lzlotys == 1 else lzlotys % 100]
+                + u(" ") + grosz_in_words)
+
+    def numbers_in_words(self, numbers: Iterable[Union[int, float, str, Decimal]]) -> List[str]:
+        """
+            This method converts many numbers into words in Polish at once, returning a list in input order.
+            Repeated inputs are converted only once. A NumPy integer array is split into three-digit groups
+            in a vectorized way, the other inputs go through `number_in_words`.
+
+            Args:
+                - numbers - iterable of int, float, str or a NumPy integer array
+        """
+        np = sys.modules.get('numpy')  # NumPy is optional, an array can only come from an imported NumPy
+        if np is not None and isinstance(numbers, np.ndarray) and numbers.dtype.kind in 'iu':
+            unique: np.ndarray
+            inverse: np.ndarray
+            unique, inverse = np.unique(numbers, return_inverse=True)
+            unique_words: List[str] = self._integers_in_words(unique)
+            return [unique_words[i] for i in inverse.ravel().tolist()]
+
+        cache: Dict[Tuple[type, Any], str] = {}
+        result: List[str] = []
+        for number in numbers:
+            key: Tuple[type, Any] = (number.__class__, number)
+            words: Optional[str] = cache.get(key)
+            if words is None:
+                if number.__class__ is int and number > 0:
+                    words = self._triples_in_words(self._int_triples(number))
+                else:
+                    words = self.number_in_words(number)
+                cache[key] = words
+            result.append(words)
+        return result
+
+    def _integers_in_words(self, integers: 'np.ndarray') -> List[str]:
+        """
+            This method converts a sorted NumPy integer array into words in Polish,
+            computing the three-digit groups of all non-negative values with one vectorized division.
+        """
+        import numpy as np
+
+        result: List[str] = []
+        negative: np.ndarray = integers[integers < 0]
+        result.extend(self.number_in_words(int(number))
+                      for number in negative.tolist())
+
+        integers = integers[integers >= 0]
+        if integers.size:
+            count: int = max(1, (len(str(int(integers[-1]))) + 2) // 3)
+            powers: np.ndarray = np.array(
+                [1000 ** i for i in range(count)], dtype=integers.dtype)
+            triples: List[List[int]] = (
+                (integers[:, None] // powers) % 1000).tolist()
+            result.extend(self._triples_in_words(row) if any(row) else u("zero")
+                          for row in triples)
+        return result
+
+    def amounts_in_words(self, numbers: Iterable[float], fmt: int = 0, currency: str = 'PLN') -> List[str]:
+        """
+            This method converts many monetary amounts into words in Polish at once, returning a list in input order.
+            Repeated amounts are converted only once, and zlotys of all amounts go through `numbers_in_words`.
+
+            Args:
+                - numbers - iterable of float or a NumPy array, numbers of zlotys with groszes after the comma
+                - fmt - (format) if 0, then groszes in the form xx/100, in words in p. case
+                - currency - currency code: PLN or one of CURRENCIES (EUR, USD, GBP, CHF)
+        """
+        major, minor = self._currency_forms(currency)
+        order: List[int]
+        zlotys: Union[List[int], 'np.ndarray']
+        groszes: Union[List[int], 'np.ndarray']
+        np = sys.modules.get('numpy')  # NumPy is optional, an array can only come from an imported NumPy
+        if np is not None and isinstance(numbers, np.ndarray):
+            unique: np.ndarray
+            inverse: np.ndarray
+            unique, inverse = np.unique(numbers, return_inverse=True)
+            order = inverse.ravel().tolist()
+            zlotys = np.trunc(unique).astype(np.int64)
+            groszes = (unique * 100 + 0.5).astype(np.int64) % 100
+        else:
+            index: Dict[float, int] = {}
+            order = [index.setdefault(number, len(index)) for number in numbers]
+            zlotys = [int(number) for number in index]
+            groszes = [int(number * 100 + 0.5) % 100 for number in index]
+
+        zloty_words: List[str] = self.numbers_in_words(zlotys)
+        if fmt != 0:
+            grosz_words: List[str] = [minor[n] for n in list(groszes)]
+        else:
+            grosz_words: List[str] = [u("%d/100") % n for n in list(groszes)]
+
+        amount_words: List[str] = [
+            words + u(" ") + major[100 if n == 1 else n % 100] + u(" ") + grosz
+            for words, n, grosz in zip(zloty_words, list(zlotys), grosz_words)
+        ]
+        return [amount_words[i] for i in order]
+
+    def currency_amounts_in_words(self, amounts: Iterable[Tuple[float, str]], fmt: int = 0) -> List[str]:
+        """
+            This method converts many (amount, currency) pairs into words in Polish at once, returning a list
+            in input order. Amounts are grouped by currency and every group goes through `amounts_in_words`,
+            so all currencies share the three-digit group words.
+
+            Args:
+                - amounts - iterable of (amount, currency code) pairs, e.g. [(12.5, 'EUR'), (3, 'PLN')]
+                - fmt - (format) if 0, then minor units in the form xx/100, in words in p. case
+        """
+        groups: Dict[str, List[int]] = {}
+        values: Dict[str, List[float]] = {}
+        count: int = 0
+        for position, (number, currency) in enumerate(amounts):
+            groups.setdefault(currency, []).append(position)
+            values.setdefault(currency, []).append(number)
+            count = position + 1
+
+        results: List[str] = [u("")] * count
+        for currency, positions in groups.items():
+            for position, words in zip(positions, self.amounts_in_words(values[currency], fmt, currency)):
+                results[position] = words
+        return results
 
     def convert_numbers_in_text(self, text: str) -> str:
         """
             This method converts numbers in a text into words in Polish. Yes is not perfect, but it works in most cases. If you want grammatical correctness use AI.
+
+            Numbers are found in a single pass with a compiled pattern: a run of digits,
+            optionally joined by single dots or commas placed between digits.
+            If the instance was created with `extended=True`, the same single pass also expands dates
+            (15.08.2024, 2024-08-15), times (12:30), ordinals (2-gi, 21-szego), Roman numerals before a known
+            word (XIV wiek), percentages and units (50%, 3 km).
+        """
+        if self.extended:
+            return self._text_pattern.sub(self._text_token_in_words, text)
+        return NUMBER_TOKEN_PATTERN.sub(self._number_token_in_words, text)
+
+    def _number_token_in_words(self, match: Match) -> str:
+        """
+            This method converts one numeric token found by `convert_numbers_in_text` into words.
+            A token with more than one dot (or comma) is read as separate numbers joined by that character,
+            otherwise it is read as a single (possibly decimal) number.
+        """
+        number: str = match.group()
+        for separator in ('.', ','):
+            if number.count(separator) > 1:
+                return separator.join(map(self.number_in_words, number.split(separator)))
+        return self.number_in_words(number)
+
+    def _match_number_word(self, text: str, start: int) -> Optional[Tuple[int, Tuple[str, int]]]:
+        """
+            This method walks the word trie from `start` (case-insensitive) and returns the end and the entry
+            of the longest number word that ends at a word boundary, or None.
+        """
+        node: Dict[str, Any] = self._word_trie
+        found: Optional[Tuple[int, Tuple[str, int]]] = None
+        length: int = len(text)
+        i: int = start
+        while i < length:
+            node = node.get(text[i].lower())
+            if node is None:
+                break
+            i += 1
+            if '' in node and (i == length or not (text[i].isalnum() or text[i] == '_')):
+                found = (i, node[''])
+        return found
+
+    def _number_word_groups(self, text: str, start: int) -> Tuple[int, List[Tuple[int, int, int]]]:
+        """
+            This method reads the run of number words separated by spaces that starts at `start` and splits it
+            into numbers. Returns the end of the run and (start, end, value) of every number in it.
+            A word that cannot continue the current number ("dwa trzy", "pięć sto") starts a new one.
         """
-        result: str = ''
-        number: str = ''
-        special_chars: List[str] = ['!', '@', '#', '$', '%', '^', '&', '*',
-                                    '(', ')', '_', '+', '~', '`', '{', '}', '|', '[', ']', '\\', ':', '"', ';', "'", '<', '>', '?', '/', '-', '.', ',']
-        for i, char in enumerate(text):
-            if char.isdigit() or (char in ['.', ','] and i > 0 and i < len(text) - 1 and text[i-1].isdigit() and text[i+1].isdigit()):
-                number += char
+        groups: List[Tuple[int, int, int]] = []
+        group_start: int = start
+        group_end: int = start
+        total: int = 0
+        triple: int = 0
+        stage: Optional[int] = None  # None - no number, 0 - after scale, 1 - hundred, 2 - ten, 3 - unit or teen
+        zero: bool = False  # the current number is "zero": only one scale word ("zero tysięcy" - 0) continues it
+        last_scale: Optional[int] = None
+        position: int = start
+
+        while True:
+            match: Optional[Tuple[int, Tuple[str, int]]] = self._match_number_word(text, position)
+            if match is None:
+                break
+            end: int
+            kind: str
+            value: int
+            end, (kind, value) = match
+
+            if stage is None:
+                fits: bool = True
+            elif zero:
+                fits = kind == 'scale' and last_scale is None
+            elif kind == 'zero' or stage == 3 and kind != 'scale':
+                fits = False
+            elif kind == 'hundred':
+                fits = stage == 0
+            elif kind == 'ten':
+                fits = stage <= 1
+            elif kind == 'teen':
+                fits = stage <= 1
+            elif kind == 'unit':
+                fits = stage <= 2
             else:
-                if number and number not in special_chars:
-                    for special_char in special_chars:
-                        if number.count(special_char) > 1:
-                            for part in number.split(special_char):
-                                if part:
-                                    number_in_words: str = self.number_in_words(
-                                        part)
-                                    result += number_in_words + special_char
-                            result = result[:-1]
-                            break
-                    else:
-                        if number.count('.') == 1 or number.count(',') == 1:
-                            number_in_words: str = self.number_in_words(number)
-                            result += number_in_words
-                        else:
-                            parts: List[str] = re.split('(\D)', number)
-                            for part in parts:
-                                if part.isdigit():
-                                    number_in_words: str = self.number_in_words(
-                                        part)
-                                    result += number_in_words
-                                else:
-                                    result += part
-                    number = ''
-                result += char
-        if number and number not in special_chars:
-            number_in_words: str = self.number_in_words(number)
-            result += number_in_words
-        return result
+                fits = (stage > 0 or triple == 0) and (last_scale is None or value < last_scale)
+
+            if not fits:
+                groups.append((group_start, group_end, total + triple))
+                group_start = position
+                total, triple, stage, last_scale, zero = 0, 0, None, None, False
+
+            if kind == 'scale':
+                total += (0 if zero else triple or 1) * 1000 ** value
+                triple, stage, last_scale = 0, 0, value
+            else:
+                triple += value
+                stage = {'zero': 3, 'hundred': 1, 'ten': 2, 'teen': 3, 'unit': 3}[kind]
+                zero = kind == 'zero'
+            group_end = end
+
+            position = end
+            while position < len(text) and text[position] in ' \t\u00a0':
+                position += 1
+            if position == end:
+                break
+
+        if stage is not None:
+            groups.append((group_start, group_end, total + triple))
+        return group_end, groups
+
+    def words_in_number(self, words: str) -> int:
+        """
+            This method converts a number written in Polish words into an int, e.g. "sto dwadzieścia trzy tysiące"
+            into 123000. It is the reverse of `number_in_words` for integers.
+
+            Raises:
+                - ValueError - if the text is not exactly one number in words
+        """
+        stripped: str = words.strip()
+        end: int
+        groups: List[Tuple[int, int, int]]
+        end, groups = self._number_word_groups(stripped, 0)
+        if len(groups) != 1 or end != len(stripped):
+            raise ValueError(f"Not a number in words: {words!r}")
+        return groups[0][2]
+
+    def convert_words_in_text(self, text: str) -> str:
+        """
+            This method replaces numbers written in Polish words in a text with digits, e.g. for ASR
+            post-processing: "mam sto dwadzieścia trzy tysiące złotych" becomes "mam 123000 złotych".
+            Every word start is matched against a precompiled trie of all number word forms, so the scan
+            is linear in the length of the text.
+        """
+        result: List[str] = []
+        copied: int = 0
+        i: int = 0
+        length: int = len(text)
+        while i < length:
+            if not text[i].isalpha() or (i and (text[i - 1].isalnum() or text[i - 1] == '_')):
+                i += 1
+                continue
+            end: int
+            groups: List[Tuple[int, int, int]]
+            end, groups = self._number_word_groups(text, i)
+            if not groups:
+                while i < length and (text[i].isalnum() or text[i] == '_'):
+                    i += 1
+                continue
+            for group_start, group_end, value in groups:
+                result.append(text[copied:group_start])
+                result.append(str(value))
+                copied = group_end
+            i = end
+        result.append(text[copied:])
+        return ''.join(result)
+
+    def ordinal_in_words(self, number: int, form: str = 'm_nom') -> str:
+        """
+            This method converts a non-negative integer into an ordinal number in Polish, e.g. 2024 into
+            "dwa tysiące dwudziesty czwarty". Only the last two words are ordinal, as in Polish; round hundreds
+            and thousands become one word ("dwusetny", "dwutysięczny").
+
+            Args:
+                - number - int
+                - form - one of `ORDINAL_FORMS`: 'm_nom', 'f_nom', 'n_nom', 'm_gen', 'f_gen', 'm_loc'
+        """
+        table: Dict[str, List[str]] = self._ordinal_words[form]
+        low: int = number % 100
+        if low or number == 0:
+            head: int = number - low
+            return (self.number_in_words(head) + u(" ") + table['low'][low]) if head else table['low'][low]
+        hundreds: int = number // 100 % 10
+        if hundreds:
+            head: int = number - hundreds * 100
+            return (self.number_in_words(head) + u(" ") + table['hundreds'][hundreds]) if head \
+                else table['hundreds'][hundreds]
+        if number < 10_000:
+            return table['thousands'][number // 1000]
+        return self.number_in_words(number)
+
+    def _text_token_in_words(self, match: Match) -> str:
+        """
+            This method converts one token found by the `extended` pattern, using the handler of its category.
+        """
+        return getattr(self, '_text_' + match.lastgroup)(match)
+
+    def _text_number(self, match: Match) -> str:
+        return self._number_token_in_words(match)
+
+    def _text_date(self, match: Match) -> str:
+        return u(" ").join((self.ordinal_in_words(int(match.group('date_day'))),
+                            self.MONTHS[int(match.group('date_month'))],
+                            self.ordinal_in_words(int(match.group('date_year')), 'm_gen')))
+
+    def _text_iso_date(self, match: Match) -> str:
+        return u(" ").join((self.ordinal_in_words(int(match.group('iso_day'))),
+                            self.MONTHS[int(match.group('iso_month'))],
+                            self.ordinal_in_words(int(match.group('iso_year')), 'm_gen')))
+
+    def _clock_in_words(self, digits: str) -> str:
+        """
+            This method reads minutes or seconds as on a clock: "05" is "zero pięć", "00" is "zero zero".
+        """
+        if digits[0] == '0':
+            return u("zero ") + (self.UNITS[int(digits[1])] or u("zero"))
+        return self.number_in_words(digits)
+
+    def _text_time(self, match: Match) -> str:
+        hour: int = int(match.group('time_hour'))
+        words: List[str] = [self.ordinal_in_words(hour, 'f_nom') if hour else u("zero"),
+                            self._clock_in_words(match.group('time_minute'))]
+        if match.group('time_second'):
+            words.append(self._clock_in_words(match.group('time_second')))
+        return u(" ").join(words)
+
+    def _text_ordinal(self, match: Match) -> str:
+        suffix: str = match.group('ordinal_suffix')
+        if suffix.endswith('ego') or suffix == 'go':
+            form: str = 'm_gen'
+        elif suffix.endswith('ej'):
+            form: str = 'f_gen'
+        elif suffix.endswith(('ym', 'im')):
+            form: str = 'm_loc'
+        elif suffix.endswith('a'):
+            form: str = 'f_nom'
+        elif suffix.endswith('e'):
+            form: str = 'n_nom'
+        else:
+            form: str = 'm_nom'
+        return self.ordinal_in_words(int(match.group('ordinal_number')), form)
+
+    def _text_roman(self, match: Match) -> str:
+        prep: str = match.group('roman_prep') or u("")
+        context: str = match.group('roman_context')
+        form: str = self.ROMAN_CONTEXT[context]
+        if prep and form == 'm_gen':
+            form = 'm_loc'
+        return prep + self.ordinal_in_words(roman_to_int(match.group('roman_number')), form) + \
+            match.group('roman_space') + context
+
+    def _text_unit(self, match: Match) -> str:
+        number: str = match.group('unit_number')
+        symbol: str = match.group('unit_symbol')
+        words: str = self.number_in_words(number)
+        if '.' in number or ',' in number:
+            return words + u(" ") + self.MEASURE_UNITS[symbol][3]
+        value: int = int(number)
+        if symbol in self.FEMININE_MEASURE_UNITS:
+            if value == 1:
+                words = u("jedna")
+            elif words == u("dwa") or words.endswith(u(" dwa")):
+                words = words[:-3] + u("dwie")
+        return words + u(" ") + self.MEASURE_UNITS[symbol][self._case(value)]
+
+    def convert_numbers_in_stream(self, chunks: Iterable[str], workers: int = 1,
+                                  block_size: int = 1 << 20) -> Iterator[str]:
+        """
+            This method converts numbers in a stream of text (lines or buffers of any size) into words in Polish,
+            yielding the converted text piece by piece, in order. A number split between two chunks is held back
+            until it is complete, so the result is the same as `convert_numbers_in_text` on the joined text.
+
+            Args:
+                - chunks - iterable of str, e.g. an open text file or a list of lines
+                - workers - number of processes; above 1 the text is cut into blocks of about
+                            `block_size` characters at line boundaries and converted in parallel
+                - block_size - size of the blocks sent to the worker processes
+        """
+        if workers > 1:
+            yield from self._convert_numbers_in_blocks(chunks, workers, block_size)
+            return
+
+        carry: str = ''
+        for chunk in chunks:
+            buffer: str = carry + chunk
+            cut: int = self._stream_safe_cut(buffer)
+            carry = buffer[cut:]
+            if cut:
+                yield self.convert_numbers_in_text(buffer[:cut])
+        if carry:
+            yield self.convert_numbers_in_text(carry)
+
+    def _stream_safe_cut(self, text: str) -> int:
+        """
+            This method returns the index up to which `text` can be converted without knowing what follows.
+        """
+        return _text_safe_cut(text) if self.extended else _number_safe_cut(text)
+
+    def _convert_numbers_in_blocks(self, chunks: Iterable[str], workers: int,
+                                   block_size: int) -> Iterator[str]:
+        """
+            This method converts blocks of the stream in worker processes. At most two blocks per worker
+            are in flight, so memory use does not depend on the size of the input.
+        """
+        pending: Deque[Future] = deque()
+        with ProcessPoolExecutor(workers, initializer=_init_stream_worker, initargs=(self,)) as executor:
+            for block in _stream_blocks(chunks, block_size, self._stream_safe_cut):
+                pending.append(executor.submit(_convert_stream_block, block))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def convert_numbers_in_file(self, input_path: str, output_path: str, workers: int = 1,
+                                buffer_size: int = 1 << 20, encoding: str = 'utf-8') -> None:
+        """
+            This method converts numbers in a text file into words in Polish, reading and writing
+            `buffer_size` characters at a time, so files of any size are converted in constant memory.
+
+            Args:
+                - input_path - path of the file to read
+                - output_path - path of the file to write
+                - workers - number of processes, see `convert_numbers_in_stream`
+                - buffer_size - number of characters read at once
+                - encoding - encoding of both files
+        """
+        with open(input_path, 'r', encoding=encoding, newline='') as source, \
+                open(output_path, 'w', encoding=encoding, newline='') as target:
+            chunks: Iterator[str] = iter(partial(source.read, buffer_size), '')
+            for part in self.convert_numbers_in_stream(chunks, workers, buffer_size):
+                target.write(part)
+
+
+def _number_safe_cut(text: str) -> int:
+    """
+        Returns the index where a number at the very end of `text` starts (the number may continue
+        in the next chunk), or len(text) if the text does not end with a number.
+    """
+    end: int = len(text)
+    if end and text[end - 1] in '.,':
+        end -= 1
+    start: int = end
+    while True:
+        while start > 0 and text[start - 1].isdecimal():
+            start -= 1
+        if start >= 2 and start < end and text[start - 1] in '.,' and text[start - 2].isdecimal():
+            start -= 1
+            continue
+        break
+    return start if start < end else len(text)
+
+
+def _text_safe_cut(text: str) -> int:
+    """
+        Returns the index of the last whitespace that no `extended` token can span (tokens only contain
+        a space after a digit, a Roman numeral or the preposition "w"/"we"), or 0 if there is none.
+    """
+    for i in range(len(text) - 1, 0, -1):
+        if text[i].isspace() and not text[i - 1].isspace() and not text[i - 1].isdecimal() \
+                and text[i - 1] not in 'IVXLCDMwe':
+            return i
+    return 0
+
+
+def _stream_blocks(chunks: Iterable[str], block_size: int,
+                   safe_cut: Callable[[str], int] = _number_safe_cut) -> Iterator[str]:
+    """
+        Regroups a stream of text into blocks of at least `block_size` characters, cut after the last
+        newline (or before a trailing number if a block has no newline), so blocks convert independently.
+    """
+    parts: List[str] = []
+    size: int = 0
+    for chunk in chunks:
+        parts.append(chunk)
+        size += len(chunk)
+        if size < block_size:
+            continue
+        block: str = ''.join(parts)
+        cut: int = block.rfind('\n') + 1 or safe_cut(block)
+        if cut:
+            yield block[:cut]
+        parts = [block[cut:]]
+        size = len(parts[0])
+    if size:
+        yield ''.join(parts)
+
+
+_stream_worker: Optional['NumberInWords'] = None
+
+
+def _init_stream_worker(number_in_words: 'NumberInWords') -> None:
+    """
+        Stores the converter in a worker process of `convert_numbers_in_stream`.
+    """
+    global _stream_worker
+    _stream_worker = number_in_words
+
+
+def _convert_stream_block(block: str) -> str:
+    """
+        Converts one block of text in a worker process of `convert_numbers_in_stream`.
+    """
+    return _stream_worker.convert_numbers_in_text(block)
 
 
 def main() -> None:
@@ -283,6 +1350,10 @@ def main() -> None:
     print(f"Input: 0.123_456_789_012_345")
     print(f"Decimal number: {result2}\n")
 
+    result2_exact: str = number_in_words.number_in_words(Decimal('0.05'))
+    print(f"Input: Decimal('0.05')")
+    print(f"Exact decimal: {result2_exact}\n")
+
     result3: str = number_in_words.number_in_words(
         '123_456_789_012_345.123_456_789_012_345')
     print(f"Input: '123_456_789_012_345.123_456_789_012_345'")
@@ -308,6 +1379,21 @@ def main() -> None:
     print(f"Input: 567.89, fmt=1")
     print(f"Amount (format 1): {result7}\n")
 
+    # Test numbers_in_words and amounts_in_words
+    result9: List[str] = number_in_words.numbers_in_words([5, 21, 5])
+    print(f"Input: [5, 21, 5]")
+    print(f"Batch numbers: {result9}\n")
+
+    result10: List[str] = number_in_words.amounts_in_words(
+        [1234.56, 567.89], fmt=1)
+    print(f"Input: [1234.56, 567.89], fmt=1")
+    print(f"Batch amounts: {result10}\n")
+
+    result11: List[str] = number_in_words.currency_amounts_in_words(
+        [(12.5, 'EUR'), (1, 'USD'), (22.01, 'PLN')], fmt=1)
+    print(f"Input: [(12.5, 'EUR'), (1, 'USD'), (22.01, 'PLN')], fmt=1")
+    print(f"Batch amounts in currencies: {result11}\n")
+
     # Test convert_numbers_in_text
     result8: str = number_in_words.convert_numbers_in_text(
         'Rozdział 69.2_3 / 4 (test96).')
@@ -315,5 +1401,91 @@ def main() -> None:
     print(f"Text with numbers: {result8}")
 
 
+def benchmark_number_in_words(repeat: int = 100_000) -> None:
+    """
+        Benchmark function: average time of one `number_in_words` call for each kind of input,
+        next to the previous conversion of the same input through `str()` (`repr` of a float) and int()
+    """
+    number_in_words: NumberInWords = NumberInWords()
+
+    def float_path(number: Union[int, float, str, Decimal]) -> str:
+        # The conversion before the exact Decimal and string path: leading zeros of the fraction are lost
+        # and scientific notation fails in int()
+        text: str = str(number)
+        separator: str = '.' if '.' in text else ','
+        integer_str, _, decimal_str = text.partition(separator)
+        integer_digits: str = str(int(integer_str))
+        decimal_digits: str = str(int(decimal_str or '0'))
+        words: List[str] = []
+        if integer_digits == '0':
+            words.append(u("zero"))
+        elif integer_digits[0] != '-':
+            words.append(number_in_words._triples_in_words(number_in_words._digit_triples(integer_digits)))
+        if decimal_digits != '0':
+            words.extend((u("przecinek"), float_path(decimal_digits)))
+        return u(" ").join(words)
+
+    inputs: List[Union[int, float, str, Decimal]] = [
+        123_456, 1234.5678, '1234,5678', '0.05', Decimal('1234.5678'), '1e-05'
+    ]
+    for number in inputs:
+        timings: List[str] = []
+        outputs: List[str] = []
+        for label, convert in (('exact', number_in_words.number_in_words), ('float/repr', float_path)):
+            try:
+                outputs.append(convert(number))
+            except ValueError:
+                timings.append(f"{label}: fails")
+                continue
+            start_ns: int = perf_counter_ns()
+            for _ in range(repeat):
+                convert(number)
+            duration_ns: float = (perf_counter_ns() - start_ns) / repeat
+            timings.append(f"{label}: {duration_ns:.0f} ns/call")
+        same: str = '' if len(outputs) < 2 else " (same words)" if outputs[0] == outputs[1] else " (different words)"
+        print(f"number_in_words({number!r}): {', '.join(timings)}{same}")
+
+
+def benchmark_amounts_in_words(count: int = 100_000) -> None:
+    """
+        Benchmark function: converts a list of amounts in mixed currencies one by one and in one batch
+    """
+    number_in_words: NumberInWords = NumberInWords()
+    currencies: List[str] = ['PLN', 'EUR', 'USD', 'GBP', 'CHF']
+    amounts: List[Tuple[float, str]] = [
+        (round((i * 7919) % 1_000_000 / 100, 2), currencies[i % len(currencies)]) for i in range(count)
+    ]
+
+    start_ns: int = perf_counter_ns()
+    for number, currency in amounts:
+        number_in_words.amount_in_words(number, 1, currency)
+    duration_ns: float = (perf_counter_ns() - start_ns) / count
+    print(f"amount_in_words: {duration_ns:.0f} ns/amount")
+
+    start_ns = perf_counter_ns()
+    number_in_words.currency_amounts_in_words(amounts, 1)
+    duration_ns = (perf_counter_ns() - start_ns) / count
+    print(f"currency_amounts_in_words: {duration_ns:.0f} ns/amount")
+
+
+def benchmark_convert_numbers_in_text(size_mb: float = 4.0) -> None:
+    """
+        Benchmark function: converts numbers in a generated multi-megabyte Polish text
+    """
+    sample: str = (
+        'Rozdział 12. W roku 1984 Jan miał 37 lat, 2 psy i 1 250,50 zł oszczędności. '
+        'Dnia 15.08.2024 o 12:30 przeszedł 3,5 km i zapłacił 19.99 za bilet nr 4021.\n'
+    )
+    text: str = sample * int(size_mb * 1024 * 1024 / len(sample.encode('utf-8')))
+    size: float = len(text.encode('utf-8')) / 1024 / 1024
+
+    number_in_words: NumberInWords = NumberInWords()
+    start_ns: int = perf_counter_ns()
+    number_in_words.convert_numbers_in_text(text)
+    duration_s: float = (perf_counter_ns() - start_ns) / 1_000_000_000
+    print(f"convert_numbers_in_text: {size:.2f} MB in {duration_s:.3f} s "
+          f"({size / duration_s:.2f} MB/s)")
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,328 @@
+"""
+    Module `number_in_words_de` provides a class `NumberInWordsDe`
+        that converts numbers into German words (long scale).
+    It is the German backend of `utils.number_backends`.
+
+    -*- coding: utf-8 -*-
+
+    * Example: First, create an instance of the `NumberInWordsDe` class:
+        from utils.number_in_words_de import NumberInWordsDe
+        number_in_words: NumberInWordsDe = NumberInWordsDe()
+
+    * Example usage of function `number_in_words`:
+    Inputs: int, float, str, Decimal (the fraction is read digit by digit; any number of digits,
+        scale names past Quadrilliarde are generated: Quintillion, Dezillion, ...; '1e-05' is expanded exactly)
+        result1: str = number_in_words.number_in_words(2_021_001)
+            # Outputs: "zwei Millionen einundzwanzigtausendeins"
+        result2: str = number_in_words.number_in_words('3,14')
+            # Outputs: "drei Komma eins vier"
+
+    * Example usage of function `thing_in_words`:
+        result3: str = number_in_words.thing_in_words(21, ["Apfel", "Äpfel"])
+            # Outputs: "einundzwanzig Äpfel"
+
+    * Example usage of function `amount_in_words`:
+    Currencies: EUR (default), USD, CHF, PLN
+        result4: str = number_in_words.amount_in_words(1234.56)
+            # Outputs: "eintausendzweihundertvierunddreißig Euro 56/100"
+        result5: str = number_in_words.amount_in_words(1.01, fmt=1, currency='CHF')
+            # Outputs: "ein Franken ein Rappen"
+
+    * Example usage of function `convert_numbers_in_text`:
+        result6: str = number_in_words.convert_numbers_in_text('Kapitel 12 hat 1.250 Wörter und 3,5 Seiten.')
+            # Outputs: "Kapitel zwölf hat eintausendzweihundertfünfzig Wörter und drei Komma fünf Seiten."
+"""
+
+import re
+from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import lru_cache
+from typing import List, Match, Pattern, Sequence, Union
+
+
+# Numbers with an optional thousands dot grouping and a decimal comma
+NUMBER_TOKEN_PATTERN_DE: Pattern = re.compile(r'\d{1,3}(?:\.\d{3})+(?:,\d+)?|\d+(?:,\d+)?')
+
+# Latin prefixes of the long scale past `BIG`: 10^(6n) is "<prefix>llion", 10^(6n+3) is "<prefix>lliarde"
+SCALE_PREFIXES_DE: List[str] = [
+    "", "mi", "bi", "tri", "quadri", "quinti", "sexti", "septi", "okti", "noni"
+]
+SCALE_UNIT_PREFIXES_DE: List[str] = [
+    "", "un", "duo", "tre", "quattuor", "quin", "sex", "septen", "okto", "novem"
+]
+SCALE_TEN_PREFIXES_DE: List[str] = [
+    "", "dezi", "viginti", "triginti", "quadraginti", "quinquaginti",
+    "sexaginti", "septuaginti", "oktoginti", "nonaginti"
+]
+SCALE_HUNDRED_PREFIXES_DE: List[str] = [
+    "", "zenti", "duzenti", "trezenti", "quadringenti", "quingenti",
+    "seszenti", "septingenti", "oktingenti", "nongenti"
+]
+
+
+def _scale_prefix_de(n: int) -> str:
+    """
+        Returns the Latin prefix of the n-th "-llion" (1 - mi, 2 - bi, 11 - undezi, 100 - zenti, ...).
+        Numbers from 1000 up are built from the prefixes of their three-digit groups joined with "lli",
+        an empty group being "ni".
+    """
+    if n >= 1000:
+        groups: List[str] = []
+        while n > 0:
+            n, group = divmod(n, 1000)
+            groups.append(_scale_prefix_de(group) if group else "ni")
+        return "lli".join(reversed(groups))
+    if n < 10:
+        return SCALE_PREFIXES_DE[n]
+    return SCALE_UNIT_PREFIXES_DE[n % 10] + SCALE_TEN_PREFIXES_DE[n // 10 % 10] + SCALE_HUNDRED_PREFIXES_DE[n // 100]
+
+
+@lru_cache(maxsize=None)
+def scale_name_forms_de(index: int) -> List[str]:
+    """
+        Returns the two forms [one, many] of the scale word for the three-digit group at `index`
+        (2 - Million, 3 - Milliarde, 4 - Billion, ...).
+
+        >>> scale_name_forms_de(10)
+        ['Quintillion', 'Quintillionen']
+        >>> scale_name_forms_de(21)
+        ['Dezilliarde', 'Dezilliarden']
+    """
+    stem: str = _scale_prefix_de(index // 2).capitalize()
+    if index % 2:
+        return [stem + "lliarde", stem + "lliarden"]
+    return [stem + "llion", stem + "llionen"]
+
+
+@dataclass
+class NumberInWordsDe:
+    """
+        NumberInWordsDe is a class that converts numbers into German words (long scale).
+
+        >>> number_in_words = NumberInWordsDe()
+        >>> number_in_words.number_in_words(1234)
+        'eintausendzweihundertvierunddreißig'
+        >>> number_in_words.number_in_words('3,14')
+        'drei Komma eins vier'
+        >>> number_in_words.amount_in_words(21.5, fmt=1)
+        'einundzwanzig Euro fünfzig Cent'
+    """
+    UNITS: list = field(default_factory=lambda: [
+        "null", "eins", "zwei", "drei", "vier",
+        "fünf", "sechs", "sieben", "acht", "neun"
+    ])
+    TEENS: list = field(default_factory=lambda: [
+        "zehn", "elf", "zwölf", "dreizehn", "vierzehn",
+        "fünfzehn", "sechzehn", "siebzehn", "achtzehn", "neunzehn"
+    ])
+    TENS: list = field(default_factory=lambda: [
+        "", "zehn", "zwanzig", "dreißig", "vierzig",
+        "fünfzig", "sechzig", "siebzig", "achtzig", "neunzig"
+    ])
+    # Scales from 10^6 on: [one, many]
+    BIG: list = field(default_factory=lambda: [
+        ["Million", "Millionen"], ["Milliarde", "Milliarden"],
+        ["Billion", "Billionen"], ["Billiarde", "Billiarden"],
+        ["Trillion", "Trillionen"], ["Trilliarde", "Trilliarden"],
+        ["Quadrillion", "Quadrillionen"], ["Quadrilliarde", "Quadrilliarden"],
+    ])
+    # Code: [major unit forms, minor unit forms], each [one, many]
+    CURRENCIES: dict = field(default_factory=lambda: {
+        'EUR': [["Euro", "Euro"], ["Cent", "Cent"]],
+        'USD': [["Dollar", "Dollar"], ["Cent", "Cent"]],
+        'CHF': [["Franken", "Franken"], ["Rappen", "Rappen"]],
+        'PLN': [["Złoty", "Złoty"], ["Groszy", "Groszy"]],
+    })
+    _triple_words: list = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._triple_words = [self._number_in_words_3digits(n) for n in range(1000)]
+
+    def _number_in_words_3digits(self, number: int) -> str:
+        """
+            This method converts a number from 0 to 999 into one word, 0 giving an empty string.
+            A final one is "eins" (einhunderteins), inside compounds it is "ein" (einundzwanzig).
+        """
+        hundreds, rest = divmod(number, 100)
+        words: str = "ein" + "hundert" if hundreds == 1 else (self.UNITS[hundreds] + "hundert" if hundreds else "")
+        if 10 <= rest < 20:
+            words += self.TEENS[rest - 10]
+        elif rest >= 20:
+            tens, unit = divmod(rest, 10)
+            words += ("ein" if unit == 1 else self.UNITS[unit]) + "und" + self.TENS[tens] if unit else self.TENS[tens]
+        elif rest:
+            words += self.UNITS[rest]
+        return words
+
+    def _integer_in_words(self, number: int) -> str:
+        """
+            This method converts a non-negative integer into words: the part below a million is one word,
+            millions and larger scales are separate words ("eine Million", "zwei Milliarden").
+        """
+        triples: List[int] = []
+        while number:
+            number, triple = divmod(number, 1000)
+            triples.append(triple)
+        return self._triples_in_words(triples)
+
+    def _big(self, index: int) -> List[str]:
+        """
+            This method returns the forms [one, many] of the scale word for the three-digit group at `index`
+            (2 - Million, 3 - Milliarde, ...), from `BIG` or generated.
+        """
+        return self.BIG[index - 2] if index - 2 < len(self.BIG) else scale_name_forms_de(index)
+
+    def _triples_in_words(self, triples: Sequence[int]) -> str:
+        """
+            This method converts a number given as its three-digit groups (least significant first) into words.
+        """
+        units: int = triples[0] if triples else 0
+        thousands: int = triples[1] if len(triples) > 1 else 0
+        low: str = ""
+        if thousands:
+            low = ("ein" if thousands == 1 else self._compound(thousands)) + "tausend"
+        if units:
+            low += self._triple_words[units]
+
+        words: List[str] = []
+        for index in range(len(triples) - 1, 1, -1):
+            triple: int = triples[index]
+            if triple:
+                one, many = self._big(index)
+                if triple == 1:
+                    words.append("eine " + one)
+                else:
+                    words.append(self._feminine(self._triple_words[triple]) + " " + many)
+        if low:
+            words.append(low)
+        return " ".join(words) or self.UNITS[0]
+
+    @staticmethod
+    def _digit_triples(digits: str) -> List[int]:
+        """
+            This method splits a string of digits into its three-digit groups, least significant first.
+            Plain ASCII digits are not passed through int(), which refuses strings over 4300 digits.
+        """
+        if not (digits.isascii() and digits.isdigit()):
+            digits = str(int(digits))  # a sign, other digit scripts; anything else raises ValueError
+            if digits.startswith("-"):
+                raise ValueError(f"Not a number: {digits!r}")
+        return [int(digits[max(0, end - 3):end]) for end in range(len(digits), 0, -3)]
+
+    @staticmethod
+    def _plain_notation(text: str) -> str:
+        """
+            This method expands scientific notation ('1e-05', '2.5E+20') exactly through `Decimal`.
+        """
+        if 'e' in text or 'E' in text:
+            return format(Decimal(text), 'f')
+        return text
+
+    def _compound(self, number: int) -> str:
+        """
+            This method returns the words of 1-999 as the first part of a compound (einhunderteintausend).
+        """
+        words: str = self._triple_words[number]
+        return words[:-1] if words.endswith("eins") else words
+
+    def _feminine(self, words: str) -> str:
+        """
+            This method returns the words of 1-999 before a feminine scale word (einhunderteine Millionen).
+        """
+        return words[:-1] + "e" if words.endswith("eins") else words
+
+    def number_in_words(self, number: Union[int, float, str, Decimal]) -> str:
+        """
+            This method converts a number into German words. The fractional part is read digit by digit after "Komma".
+
+            Args:
+                - number - int, float, str or Decimal; in strings "_" is ignored, with a decimal comma
+                  the dots are thousands separators, otherwise a dot is the decimal point
+        """
+        if isinstance(number, int):
+            if number < 0:
+                return "minus " + self._integer_in_words(-number)
+            return self._integer_in_words(number)
+        if isinstance(number, float):
+            text: str = format(Decimal(repr(number)), 'f')
+        elif isinstance(number, Decimal):
+            text = format(number, 'f')
+        else:
+            text = str(number).strip().replace("_", "")
+            if "," in text:
+                text = text.replace(".", "").replace(",", ".")
+            text = self._plain_notation(text)
+        prefix: str = ""
+        if text.startswith("-"):
+            prefix, text = "minus ", text[1:]
+        integer, _, fraction = text.partition(".")
+        words: str = prefix + self._triples_in_words(self._digit_triples(integer or "0"))
+        if fraction:
+            words += " Komma " + " ".join(self.UNITS[int(digit)] for digit in fraction)
+        return words
+
+    def thing_in_words(self, number: int, thing: List[str]) -> str:
+        """
+            This method converts a number into words and appends the correct form of a noun.
+            One is "ein" (masculine and neuter nouns).
+
+            Args:
+                - number - int
+                - thing - array of forms [Ding, Dinge]
+        """
+        if number == 1:
+            return "ein " + thing[0]
+        return self.number_in_words(number) + " " + thing[1]
+
+    def amount_in_words(self, number: float, fmt: int = 0, currency: str = 'EUR') -> str:
+        """
+            This method converts a monetary amount into German words.
+
+            Args:
+                - number - float, major units with minor units after the point
+                - fmt - (format) if 0, then minor units in the form xx/100, otherwise in words
+                - currency - currency code: one of CURRENCIES (EUR, USD, CHF, PLN)
+        """
+        if currency not in self.CURRENCIES:
+            raise ValueError(f"Unknown currency: {currency}")
+        major, minor = self.CURRENCIES[currency]
+        units: int = int(number)
+        cents: int = int(number * 100 + 0.5) % 100
+        if fmt != 0:
+            cent_in_words: str = self.thing_in_words(cents, minor)
+        else:
+            cent_in_words = "%d/100" % cents
+        return self.thing_in_words(units, major) + " " + cent_in_words
+
+    def convert_numbers_in_text(self, text: str) -> str:
+        """
+            This method converts numbers in a text into German words in a single pass.
+            "1.250" is read as eintausendzweihundertfünfzig, "3,5" as drei Komma fünf.
+        """
+        return NUMBER_TOKEN_PATTERN_DE.sub(self._number_token_in_words, text)
+
+    def _number_token_in_words(self, match: Match) -> str:
+        """
+            This method converts a single number found by the pattern.
+        """
+        token: str = match.group()
+        if "," not in token and "." in token:
+            token = token.replace(".", "")
+        return self.number_in_words(token)
+
+
+def main() -> None:
+    """
+        Test function
+    """
+    number_in_words: NumberInWordsDe = NumberInWordsDe()
+    print(number_in_words.number_in_words(2_021_001))
+    print(number_in_words.number_in_words('3,14'))
+    print(number_in_words.thing_in_words(21, ["Apfel", "Äpfel"]))
+    print(number_in_words.amount_in_words(1234.56))
+    print(number_in_words.amount_in_words(1.01, fmt=1, currency='CHF'))
+    print(number_in_words.convert_numbers_in_text('Kapitel 12 hat 1.250 Wörter und 3,5 Seiten.'))
+
+
+if __name__ == '__main__':
+    main()
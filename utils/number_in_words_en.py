@@ -0,0 +1,284 @@
+"""
+    Module `number_in_words_en` provides a class `NumberInWordsEn`
+        that converts numbers into English words (short scale, American style).
+    It is the English backend of `utils.number_backends`.
+
+    -*- coding: utf-8 -*-
+
+    * Example: First, create an instance of the `NumberInWordsEn` class:
+        from utils.number_in_words_en import NumberInWordsEn
+        number_in_words: NumberInWordsEn = NumberInWordsEn()
+
+    * Example usage of function `number_in_words`:
+    Inputs: int, float, str, Decimal (the fraction is read digit by digit; any number of digits,
+        scale names past decillion are generated: undecillion, vigintillion, ...; '1e-05' is expanded exactly)
+        result1: str = number_in_words.number_in_words(1_234_567)
+            # Outputs: "one million two hundred thirty-four thousand five hundred sixty-seven"
+        result2: str = number_in_words.number_in_words('3.14')
+            # Outputs: "three point one four"
+
+    * Example usage of function `thing_in_words`:
+        result3: str = number_in_words.thing_in_words(21, ["apple", "apples"])
+            # Outputs: "twenty-one apples"
+
+    * Example usage of function `amount_in_words`:
+    Currencies: USD (default), EUR, GBP, PLN
+        result4: str = number_in_words.amount_in_words(1234.56)
+            # Outputs: "one thousand two hundred thirty-four dollars 56/100"
+        result5: str = number_in_words.amount_in_words(1.01, fmt=1, currency='GBP')
+            # Outputs: "one pound one penny"
+
+    * Example usage of function `convert_numbers_in_text`:
+        result6: str = number_in_words.convert_numbers_in_text('Chapter 12 has 1,250 words and 3.5 pages.')
+            # Outputs: "Chapter twelve has one thousand two hundred fifty words and three point five pages."
+"""
+
+import re
+from dataclasses import dataclass, field
+from decimal import Decimal
+from functools import lru_cache
+from typing import List, Match, Pattern, Sequence, Union
+
+
+# Numbers with an optional thousands comma grouping and a decimal point
+NUMBER_TOKEN_PATTERN_EN: Pattern = re.compile(r'\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?')
+
+# Latin prefixes of the short scale past `BIG`: 10^(3n+3) is "<prefix>illion" (Conway-Wechsler names)
+SCALE_PREFIXES_EN: List[str] = [
+    "", "m", "b", "tr", "quadr", "quint", "sext", "sept", "oct", "non"
+]
+SCALE_UNIT_PREFIXES_EN: List[str] = [
+    "", "un", "duo", "tre", "quattuor", "quin", "sex", "septen", "octo", "novem"
+]
+SCALE_TEN_PREFIXES_EN: List[str] = [
+    "", "deci", "viginti", "triginti", "quadraginti", "quinquaginti",
+    "sexaginti", "septuaginti", "octoginti", "nonaginti"
+]
+SCALE_HUNDRED_PREFIXES_EN: List[str] = [
+    "", "centi", "ducenti", "trecenti", "quadringenti", "quingenti",
+    "sescenti", "septingenti", "octingenti", "nongenti"
+]
+
+
+def _scale_prefix_en(n: int) -> str:
+    """
+        Returns the Latin prefix of the n-th "-illion" (1 - m, 2 - b, 11 - undec, 100 - cent, ...).
+        Numbers from 1000 up are built from the prefixes of their three-digit groups joined with "illi",
+        an empty group being "n".
+    """
+    if n >= 1000:
+        groups: List[str] = []
+        while n > 0:
+            n, group = divmod(n, 1000)
+            groups.append(_scale_prefix_en(group) if group else "n")
+        return "illi".join(reversed(groups))
+    if n < 10:
+        return SCALE_PREFIXES_EN[n]
+    # The tens and hundreds end in "i", which the "-illion" replaces
+    return (SCALE_UNIT_PREFIXES_EN[n % 10] + SCALE_TEN_PREFIXES_EN[n // 10 % 10]
+            + SCALE_HUNDRED_PREFIXES_EN[n // 100])[:-1]
+
+
+@lru_cache(maxsize=None)
+def scale_name_en(index: int) -> str:
+    """
+        Returns the scale word of the three-digit group at `index` (2 - million, 3 - billion, ...).
+
+        >>> scale_name_en(12)
+        'undecillion'
+        >>> scale_name_en(21)
+        'vigintillion'
+    """
+    return _scale_prefix_en(index - 1) + "illion"
+
+
+@dataclass
+class NumberInWordsEn:
+    """
+        NumberInWordsEn is a class that converts numbers into English words (short scale, American style).
+
+        >>> number_in_words = NumberInWordsEn()
+        >>> number_in_words.number_in_words(1234)
+        'one thousand two hundred thirty-four'
+        >>> number_in_words.thing_in_words(21, ["apple", "apples"])
+        'twenty-one apples'
+        >>> number_in_words.amount_in_words(1.01, fmt=1, currency='GBP')
+        'one pound one penny'
+    """
+    UNITS: list = field(default_factory=lambda: [
+        "zero", "one", "two", "three", "four",
+        "five", "six", "seven", "eight", "nine"
+    ])
+    TEENS: list = field(default_factory=lambda: [
+        "ten", "eleven", "twelve", "thirteen", "fourteen",
+        "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"
+    ])
+    TENS: list = field(default_factory=lambda: [
+        "", "ten", "twenty", "thirty", "forty",
+        "fifty", "sixty", "seventy", "eighty", "ninety"
+    ])
+    BIG: list = field(default_factory=lambda: [
+        "", "thousand", "million", "billion", "trillion", "quadrillion",
+        "quintillion", "sextillion", "septillion", "octillion", "nonillion", "decillion"
+    ])
+    # Code: [major unit forms, minor unit forms], each [one, many]
+    CURRENCIES: dict = field(default_factory=lambda: {
+        'USD': [["dollar", "dollars"], ["cent", "cents"]],
+        'EUR': [["euro", "euros"], ["cent", "cents"]],
+        'GBP': [["pound", "pounds"], ["penny", "pence"]],
+        'PLN': [["zloty", "zlotys"], ["grosz", "groszy"]],
+    })
+    _triple_words: list = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._triple_words = [self._number_in_words_3digits(n) for n in range(1000)]
+
+    def _number_in_words_3digits(self, number: int) -> str:
+        """
+            This method converts a number from 0 to 999 into words, 0 giving an empty string.
+        """
+        hundreds, rest = divmod(number, 100)
+        words: List[str] = []
+        if hundreds:
+            words.append(self.UNITS[hundreds] + " hundred")
+        if 10 <= rest < 20:
+            words.append(self.TEENS[rest - 10])
+        elif rest >= 20:
+            tens, unit = divmod(rest, 10)
+            words.append(self.TENS[tens] + ("-" + self.UNITS[unit] if unit else ""))
+        elif rest:
+            words.append(self.UNITS[rest])
+        return " ".join(words)
+
+    def _big(self, index: int) -> str:
+        """
+            This method returns the scale word of the three-digit group at `index`, from `BIG` or generated.
+        """
+        return self.BIG[index] if index < len(self.BIG) else scale_name_en(index)
+
+    def _integer_in_words(self, number: int) -> str:
+        """
+            This method converts a non-negative integer into words.
+        """
+        triples: List[int] = []
+        while number:
+            number, triple = divmod(number, 1000)
+            triples.append(triple)
+        return self._triples_in_words(triples)
+
+    def _triples_in_words(self, triples: Sequence[int]) -> str:
+        """
+            This method converts a number given as its three-digit groups (least significant first) into words.
+        """
+        words: List[str] = []
+        for index in range(len(triples) - 1, -1, -1):
+            if triples[index]:
+                words.append(self._triple_words[triples[index]] + (" " + self._big(index) if index else ""))
+        return " ".join(words) or self.UNITS[0]
+
+    @staticmethod
+    def _digit_triples(digits: str) -> List[int]:
+        """
+            This method splits a string of digits into its three-digit groups, least significant first.
+            Plain ASCII digits are not passed through int(), which refuses strings over 4300 digits.
+        """
+        if not (digits.isascii() and digits.isdigit()):
+            digits = str(int(digits))  # a sign, other digit scripts; anything else raises ValueError
+            if digits.startswith("-"):
+                raise ValueError(f"Not a number: {digits!r}")
+        return [int(digits[max(0, end - 3):end]) for end in range(len(digits), 0, -3)]
+
+    @staticmethod
+    def _plain_notation(text: str) -> str:
+        """
+            This method expands scientific notation ('1e-05', '2.5E+20') exactly through `Decimal`.
+        """
+        if 'e' in text or 'E' in text:
+            return format(Decimal(text), 'f')
+        return text
+
+    def number_in_words(self, number: Union[int, float, str, Decimal]) -> str:
+        """
+            This method converts a number into English words. The fractional part is read digit by digit after "point".
+
+            Args:
+                - number - int, float, str or Decimal; in strings "_" and thousands commas are ignored
+        """
+        if isinstance(number, int):
+            if number < 0:
+                return "minus " + self._integer_in_words(-number)
+            return self._integer_in_words(number)
+        if isinstance(number, float):
+            text: str = format(Decimal(repr(number)), 'f')
+        elif isinstance(number, Decimal):
+            text = format(number, 'f')
+        else:
+            text = self._plain_notation(str(number).strip().replace("_", "").replace(",", ""))
+        prefix: str = ""
+        if text.startswith("-"):
+            prefix, text = "minus ", text[1:]
+        integer, _, fraction = text.partition(".")
+        words: str = prefix + self._triples_in_words(self._digit_triples(integer or "0"))
+        if fraction:
+            words += " point " + " ".join(self.UNITS[int(digit)] for digit in fraction)
+        return words
+
+    def thing_in_words(self, number: int, thing: List[str]) -> str:
+        """
+            This method converts a number into words and appends the correct form of a noun.
+
+            Args:
+                - number - int
+                - thing - array of forms [thing, things]
+        """
+        return self.number_in_words(number) + " " + thing[0 if number == 1 else 1]
+
+    def amount_in_words(self, number: float, fmt: int = 0, currency: str = 'USD') -> str:
+        """
+            This method converts a monetary amount into English words.
+
+            Args:
+                - number - float, major units with minor units after the point
+                - fmt - (format) if 0, then minor units in the form xx/100, otherwise in words
+                - currency - currency code: one of CURRENCIES (USD, EUR, GBP, PLN)
+        """
+        if currency not in self.CURRENCIES:
+            raise ValueError(f"Unknown currency: {currency}")
+        major, minor = self.CURRENCIES[currency]
+        units: int = int(number)
+        cents: int = int(number * 100 + 0.5) % 100
+        if fmt != 0:
+            cent_in_words: str = self.thing_in_words(cents, minor)
+        else:
+            cent_in_words = "%d/100" % cents
+        return self.thing_in_words(units, major) + " " + cent_in_words
+
+    def convert_numbers_in_text(self, text: str) -> str:
+        """
+            This method converts numbers in a text into English words in a single pass.
+            "1,250" is read as one thousand two hundred fifty, "3.5" as three point five.
+        """
+        return NUMBER_TOKEN_PATTERN_EN.sub(self._number_token_in_words, text)
+
+    def _number_token_in_words(self, match: Match) -> str:
+        """
+            This method converts a single number found by the pattern.
+        """
+        return self.number_in_words(match.group())
+
+
+def main() -> None:
+    """
+        Test function
+    """
+    number_in_words: NumberInWordsEn = NumberInWordsEn()
+    print(number_in_words.number_in_words(1_234_567))
+    print(number_in_words.number_in_words('3.14'))
+    print(number_in_words.thing_in_words(21, ["apple", "apples"]))
+    print(number_in_words.amount_in_words(1234.56))
+    print(number_in_words.amount_in_words(1.01, fmt=1, currency='GBP'))
+    print(number_in_words.convert_numbers_in_text('Chapter 12 has 1,250 words and 3.5 pages.'))
+
+
+if __name__ == '__main__':
+    main()
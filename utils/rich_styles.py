@@ -117,6 +117,12 @@ Example Usage:
                 pb.update_style(i)
                 time.sleep(0.05)
 
+    * Progress bar in a tight loop (redrawn only on a visible change, at most every 0.1 s)
+        from utils.rich_styles import ProgressBarManager
+        with ProgressBarManager(description="Tight loop...", total=10_000_000, min_interval=0.1) as pb:
+            for i in range(10_000_000):
+                pb.update_style(i)
+
     * Progress bar as decorator
         from utils.rich_styles import ProgressBarManager
         @ProgressBarManager(description="Decorator Progress...", total=10)
@@ -164,6 +170,7 @@ Example Usage:
 
 import logging
 import time
+from bisect import bisect_left
 from typing import Any, Callable
 
 from rich.console import Console
@@ -442,6 +449,12 @@ class ProgressBarManager:
             bar: Progress bar style ('rich', 'bubble', 'blocks', 'arrows', 'custom')
             custom_chars: Tuple of (filled, empty) characters for custom style
             unknown_style: Color style for progress bars with unknown total
+            min_interval: Minimum seconds between two redraws requested by `update_style`
+                (0 - no throttling); the last step and the state on exit are always drawn
+
+        `update_style` looks the color up by bisection in the thresholds sorted once
+        and updates the bar only when the percentage, the filled part or the color changed,
+        so it can be called on every iteration of a tight loop.
 
         Examples:
             >>> # Progress bar with unknown total and blue style
@@ -488,9 +501,13 @@ class ProgressBarManager:
                  total: int = None,
                  bar: str = "rich",
                  custom_chars: tuple = None,
-                 unknown_style: str = "ruby_red_bold") -> None:
+                 unknown_style: str = "ruby_red_bold",
+                 min_interval: float = 0.1) -> None:
 
         self.total: int = total
+        self.min_interval: float = min_interval
+        self._last_visible: tuple = None
+        self._last_update_time: float = 0.0
         self._init_colors(colors, total, unknown_style)
         self._init_bar_style(total, bar, custom_chars)
         self._init_display_settings(description)
@@ -510,6 +527,8 @@ class ProgressBarManager:
         first_color: str = list(self.colors.values())[0][0]
         self.current_style: str = first_color if total is not None else unknown_style
         self.last_successful_progress: int = 0
+        self._thresholds: list = sorted(self.colors)
+        self._threshold_colors: list = [self.colors[threshold] for threshold in self._thresholds]
 
     def _init_bar_style(self, total: int, bar: str, custom_chars: tuple) -> None:
         """Initialize the progress bar style settings."""
@@ -641,26 +660,27 @@ class ProgressBarManager:
             Context manager exit point.
         """
         if exc_type is not None:
-            self.update_style(self.last_successful_progress)
+            self.update_style(self.last_successful_progress, force=True)
         elif self.total:
-            self.update_style(self.total)
+            self.update_style(self.total, force=True)
         self.progress.stop()
 
-    def update_style(self, current: int) -> None:
+    def update_style(self, current: int, force: bool = False) -> None:
         """
             Update progress bar style based on current progress.
 
             Args:
                 current: Current progress value
+                force: Draw even if the last redraw was less than `min_interval` ago
         """
         try:
             if not self.total:
                 return
 
-            percentage: int = min(100, int((current / self.total) * 100))
-            progress: float = current / self.total if self.total else 0
+            progress: float = current / self.total
+            percentage: int = min(100, int(progress * 100))
 
-            self._update_progress_bar(current, percentage, progress)
+            self._update_progress_bar(current, percentage, progress, force)
             self.last_successful_progress = current
 
         except Exception:
@@ -669,59 +689,67 @@ class ProgressBarManager:
                 completed=self.last_successful_progress
             )
 
-    def _update_progress_bar(self, current: int, percentage: int, progress: float) -> None:
+    def _update_progress_bar(self, current: int, percentage: int, progress: float, force: bool = False) -> None:
         """
-            Update progress bar appearance.
+            Update progress bar appearance, skipping updates that would not change what is drawn.
         """
-        if self.bar_style != "rich":
-            self._update_custom_bar(progress)
+        # The colors depend only on the percentage, half cells are the finest step a bar draws
+        visible: tuple = (percentage, int(progress * self.bar_width * 2))
+        if visible == self._last_visible:
+            return
+        if self.min_interval and current < self.total and not force:
+            now: float = time.monotonic()
+            if now - self._last_update_time < self.min_interval:
+                return
+            self._last_update_time = now
+        self._last_visible = visible
 
-        self._update_colors(current, percentage)
+        text_color, bar_color = self._update_colors(current, percentage)
+        custom_bar: str = None
+        if self.bar_style != "rich":
+            custom_bar = self._update_custom_bar(progress, bar_color)
+        self._apply_color_update(current, text_color, bar_color, custom_bar)
 
-    def _update_custom_bar(self, progress: float) -> None:
+    def _update_custom_bar(self, progress: float, color: str) -> str:
         """
-            Update custom progress bar appearance.
+            Render custom progress bar appearance.
         """
         if self.bar_style == "custom" and self.custom_chars:
-            custom_bar: str = self.progress_bars[self.bar_style](
-                self.bar_width, progress, self.current_style, "gray_bold",
+            return self.progress_bars[self.bar_style](
+                self.bar_width, progress, color, "gray_bold",
                 self.custom_chars[0], self.custom_chars[1]
             )
-        else:
-            custom_bar: str = self.progress_bars[self.bar_style](
-                self.bar_width, progress, self.current_style
-            )
-        self.progress.update(self.task, custom_bar=custom_bar)
+        return self.progress_bars[self.bar_style](
+            self.bar_width, progress, color
+        )
 
-    def _update_colors(self, current: int, percentage: int) -> None:
+    def _update_colors(self, current: int, percentage: int) -> tuple:
         """
-            Update progress bar colors based on progress percentage.
+            Return the (text, bar) colors of the first threshold not below the percentage
+            (the last one above all thresholds).
         """
-        last_color: tuple = None
-        for threshold, (text_color, bar_color) in sorted(self.colors.items()):
-            if percentage <= threshold:
-                self._apply_color_update(current, text_color, bar_color)
-                break
-            last_color = (text_color, bar_color)
-        else:
-            if last_color:
-                text_color, bar_color = last_color
-                self._apply_color_update(current, text_color, bar_color)
+        index: int = bisect_left(self._thresholds, percentage)
+        if index == len(self._thresholds):
+            index -= 1
+        return self._threshold_colors[index]
 
-    def _apply_color_update(self, current: int, text_color: str, bar_color: str) -> None:
+    def _apply_color_update(self, current: int, text_color: str, bar_color: str, custom_bar: str = None) -> None:
         """
             Apply color updates to progress bar components.
         """
-        if self.bar_style == "rich":
-            self.progress.columns[1].complete_style = bar_color
-        self.progress_column.style_name = bar_color
-        self.time_column.style_name = bar_color
-        self.remaining_column.style_name = bar_color
-        self.current_style = bar_color
+        if bar_color != self.current_style:
+            if self.bar_style == "rich":
+                self.progress.columns[1].complete_style = bar_color
+            self.progress_column.style_name = bar_color
+            self.time_column.style_name = bar_color
+            self.remaining_column.style_name = bar_color
+            self.current_style = bar_color
+        fields: dict = {} if custom_bar is None else {"custom_bar": custom_bar}
         self.progress.update(
             self.task,
             completed=current,
-            description=f"[{text_color}]{self.description}"
+            description=f"[{text_color}]{self.description}",
+            **fields
         )
 
     def advance(self, task_id: int, advance: int = 1) -> None:
@@ -926,6 +954,26 @@ def test_logging() -> None:
     logger.info("📊 Operation progress: 75%")
 
 
+def benchmark_update_style(updates: int = 1_000_000) -> None:
+    """
+        Benchmark function: `update_style` calls per second in a tight loop for each bar style,
+        with the default throttling and without it (every visible change drawn).
+    """
+    for bar in ("rich", "blocks", "custom"):
+        for min_interval in (0.1, 0.0):
+            progress_bar: ProgressBarManager = ProgressBarManager(
+                description="Benchmark...", total=updates, bar=bar,
+                custom_chars=("*", " ") if bar == "custom" else None, min_interval=min_interval
+            )
+            progress_bar._init_task()
+            start: float = time.perf_counter()
+            for i in range(updates):
+                progress_bar.update_style(i)
+            elapsed: float = time.perf_counter() - start
+            console.print(f"[white_bold]{bar:>6} min_interval={min_interval:<4}[/white_bold] "
+                          f"[yellow_bold]{updates / elapsed:>12,.0f}[/yellow_bold] updates/s")
+
+
 def main() -> None:
     """
         Main function testing various styles and functionalities.
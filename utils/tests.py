@@ -0,0 +1,1680 @@
+"""
+    Module `tests` provides a correctness and throughput harness for `NumberInWords`.
+
+    -*- coding: utf-8 -*-
+
+    Correctness checks run on seeded random inputs and compare every conversion with an independent result:
+        - round trip of random integers up to 10^30 through `words_in_number`
+        - 10,000-digit integers against the same digits given as a string
+        - round trip of random decimals (strings, floats and Decimals), the fraction read back digit by digit
+        - grammatical case of the scale words against the reference rule for 0-999
+        - `amount_in_words` against `thing_in_words` of zlotys and groszes
+        - batch, cached and streaming conversion against the plain one
+        - `chunk_text_stream` on randomly cut text against `chunk_text` on the whole text
+        - the extended normalizer: dates, times, ordinals, Roman numerals and units, alone and in running text
+        - `words_in_number` and `convert_words_in_text` on inflected, capitalized and embedded number words
+        - amounts in every currency of `CURRENCIES` (and one added at run time) against the reference plural rule
+        - language backends: lazy imports in a fresh interpreter, registration and the shared instances
+
+    Throughput is measured on fixed corpora for `number_in_words`, `amount_in_words` and `convert_numbers_in_text`.
+    The report is a dict that can be saved as JSON and compared with a previous report.
+
+    * Example usage of function `check_number_in_words`:
+        failures: Dict[str, Dict[str, int]] = check_number_in_words(count=10_000, seed=1)
+            # Outputs: {"integer_round_trip": {"cases": 10000, "failures": 0}, ...}
+
+    * Example usage of function `benchmark_number_in_words`:
+        results: Dict[str, Dict[str, float]] = benchmark_number_in_words(repeat=5)
+            # Outputs: {"number_in_words": {"items": 20000, "ns_per_item": ..., "items_per_second": ...}, ...}
+
+    * Example usage of functions `save_report` and `compare_reports`:
+        report: Dict[str, Any] = run_harness(count=10_000, repeat=5)
+        save_report(report, 'number_in_words_report.json')
+        regressions: List[str] = compare_reports(report, load_report('baseline.json'), tolerance=0.10)
+
+    * Example usage of function `release_benchmarks` (chunker, number converter and progress bars):
+        results: List[BenchResult] = release_benchmarks('release_baseline.json', tolerance=0.10)
+            # Prints one "[BENCH] name: ... ns/call ± ... (MAD)" line per benchmark, regressions in red
+
+    * Example usage of function `check_timer_stats` (per-call statistics of decorated functions):
+        results: Dict[str, Dict[str, Any]] = check_timer_stats()
+            # Outputs: {"timer_aggregates": {"cases": ..., "failures": 0}, "timer_percentiles": {...}, ...}
+
+    * Example usage of function `check_spans` (span tree across threads and tasks, Chrome and speedscope export):
+        results: Dict[str, Dict[str, Any]] = check_spans()
+            # Outputs: {"spans_tree": {"cases": ..., "failures": 0}, "spans_chrome": {...}, ...}
+
+    * Example usage of function `check_async_timers` (running and suspended time of coroutines):
+        results: Dict[str, Dict[str, Any]] = check_async_timers()
+            # Outputs: {"async_suspended": {"cases": ..., "failures": 0}, "async_with": {...}, ...}
+
+    * Example usage of function `check_lean_timer` (lean recorder: calibrated overhead, flushes, threads):
+        results: Dict[str, Dict[str, Any]] = check_lean_timer()
+            # Outputs: {"lean_overhead": {"cases": ..., "failures": 0}, "lean_flush": {...}, ...}
+
+    * Example usage of function `check_sampling` (every_n and sample_rate extrapolation):
+        results: Dict[str, Dict[str, Any]] = check_sampling()
+            # Outputs: {"sampling_every_n": {"cases": ..., "failures": 0}, "sampling_rate": {...}, ...}
+
+    * Example usage of function `check_metrics` (CPU, thread and memory metrics, nested memory timers):
+        results: Dict[str, Dict[str, Any]] = check_metrics()
+            # Outputs: {"metrics_cpu": {"cases": ..., "failures": 0}, "metrics_memory_nested": {...}, ...}
+
+    * Example usage of function `check_profile_dumps` (cProfile dumps of calls slower than the threshold):
+        results: Dict[str, Dict[str, Any]] = check_profile_dumps()
+            # Outputs: {"profile_threshold": {"cases": ..., "failures": 0}, "profile_rotation": {...}, ...}
+
+    * Example usage of function `check_exporters` (local stand-in StatsD and Prometheus servers):
+        results: Dict[str, Dict[str, Any]] = check_exporters()
+            # Outputs: {"prometheus_http": {"cases": ..., "failures": 0}, "statsd_udp": {...}, ...}
+
+    * Example usage of function `check_history` (SQLite history in a temporary directory):
+        results: Dict[str, Dict[str, Any]] = check_history()
+            # Outputs: {"history_rows": {"cases": ..., "failures": 0}, "history_trends": {...}, ...}
+
+    * Example usage of function `check_streams` (timed generators and iterables):
+        results: Dict[str, Dict[str, Any]] = check_streams()
+            # Outputs: {"stream_items": {"cases": ..., "failures": 0}, "stream_split": {...}, ...}
+
+    * Example usage of function `check_registry` (process-wide registry, exporter default and dashboard):
+        results: Dict[str, Dict[str, Any]] = check_registry()
+            # Outputs: {"registry_merge": {"cases": ..., "failures": 0}, "registry_dashboard": {...}, ...}
+
+    * Command line:
+        python -m utils.tests --count 10000 --json report.json --baseline baseline.json
+        python -m utils.tests --release --release-baseline release_baseline.json
+        python -m utils.tests --timers
+"""
+
+import json
+import math
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+from argparse import ArgumentParser, Namespace
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from decimal import Decimal
+from time import perf_counter_ns, sleep
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from utils.execution_timer import (TIMER_REGISTRY, BenchResult, ExecutionTimer, LeanRecorder, Span, SpanTracer,
+                                   StreamSummary, TimerStats, TimerSummary, calibrate_overhead, start_tracing,
+                                   stop_tracing)
+from utils.number_in_words import NumberInWords, roman_to_int
+from utils.rich_styles import ProgressBarManager
+from utils.text_chunker import chunk_text, chunk_text_stream
+from utils.timer_dashboard import TimerDashboard
+from utils.timer_exporters import PrometheusExporter, StatsDExporter
+from utils.timer_history import HistoryPeriod, HistoryRun, TimerHistory
+
+
+POINT: str = " przecinek "
+ZERO: str = "zero"
+
+
+class CheckCounter:
+    """
+        Counts cases and failures of one check, keeping the first failing inputs for the report.
+    """
+
+    def __init__(self, keep: int = 5) -> None:
+        self.cases: int = 0
+        self.failures: int = 0
+        self.examples: List[str] = []
+        self.keep: int = keep
+
+    def check(self, passed: bool, example: Callable[[], str]) -> None:
+        self.cases += 1
+        if not passed:
+            self.failures += 1
+            if len(self.examples) < self.keep:
+                self.examples.append(example())
+
+    def as_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {'cases': self.cases, 'failures': self.failures}
+        if self.examples:
+            result['examples'] = self.examples
+        return result
+
+
+def reference_case(number: int) -> int:
+    """
+        Reference rule of the Polish plural: 1 - singular, 2-4 (but not 12-14) - few, otherwise many.
+    """
+    if number == 1:
+        return 0
+    if number % 10 in (2, 3, 4) and number % 100 not in (12, 13, 14):
+        return 1
+    return 2
+
+
+def random_integer(rng: random.Random, max_digits: int = 30) -> int:
+    """
+        Returns a random integer from 0 to 10^max_digits - 1 with a uniformly drawn number of digits,
+        a third of them with runs of zero groups (e.g. 1 000 000 005).
+    """
+    digits: int = rng.randint(1, max_digits)
+    number: int = rng.randrange(10 ** (digits - 1) if digits > 1 else 0, 10 ** digits)
+    if rng.random() < 1 / 3:
+        text: List[str] = list(str(number))
+        for i in range(1, len(text)):
+            if rng.random() < 0.5:
+                text[i] = '0'
+        number = int(''.join(text))
+    return number
+
+
+def random_fraction(rng: random.Random, max_digits: int = 15) -> str:
+    """
+        Returns random fraction digits without trailing zeros, often with leading zeros.
+    """
+    digits: str = ''.join(rng.choice('0123456789') for _ in range(rng.randint(1, max_digits)))
+    digits = digits.rstrip('0') or '1'
+    if rng.random() < 0.3:
+        digits = '0' * rng.randint(1, 4) + digits
+    return digits
+
+
+def words_in_decimal(number_in_words: NumberInWords, words: str) -> str:
+    """
+        Reads a decimal back from words: the integer part with `words_in_number`,
+        the fraction as leading "zero" words followed by one number.
+    """
+    integer_words, _, fraction_words = words.partition(POINT)
+    integer: str = str(number_in_words.words_in_number(integer_words))
+    if not fraction_words:
+        return integer
+    tokens: List[str] = fraction_words.split(" ")
+    zeros: int = 0
+    while zeros < len(tokens) - 1 and tokens[zeros] == ZERO:
+        zeros += 1
+    rest: str = " ".join(tokens[zeros:])
+    return integer + "." + "0" * zeros + str(number_in_words.words_in_number(rest))
+
+
+def check_number_in_words(count: int = 10_000, seed: int = 1) -> Dict[str, Dict[str, Any]]:
+    """
+        Runs the correctness checks on `count` random inputs per check and returns cases and failures of each.
+    """
+    rng: random.Random = random.Random(seed)
+    number_in_words: NumberInWords = NumberInWords()
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'integer_round_trip', 'integer_as_string', 'decimal_round_trip', 'decimal_comma', 'decimal_exact',
+        'float_round_trip', 'case_reference', 'thing_reference', 'amount_reference', 'huge_integer', 'batch',
+        'cached', 'cache_keys', 'batch_amounts', 'stream')}
+
+    integers: List[int] = [random_integer(rng) for _ in range(count)]
+    for number in integers:
+        words: str = number_in_words.number_in_words(number)
+        try:
+            parsed: Optional[int] = number_in_words.words_in_number(words)
+        except ValueError:
+            parsed = None
+        checks['integer_round_trip'].check(parsed == number, lambda: f"{number}: {words!r} -> {parsed}")
+        checks['integer_as_string'].check(number_in_words.number_in_words(str(number)) == words,
+                                          lambda: f"{number}: str differs")
+
+    for _ in range(count):
+        text: str = f"{random_integer(rng, 18)}.{random_fraction(rng)}"
+        words = number_in_words.number_in_words(text)
+        try:
+            parsed_text: Optional[str] = words_in_decimal(number_in_words, words)
+        except ValueError:
+            parsed_text = None
+        checks['decimal_round_trip'].check(parsed_text == text, lambda: f"{text}: {words!r} -> {parsed_text}")
+        checks['decimal_comma'].check(number_in_words.number_in_words(text.replace('.', ',')) == words,
+                                      lambda: f"{text}: comma differs")
+        checks['decimal_exact'].check(number_in_words.number_in_words(Decimal(text)) == words,
+                                      lambda: f"{text}: Decimal differs")
+
+    for _ in range(count):
+        value: float = rng.uniform(0, 10 ** rng.randint(0, 9))
+        words = number_in_words.number_in_words(value)
+        expected: str = format(Decimal(repr(value)), 'f')
+        expected = expected.rstrip('0').rstrip('.') if '.' in expected else expected
+        try:
+            parsed_text = words_in_decimal(number_in_words, words)
+        except ValueError:
+            parsed_text = None
+        checks['float_round_trip'].check(parsed_text == expected,
+                                         lambda: f"{value!r}: {words!r} -> {parsed_text}")
+
+    for number in range(1000):
+        checks['case_reference'].check(number_in_words._case(number) == reference_case(number),
+                                       lambda: f"{number}: {number_in_words._case(number)}")
+        for thing in (number_in_words.ZLOTYS, number_in_words.GROSZES):
+            checks['thing_reference'].check(
+                number_in_words.thing_in_words(number, thing)
+                == number_in_words.number_in_words(number) + " " + thing[reference_case(number)],
+                lambda: f"{number}: {number_in_words.thing_in_words(number, thing)!r}")
+
+    amounts: List[float] = [round(rng.uniform(0, 10 ** rng.randint(0, 9)), 2) for _ in range(count)]
+    for amount in amounts:
+        zlotys: int = int(amount)
+        groszes: int = int(amount * 100 + 0.5) % 100
+        expected = (number_in_words.thing_in_words(zlotys, number_in_words.ZLOTYS) + " "
+                    + number_in_words.thing_in_words(groszes, number_in_words.GROSZES))
+        checks['amount_reference'].check(number_in_words.amount_in_words(amount, fmt=1) == expected,
+                                         lambda: f"{amount}: {number_in_words.amount_in_words(amount, fmt=1)!r}")
+
+    for _ in range(max(1, count // 5000)):
+        digits: str = str(rng.randint(1, 9)) + ''.join(rng.choice('0123456789') for _ in range(9_999))
+        huge: int = 0
+        for start in range(0, len(digits), 1000):  # int(digits) is refused over 4300 digits as well
+            huge = huge * 10 ** 1000 + int(digits[start:start + 1000])
+        checks['huge_integer'].check(number_in_words.number_in_words(huge) == number_in_words.number_in_words(digits),
+                                     lambda: f"{digits[:20]}... ({len(digits)} digits): int differs from str")
+
+    cached: NumberInWords = NumberInWords(cache_size=1024)
+    batch: List[str] = number_in_words.numbers_in_words(integers)
+    batch_amounts: List[str] = number_in_words.amounts_in_words(amounts, fmt=1)
+    for i, number in enumerate(integers):
+        words = number_in_words.number_in_words(number)
+        checks['batch'].check(batch[i] == words, lambda: f"{number}: {batch[i]!r}")
+        checks['cached'].check(cached.number_in_words(number) == words, lambda: f"{number}: cached differs")
+
+    # An invalid string must not find the entry of the valid number it looks like, and a cached
+    # thing_in_words call counts one hit or miss
+    keyed: NumberInWords = NumberInWords(cache_size=16)
+    keyed.number_in_words('5.0')
+    keyed.number_in_words('5.1')
+    for valid, text in (('5.0', '5.0.0'), ('5.1', '5,1.0')):
+        try:
+            invalid: str = keyed.number_in_words(text)
+        except ValueError:
+            invalid = 'ValueError'
+        checks['cache_keys'].check(invalid == 'ValueError', lambda: f"{text!r} after {valid!r}: {invalid!r}")
+    keyed.cache_clear()
+    keyed.thing_in_words(7, number_in_words.ZLOTYS)
+    keyed.thing_in_words(7, number_in_words.ZLOTYS)
+    info = keyed.cache_info()
+    checks['cache_keys'].check((info.hits, info.misses) == (1, 1), lambda: f"two thing_in_words calls: {info}")
+    for i, amount in enumerate(amounts):
+        checks['batch_amounts'].check(batch_amounts[i] == number_in_words.amount_in_words(amount, fmt=1),
+                                      lambda: f"{amount}: {batch_amounts[i]!r}")
+
+    text = text_corpus(rng, 2_000)
+    converted: str = number_in_words.convert_numbers_in_text(text)
+    for _ in range(max(1, count // 1000)):
+        cuts: List[int] = sorted(rng.sample(range(1, len(text)), 50))
+        chunks: List[str] = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+        streamed: str = ''.join(number_in_words.convert_numbers_in_stream(chunks))
+        checks['stream'].check(streamed == converted, lambda: "stream differs from whole text")
+
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def text_corpus(rng: random.Random, lines: int) -> str:
+    """
+        Returns a Polish text of `lines` lines with numbers in many notations.
+    """
+    templates: List[str] = [
+        'Rozdział {0}. W roku {1} Jan miał {2} lat i {3},{4} zł oszczędności.\n',
+        'Dnia {2}.{5}.{1} przeszedł {3}.{4} km, bilet nr {6} kosztował {2},{4}.\n',
+        'Tabela {0}: {6} / {3} (test{2}) i wynik {7}.\n',
+    ]
+    return ''.join(
+        rng.choice(templates).format(rng.randint(1, 99), rng.randint(1900, 2100), rng.randint(1, 28),
+                                     rng.randint(0, 9999), rng.randint(0, 99), rng.randint(1, 12),
+                                     rng.randint(0, 10 ** 6), random_integer(rng, 24))
+        for _ in range(lines)
+    )
+
+
+def check_chunk_text_stream(count: int = 10_000, seed: int = 1) -> Dict[str, Dict[str, Any]]:
+    """
+        Cuts `count // 100` random texts into random pieces and compares `chunk_text_stream` on the pieces
+        with `chunk_text` on the joined text, for both methods and with numbers expanded on the way.
+    """
+    rng: random.Random = random.Random(seed)
+    number_in_words: NumberInWords = NumberInWords()
+    words: List[str] = ['Ala', 'ma', 'kota.', 'Dr.', 'To', 'jest', '12,5', 'zł!', 'Czy?', '…', '...', '—',
+                        ' ', '\t', '\n', '\n\n', ' \r\n \n', '\u200b']
+    checks: Dict[str, CheckCounter] = {}
+    for _ in range(max(1, count // 100)):
+        text: str = ''.join(rng.choice(words) + rng.choice(('', ' ')) for _ in range(rng.randint(0, 300)))
+        cuts: List[int] = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 40))))
+        pieces: List[str] = [text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])]
+        for method, limit in (('char', 40), ('word', 5)):
+            streamed: List[str] = list(chunk_text_stream(pieces, method, limit))
+            checks.setdefault(f'chunk_stream_{method}', CheckCounter()).check(
+                streamed == chunk_text(text, method, limit), lambda: f"{pieces!r}: {streamed!r}")
+        normalized: List[str] = list(chunk_text_stream(pieces, 'char', 40, number_in_words.convert_numbers_in_text))
+        checks.setdefault('chunk_stream_normalized', CheckCounter()).check(
+            normalized == chunk_text(number_in_words.convert_numbers_in_text(text), 'char', 40),
+            lambda: f"{pieces!r}: {normalized!r}")
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def int_to_roman(number: int) -> str:
+    """
+        Returns the Roman numeral of 1-3999, written out independently of `roman_to_int`.
+    """
+    roman: List[str] = []
+    for value, numeral in ((1000, 'M'), (900, 'CM'), (500, 'D'), (400, 'CD'), (100, 'C'), (90, 'XC'),
+                           (50, 'L'), (40, 'XL'), (10, 'X'), (9, 'IX'), (5, 'V'), (4, 'IV'), (1, 'I')):
+        count, number = divmod(number, value)
+        roman.append(numeral * count)
+    return ''.join(roman)
+
+
+def check_normalizer(count: int = 10_000, seed: int = 1) -> Dict[str, Dict[str, Any]]:
+    """
+        Checks `convert_numbers_in_text` of an `extended` instance on fixed sentences and on `count // 10`
+        random dates, times, ordinals, Roman numerals and units, each alone and all of them in one text.
+    """
+    rng: random.Random = random.Random(seed)
+    extended: NumberInWords = NumberInWords(extended=True)
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'normalizer_fixed', 'normalizer_date', 'normalizer_time', 'normalizer_ordinal', 'normalizer_roman',
+        'normalizer_unit', 'normalizer_text')}
+
+    fixed: List[Tuple[str, str]] = [
+        ('15.08.2024 o 12:30 przeszedł 3 km (50%), XIV wiek',
+         'piętnasty sierpnia dwa tysiące dwudziestego czwartego o dwunasta trzydzieści przeszedł '
+         'trzy kilometry (pięćdziesiąt procent), czternasty wiek'),
+        ('1.01.2000', 'pierwszy stycznia dwutysięcznego'),
+        ('2024-02-29', 'dwudziesty dziewiąty lutego dwa tysiące dwudziestego czwartego'),
+        ('23:59:07', 'dwudziesta trzecia pięćdziesiąt dziewięć zero siedem'),
+        ('10-tego i 3-cia klasa', 'dziesiątego i trzecia klasa'),
+        ('w XIX wieku, II część', 'w dziewiętnastym wieku, druga część'),
+        ('22 h, 1 t, 12,5 km, 5 tys.',
+         'dwadzieścia dwie godziny, jedna tona, dwanaście przecinek pięć kilometra, pięć tysięcy'),
+    ]
+    for text, expected in fixed:
+        converted: str = extended.convert_numbers_in_text(text)
+        checks['normalizer_fixed'].check(converted == expected, lambda: f"{text!r}: {converted!r}")
+
+    units: Dict[str, List[str]] = {
+        'km': ['kilometr', 'kilometry', 'kilometrów'], 'kg': ['kilogram', 'kilogramy', 'kilogramów'],
+        '%': ['procent', 'procent', 'procent'], 'MB': ['megabajt', 'megabajty', 'megabajtów']}
+    ordinal_suffixes: Dict[str, str] = {'szy': 'm_nom', 'ga': 'f_nom', 'cie': 'n_nom', 'tego': 'm_gen',
+                                        'ej': 'f_gen', 'mym': 'm_loc'}
+    for _ in range(max(1, count // 10)):
+        cases: List[Tuple[str, str, str]] = []
+        day, month, year = rng.randint(1, 28), rng.randint(1, 12), rng.randint(1000, 2999)
+        cases.append(('normalizer_date', rng.choice((f"{day}.{month:02d}.{year}", f"{year}-{month:02d}-{day:02d}")),
+                      f"{extended.ordinal_in_words(day)} {extended.MONTHS[month]} "
+                      f"{extended.ordinal_in_words(year, 'm_gen')}"))
+        hour, minute = rng.randint(1, 23), rng.randint(0, 59)
+        minute_words: str = (extended.number_in_words(minute) if minute >= 10
+                             else 'zero ' + extended.number_in_words(minute))
+        cases.append(('normalizer_time', f"{hour}:{minute:02d}",
+                      f"{extended.ordinal_in_words(hour, 'f_nom')} {minute_words}"))
+        number: int = rng.randint(1, 10 ** rng.randint(1, 6))
+        suffix: str = rng.choice(list(ordinal_suffixes))
+        cases.append(('normalizer_ordinal', f"{number}-{suffix}",
+                      extended.ordinal_in_words(number, ordinal_suffixes[suffix])))
+        number = rng.randint(1, 3999)
+        cases.append(('normalizer_roman', f"{int_to_roman(number)} wiek", f"{extended.ordinal_in_words(number)} wiek"))
+        checks['normalizer_roman'].check(roman_to_int(int_to_roman(number)) == number,
+                                         lambda: f"{number}: {int_to_roman(number)}")
+        number = random_integer(rng, 9)
+        symbol: str = rng.choice(list(units))
+        cases.append(('normalizer_unit', f"{number}{'' if symbol == '%' else ' '}{symbol}",
+                      f"{extended.number_in_words(number)} {units[symbol][reference_case(number)]}"))
+
+        for name, text, expected in cases:
+            converted = extended.convert_numbers_in_text(text)
+            checks[name].check(converted == expected, lambda: f"{text!r}: {converted!r}, expected {expected!r}")
+        text = ' | '.join(case[1] for case in cases)
+        converted = extended.convert_numbers_in_text(text)
+        checks['normalizer_text'].check(converted == ' | '.join(case[2] for case in cases),
+                                        lambda: f"{text!r}: {converted!r}")
+
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def check_words_in_number(count: int = 10_000, seed: int = 1) -> Dict[str, Dict[str, Any]]:
+    """
+        Checks the words-to-number direction on `count` random integers: `words_in_number(number_in_words(n))`,
+        the feminine and capitalized forms, "zero" with a scale word, texts that are not one number,
+        and `convert_words_in_text` on sentences with two numbers in words.
+    """
+    rng: random.Random = random.Random(seed)
+    number_in_words: NumberInWords = NumberInWords()
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'words_round_trip', 'words_variants', 'words_zero', 'words_rejected', 'words_in_text')}
+
+    def parsed(words: str) -> Optional[int]:
+        try:
+            return number_in_words.words_in_number(words)
+        except ValueError:
+            return None
+
+    for _ in range(count):
+        number: int = random_integer(rng, 24)
+        words: str = number_in_words.number_in_words(number)
+        checks['words_round_trip'].check(parsed(words) == number, lambda: f"{number}: {words!r} -> {parsed(words)}")
+        head, _, last = words.rpartition(' ')
+        variant: str = (head + ' ' if head else '') + {'jeden': 'jedna', 'dwa': 'dwie'}.get(last, last)
+        variant = variant[0].upper() + variant[1:]
+        checks['words_variants'].check(parsed(variant) == number, lambda: f"{variant!r} -> {parsed(variant)}")
+
+        other: int = random_integer(rng, 12)
+        text: str = f"Mam {words} złotych i {number_in_words.number_in_words(other)} groszy."
+        converted: str = number_in_words.convert_words_in_text(text)
+        checks['words_in_text'].check(converted == f"Mam {number} złotych i {other} groszy.",
+                                      lambda: f"{text!r}: {converted!r}")
+
+    # "Zero" takes one scale word and the number stays 0, nothing else continues it
+    for text, expected in (('zero', 0), ('zero tysięcy', 0), ('Zero milionów', 0), ('zero tysięcy pięćset', None),
+                           ('zero milionów tysięcy', None), ('zero dwa', None)):
+        checks['words_zero'].check(parsed(text) == expected, lambda: f"{text!r} -> {parsed(text)}")
+    converted = number_in_words.convert_words_in_text('Mam zero tysięcy złotych i zero pięć groszy.')
+    checks['words_zero'].check(converted == 'Mam 0 złotych i 0 5 groszy.', lambda: f"{converted!r}")
+
+    for text in ('', 'kot', 'dwa dwa', 'sto sto', 'pięć kotów', 'tysiąc milion'):
+        checks['words_rejected'].check(parsed(text) is None, lambda: f"{text!r} -> {parsed(text)}")
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def check_currencies(count: int = 10_000, seed: int = 1) -> Dict[str, Dict[str, Any]]:
+    """
+        Checks `amount_in_words` in PLN, in every currency of `CURRENCIES` and in one added at run time
+        on `count // 10` random amounts each against the unit forms picked by `reference_case`,
+        and `currency_amounts_in_words` on all of them mixed against the single conversions.
+    """
+    rng: random.Random = random.Random(seed)
+    number_in_words: NumberInWords = NumberInWords()
+    number_in_words.CURRENCIES['CZK'] = [['korona', 'korony', 'koron'], ['halerz', 'halerze', 'halerzy']]
+    forms: Dict[str, List[List[str]]] = {'PLN': [number_in_words.ZLOTYS, number_in_words.GROSZES],
+                                         **number_in_words.CURRENCIES}
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'currency_words', 'currency_fraction', 'currency_batch', 'currency_unknown')}
+
+    amounts: List[Tuple[float, str]] = []
+    for currency, (major_forms, minor_forms) in forms.items():
+        for _ in range(max(1, count // 10)):
+            major: int = rng.randint(0, 10 ** rng.randint(0, 7))
+            minor: int = rng.randint(0, 99)
+            amount: float = major + minor / 100
+            amounts.append((amount, currency))
+            words: str = f"{number_in_words.number_in_words(major)} {major_forms[reference_case(major)]}"
+            expected: str = f"{words} {number_in_words.number_in_words(minor)} {minor_forms[reference_case(minor)]}"
+            converted: str = number_in_words.amount_in_words(amount, fmt=1, currency=currency)
+            checks['currency_words'].check(converted == expected, lambda: f"{amount} {currency}: {converted!r}")
+            converted = number_in_words.amount_in_words(amount, currency=currency)
+            checks['currency_fraction'].check(converted == f"{words} {minor}/100",
+                                              lambda: f"{amount} {currency}: {converted!r}")
+
+    rng.shuffle(amounts)
+    batch: List[str] = number_in_words.currency_amounts_in_words(amounts, fmt=1)
+    for (amount, currency), words in zip(amounts, batch):
+        checks['currency_batch'].check(words == number_in_words.amount_in_words(amount, fmt=1, currency=currency),
+                                       lambda: f"{amount} {currency}: {words!r}")
+
+    try:
+        number_in_words.amount_in_words(1.5, currency='XXX')
+        raised: bool = False
+    except ValueError:
+        raised = True
+    checks['currency_unknown'].check(raised, lambda: "no ValueError for XXX")
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+BACKENDS_SCRIPT: str = """
+import json, sys
+from utils import number_backends
+loaded = {'import': [name for name in ('utils.number_in_words', 'utils.number_in_words_en',
+                                       'utils.number_in_words_de', 'numpy') if name in sys.modules]}
+words = {language: number_backends.get_backend(language).number_in_words(21) for language in ('en', 'pl')}
+loaded['en_pl'] = [name for name in ('utils.number_in_words_de', 'numpy') if name in sys.modules]
+loaded['backends'] = number_backends.loaded_backends()
+print(json.dumps({'loaded': loaded, 'words': words}))
+"""
+
+
+def check_backends() -> Dict[str, Dict[str, Any]]:
+    """
+        Checks `utils.number_backends`: in a fresh interpreter no backend module (nor NumPy) is imported
+        before a language is requested and requesting English and Polish leaves German unloaded;
+        in this process every backend converts 21, reads any number of digits (also in text) and scientific
+        notation, a registered language gets its own shared instance and an unknown language raises ValueError.
+    """
+    from utils import number_backends
+
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'backends_lazy', 'backends_words', 'backends_huge', 'backends_notation', 'backends_register',
+        'backends_unknown')}
+    output: str = subprocess.run([sys.executable, '-c', BACKENDS_SCRIPT], capture_output=True, text=True,
+                                 cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+    fresh: Dict[str, Any] = json.loads(output or '{}')
+    loaded: Dict[str, List[str]] = fresh.get('loaded', {})
+    checks['backends_lazy'].check(loaded.get('import') == [] and loaded.get('en_pl') == []
+                                  and loaded.get('backends') == ['en', 'pl'], lambda: f"{fresh}")
+    checks['backends_lazy'].check(fresh.get('words') == {'en': 'twenty-one', 'pl': 'dwadzieścia jeden'},
+                                  lambda: f"{fresh}")
+
+    def words_of(convert: Callable[[Any], str], value: Any) -> str:
+        try:
+            return convert(value)
+        except ValueError as error:
+            return repr(error)
+
+    expected: Dict[str, str] = {'pl': 'dwadzieścia jeden', 'en': 'twenty-one', 'de': 'einundzwanzig'}
+    for language, words in expected.items():
+        backend: Any = number_backends.get_backend(language)
+        checks['backends_words'].check(
+            backend.number_in_words(21) == words and number_backends.get_backend(language) is backend
+            and isinstance(backend, number_backends.backend_class(language)),
+            lambda: f"{language}: {backend.number_in_words(21)!r}")
+
+        scales: List[str] = []
+        for digits in range(1, 400, 3):
+            number: int = 10 ** digits + 7
+            scales.append(words_of(backend.number_in_words, 10 ** digits))
+            checks['backends_huge'].check(
+                words_of(backend.number_in_words, str(number)) == words_of(backend.number_in_words, number)
+                and 'Error' not in scales[-1], lambda: f"{language}: 10 ** {digits}: {scales[-1]!r}")
+        checks['backends_huge'].check(len(set(scales)) == len(scales),
+                                      lambda: f"{language}: scale names repeat")
+        converted: str = words_of(backend.convert_numbers_in_text, 'ID ' + '1234567890' * 8 + ' end')
+        checks['backends_huge'].check(converted.startswith('ID ') and not any(char.isdigit() for char in converted),
+                                      lambda: f"{language}: {converted[:80]!r}")
+        for notation, plain in (('1e-05', '0.00001'), ('2.5E+3', '2500'), ('-3e2', '-300')):
+            read: str = words_of(backend.number_in_words, notation)
+            checks['backends_notation'].check(read == backend.number_in_words(plain),
+                                              lambda: f"{language}: {notation} read as {read!r}")
+
+    number_backends.register_backend('test', 'utils.number_in_words_en', 'NumberInWordsEn')
+    try:
+        registered: Any = number_backends.get_backend('test')
+        checks['backends_register'].check(
+            registered is not number_backends.get_backend('en') and registered.number_in_words(21) == 'twenty-one',
+            lambda: "registered language shares the English instance")
+        number_backends.register_backend('test', 'utils.number_in_words_de', 'NumberInWordsDe')
+        checks['backends_register'].check(number_backends.get_backend('test').number_in_words(21) == 'einundzwanzig',
+                                          lambda: "registering again did not replace the backend")
+    finally:
+        number_backends.register_backend('test', 'utils.number_in_words_de', 'NumberInWordsDe')  # drops the instance
+        del number_backends.LANGUAGE_BACKENDS['test']
+
+    try:
+        number_backends.get_backend('xx')
+        raised: bool = False
+    except ValueError:
+        raised = True
+    checks['backends_unknown'].check(raised, lambda: "no ValueError for xx")
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def _throughput(function: Callable[[Any], Any], inputs: Iterable[Any], repeat: int) -> Dict[str, float]:
+    """
+        Calls `function` on every input `repeat` times and returns the best time per item.
+    """
+    items: List[Any] = list(inputs)
+    best_ns: int = 0
+    for _ in range(repeat):
+        start_ns: int = perf_counter_ns()
+        for item in items:
+            function(item)
+        duration_ns: int = perf_counter_ns() - start_ns
+        best_ns = duration_ns if not best_ns else min(best_ns, duration_ns)
+    return {
+        'items': len(items),
+        'ns_per_item': best_ns / len(items),
+        'items_per_second': len(items) * 1_000_000_000 / best_ns,
+    }
+
+
+def benchmark_number_in_words(repeat: int = 5, seed: int = 1) -> Dict[str, Dict[str, float]]:
+    """
+        Measures the throughput of `number_in_words`, `amount_in_words` and `convert_numbers_in_text`
+        on fixed corpora (the same for the same seed) and returns the best of `repeat` runs.
+    """
+    rng: random.Random = random.Random(seed)
+    number_in_words: NumberInWords = NumberInWords()
+    integers: List[int] = [random_integer(rng, 12) for _ in range(5_000)]
+    large: List[int] = [random_integer(rng, 30) for _ in range(2_000)]
+    decimals: List[str] = [f"{random_integer(rng, 9)}.{random_fraction(rng, 6)}" for _ in range(5_000)]
+    amounts: List[float] = [round(rng.uniform(0, 10 ** rng.randint(0, 7)), 2) for _ in range(5_000)]
+    lines: List[str] = text_corpus(rng, 2_000).splitlines(keepends=True)
+    text_bytes: int = len(''.join(lines).encode('utf-8'))
+
+    results: Dict[str, Dict[str, float]] = {
+        'number_in_words': _throughput(number_in_words.number_in_words, integers, repeat),
+        'number_in_words_large': _throughput(number_in_words.number_in_words, large, repeat),
+        'number_in_words_decimal': _throughput(number_in_words.number_in_words, decimals, repeat),
+        'amount_in_words': _throughput(number_in_words.amount_in_words, amounts, repeat),
+        'convert_numbers_in_text': _throughput(number_in_words.convert_numbers_in_text, lines, repeat),
+    }
+    results['convert_numbers_in_text']['mb_per_second'] = (
+        text_bytes / 1024 / 1024 * 1_000_000_000
+        / (results['convert_numbers_in_text']['ns_per_item'] * len(lines))
+    )
+    return results
+
+
+def run_harness(count: int = 10_000, repeat: int = 5, seed: int = 1) -> Dict[str, Any]:
+    """
+        Runs the correctness checks and the benchmark and returns the report.
+    """
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': seed,
+        'correctness': {**check_number_in_words(count, seed), **check_chunk_text_stream(count, seed),
+                        **check_normalizer(count, seed), **check_words_in_number(count, seed),
+                        **check_currencies(count, seed), **check_backends()},
+        'throughput': benchmark_number_in_words(repeat, seed),
+    }
+
+
+def save_report(report: Dict[str, Any], file_path: str) -> None:
+    with open(file_path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, ensure_ascii=False, indent=4)
+
+
+def load_report(file_path: str) -> Dict[str, Any]:
+    with open(file_path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def compare_reports(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.10) -> List[str]:
+    """
+        Compares the throughput of two reports and returns the benchmarks slower than the baseline
+        by more than `tolerance` (0.10 - 10%).
+    """
+    regressions: List[str] = []
+    for name, result in report['throughput'].items():
+        previous: Optional[Dict[str, float]] = baseline.get('throughput', {}).get(name)
+        if previous is None:
+            continue
+        change: float = result['ns_per_item'] / previous['ns_per_item'] - 1
+        if change > tolerance:
+            regressions.append(f"{name}: {previous['ns_per_item']:.0f} -> {result['ns_per_item']:.0f} ns/item "
+                               f"(+{change:.0%})")
+    return regressions
+
+
+def release_benchmarks(baseline: Optional[str] = None, tolerance: float = 0.10, update_baseline: bool = False,
+                       min_time: float = 0.2, seed: int = 1) -> List[BenchResult]:
+    """
+        Runs the benchmarks repeated in every release with `ExecutionTimer.bench`: the text chunker,
+        the number converter and the progress bar update, compared with the `baseline` JSON file.
+    """
+    rng: random.Random = random.Random(seed)
+    number_in_words: NumberInWords = NumberInWords()
+    text: str = text_corpus(rng, 200)
+    line: str = text.splitlines()[0]
+    progress_bar: ProgressBarManager = ProgressBarManager(description="Benchmark...", total=1000)
+    progress_bar._init_task()
+
+    def update_progress_bar() -> None:
+        for i in range(1000):
+            progress_bar.update_style(i)
+
+    benchmarks: List[Tuple[str, Callable[..., Any], Tuple[Any, ...]]] = [
+        ('chunk_text(char, 750)', chunk_text, (text, 'char', 750)),
+        ('chunk_text(word, 120)', chunk_text, (text, 'word', 120)),
+        ('number_in_words(123456789)', number_in_words.number_in_words, (123_456_789,)),
+        ('number_in_words(decimal str)', number_in_words.number_in_words, ('1234567,0089',)),
+        ('amount_in_words(1234.56, fmt=1)', number_in_words.amount_in_words, (1234.56, 1)),
+        ('convert_numbers_in_text(line)', number_in_words.convert_numbers_in_text, (line,)),
+        ('ProgressBarManager.update_style x1000', update_progress_bar, ()),
+    ]
+    return [
+        ExecutionTimer.bench(func, *args, name=name, min_time=min_time, baseline=baseline,
+                             tolerance=tolerance, update_baseline=update_baseline)
+        for name, func, args in benchmarks
+    ]
+
+
+def exact_percentile(durations: List[int], percent: float) -> int:
+    """
+        Returns the nearest-rank percentile of sorted durations.
+    """
+    return durations[max(math.ceil(percent / 100 * len(durations)) - 1, 0)]
+
+
+def check_timer_stats(count: int = 20_000, seed: int = 1) -> Dict[str, Dict[str, Any]]:
+    """
+        Checks the per-call statistics: the aggregates of `count` random durations against exact ones,
+        the histogram percentiles within its 3% bound, `add_many` and `merged` against `add`,
+        and a decorated function timing every (also recursive) call from its own start without printing.
+    """
+    rng: random.Random = random.Random(seed)
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'timer_aggregates', 'timer_percentiles', 'timer_add_many', 'timer_decorated')}
+
+    durations: List[int] = [int(rng.lognormvariate(12, 2)) for _ in range(count)]
+    stats: TimerStats = TimerStats('check')
+    for duration_ns in durations:
+        stats.add(duration_ns)
+    summary: TimerSummary = stats.summary()
+    checks['timer_aggregates'].check(
+        (summary.count, summary.total_ns, summary.min_ns, summary.max_ns, summary.running_ns)
+        == (count, sum(durations), min(durations), max(durations), sum(durations))
+        and abs(summary.mean_ns - sum(durations) / count) < 1e-6 * summary.mean_ns, lambda: f"{summary}")
+    for percent in (1, 10, 50, 90, 95, 99, 99.9):
+        exact: int = exact_percentile(sorted(durations), percent)
+        approximate: int = stats.percentile(percent)
+        checks['timer_percentiles'].check(abs(approximate - exact) <= 0.03 * exact + 1,
+                                          lambda: f"p{percent}: {approximate} ns, exact {exact} ns")
+
+    batch: TimerStats = TimerStats('check')
+    batch.add_many(durations[:count // 2])
+    batch.add_many(durations[count // 2:])
+    halves: List[TimerStats] = [TimerStats('check'), TimerStats('check')]
+    for i, duration_ns in enumerate(durations):
+        halves[i % 2].add(duration_ns)
+    for other in (batch, TimerStats.merged('check', halves)):
+        checks['timer_add_many'].check(other.summary() == summary and other.buckets() == stats.buckets(),
+                                       lambda: f"{other.summary()} != {summary}")
+
+    @ExecutionTimer(display_time=False, name='check.recursive')
+    def recursive(depth: int) -> int:
+        sleep(0.001)
+        return depth + recursive(depth - 1) if depth else 0
+
+    timer: ExecutionTimer = ExecutionTimer(display_time=False, name='check.work')
+
+    @timer
+    def work() -> None:
+        sleep(0.002)
+
+    for _ in range(5):
+        work()
+        sleep(0.02)
+    recursive(4)
+    calls: TimerSummary = timer.get_stats()['check.work']
+    checks['timer_decorated'].check(calls.count == 5 and 2_000_000 <= calls.min_ns and calls.max_ns < 50_000_000,
+                                    lambda: f"calls not timed from their own start: {calls}")
+    nested: TimerSummary = recursive.stats.summary()
+    checks['timer_decorated'].check(
+        nested.count == 5 and nested.min_ns >= 1_000_000 and nested.max_ns >= 5_000_000
+        and nested.p50_ns >= 3_000_000 * 0.97, lambda: f"recursive calls: {nested}")
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def check_spans() -> Dict[str, Dict[str, Any]]:
+    """
+        Checks span tracing on a small pipeline: nested blocks, a thread run in a copy of the context
+        and two asyncio tasks started inside spans become their children, each in its own lane,
+        and the Chrome trace and speedscope exports are consistent with the tree.
+    """
+    import asyncio
+    from contextvars import copy_context
+    from threading import Thread
+
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'spans_tree', 'spans_lanes', 'spans_chrome', 'spans_speedscope')}
+
+    async def synthesize(chunk: int) -> None:
+        with ExecutionTimer(name=f'synthesize.{chunk}', display_time=False):
+            await asyncio.sleep(0.002)
+
+    async def pipeline() -> None:
+        with ExecutionTimer(name='chunk', display_time=False):
+            await asyncio.gather(synthesize(1), synthesize(2))
+
+    def extract() -> None:
+        with ExecutionTimer(name='extract', display_time=False):
+            sleep(0.001)
+
+    tracer: SpanTracer = start_tracing()
+    try:
+        with ExecutionTimer(name='run', display_time=False):
+            thread: Thread = Thread(target=copy_context().run, args=(extract,))  # a thread starts without context
+            thread.start()
+            thread.join()
+            asyncio.run(pipeline())
+            with ExecutionTimer(name='merge', display_time=False):
+                pass
+    finally:
+        stop_tracing()
+
+    def tree(span: Span) -> Any:
+        return span.name, sorted(tree(child) for child in span.children)
+
+    roots: List[Span] = tracer.roots()
+    checks['spans_tree'].check(
+        [tree(root) for root in roots]
+        == [('run', [('chunk', [('synthesize.1', []), ('synthesize.2', [])]), ('extract', []), ('merge', [])])],
+        lambda: f"{[tree(root) for root in roots]}")
+    checks['spans_tree'].check(all(
+        span.parent is None or span.parent.start_ns <= span.start_ns <= span.end_ns <= span.parent.end_ns
+        for span in tracer.spans), lambda: "a child span outside of its parent")
+    lanes: Dict[str, Tuple[int, int]] = {span.name: span.lane for span in tracer.spans}
+    checks['spans_lanes'].check(
+        len(set(lanes.values())) == 5 and lanes['run'] == lanes['merge'] and lanes['run'][0] == lanes['chunk'][0]
+        and lanes['extract'][0] != lanes['run'][0], lambda: f"{lanes}")
+
+    chrome: Dict[str, Any] = json.loads(json.dumps(tracer.to_chrome_trace()))
+    events: List[Dict[str, Any]] = [event for event in chrome['traceEvents'] if event['ph'] == 'X']
+    names: Dict[int, str] = {event['tid']: event['args']['name'] for event in chrome['traceEvents']
+                             if event['ph'] == 'M'}
+    checks['spans_chrome'].check(
+        sorted(event['name'] for event in events) == sorted(lanes) and len(names) == 5
+        and all(event['tid'] in names and event['ts'] >= 0 and event['dur'] >= 0 for event in events),
+        lambda: f"{chrome}")
+
+    speedscope: Dict[str, Any] = json.loads(json.dumps(tracer.to_speedscope()))
+    frames: List[str] = [frame['name'] for frame in speedscope['shared']['frames']]
+    balanced: bool = len(speedscope['profiles']) == 5
+    for profile in speedscope['profiles']:
+        stack: List[int] = []
+        previous: int = profile['startValue']
+        for event in profile['events']:
+            balanced = balanced and event['at'] >= previous
+            previous = event['at']
+            if event['type'] == 'O':
+                stack.append(event['frame'])
+            else:
+                balanced = balanced and bool(stack) and stack.pop() == event['frame']
+        balanced = balanced and not stack and previous == profile['endValue']
+    checks['spans_speedscope'].check(balanced and sorted(frames) == sorted(lanes), lambda: f"{speedscope}")
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def check_async_timers() -> Dict[str, Dict[str, Any]]:
+    """
+        Checks the coroutine timing: a decorated coroutine waiting in `asyncio.sleep` runs only briefly,
+        one blocking the event loop runs its whole duration in one step, and an `async with` block has
+        no known running time, so it is left out of the running time and steps of its name.
+        Exceptions thrown into a timed async generator reach its handlers.
+    """
+    import asyncio
+    from contextlib import asynccontextmanager
+
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'async_suspended', 'async_blocking', 'async_with', 'async_athrow')}
+
+    @ExecutionTimer(display_time=False, name='check.async.waiting')
+    async def waiting() -> None:
+        await asyncio.sleep(0.02)
+
+    @ExecutionTimer(display_time=False, name='check.async.blocking')
+    async def blocking() -> None:
+        await asyncio.sleep(0)
+        sleep(0.02)
+
+    async def pipeline() -> None:
+        await asyncio.gather(waiting(), blocking())
+        async with ExecutionTimer(display_time=False, name='check.async.with'):
+            await asyncio.sleep(0.01)
+        with ExecutionTimer(display_time=False, name='check.async.with'):
+            sleep(0.001)
+
+    TIMER_REGISTRY.block_stats('check.async.with').reset()
+    asyncio.run(pipeline())
+    summary: TimerSummary = waiting.stats.summary()
+    checks['async_suspended'].check(summary.total_ns >= 20_000_000 and summary.running_ns < summary.total_ns / 4
+                                    and summary.stepped == 1, lambda: f"{summary}")
+    blocked: TimerSummary = blocking.stats.summary()
+    checks['async_blocking'].check(blocked.running_ns >= 20_000_000 and blocked.longest_step_ns >= 20_000_000,
+                                   lambda: f"{blocked}")
+    block: TimerSummary = TIMER_REGISTRY.block_stats('check.async.with').summary()
+    checks['async_with'].check(
+        block.count == 2 and block.stepped == 1 and block.total_ns >= 11_000_000
+        and block.running_ns == block.longest_step_ns < 10_000_000, lambda: f"{block}")
+
+    events: List[str] = []
+
+    @asynccontextmanager
+    @ExecutionTimer(display_time=False, name='check.async.guarded')
+    async def guarded() -> Any:
+        try:
+            yield 'resource'
+        except KeyError:
+            events.append('handled')
+        finally:
+            events.append('cleanup')
+
+    @ExecutionTimer(display_time=False, name='check.async.recovering')
+    async def recovering() -> Any:
+        while True:
+            try:
+                yield 'item'
+            except ValueError as error:
+                yield f'recovered {error}'
+
+    async def throw_in() -> List[Any]:
+        try:
+            async with guarded():
+                raise KeyError('missing')
+        except KeyError:
+            events.append('leaked')
+        generator: Any = recovering()
+        try:
+            return [await generator.__anext__(), await generator.athrow(ValueError('bad')),
+                    await generator.__anext__()]
+        except ValueError as error:
+            return [f'leaked {error!r}']
+        finally:
+            await generator.aclose()
+
+    thrown: List[Any] = asyncio.run(throw_in())
+    checks['async_athrow'].check(events == ['handled', 'cleanup'], lambda: f"events {events}")
+    checks['async_athrow'].check(thrown == ['item', 'recovered bad', 'item'], lambda: f"{thrown}")
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def check_lean_timer(calls: int = 100_000) -> Dict[str, Dict[str, Any]]:
+    """
+        Checks the lean mode: the calibrated overhead is subtracted from the recorded durations, a small array
+        is folded into the statistics whenever it fills up and on every read, threads recording at once
+        lose at most the samples taken during a fold, and a lean call costs a fraction of a default one.
+    """
+    from threading import Thread
+
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'lean_overhead', 'lean_flush', 'lean_threads', 'lean_cost')}
+
+    overhead_ns: int = calibrate_overhead()
+    stats: TimerStats = TimerStats('check.lean')
+    recorder: LeanRecorder = LeanRecorder(stats, capacity=100)
+    for duration_ns in range(1_000, 1_250):
+        recorder.record(duration_ns + overhead_ns)
+    recorder.record(overhead_ns // 2)
+    summary: TimerSummary = stats.summary()
+    checks['lean_overhead'].check(0 < overhead_ns < 10_000, lambda: f"overhead {overhead_ns} ns")
+    checks['lean_overhead'].check(
+        (summary.count, summary.min_ns, summary.max_ns, summary.total_ns) == (251, 0, 1_249, sum(range(1_000, 1_250))),
+        lambda: f"{summary}")
+
+    @ExecutionTimer(lean=True, capacity=1_000)
+    def hot(x: int) -> int:
+        return x * 2
+
+    for i in range(calls):
+        hot(i)
+    checks['lean_flush'].check(hot.stats.count >= calls - 1_000, lambda: f"{hot.stats.count} folded of {calls}")
+    checks['lean_flush'].check(hot.stats.summary().count == calls, lambda: f"{hot.stats.summary()}")
+
+    @ExecutionTimer(lean=True, capacity=1_000)
+    def shared(x: int) -> int:
+        return x + 1
+
+    def worker() -> None:
+        for i in range(calls // 4):
+            shared(i)
+
+    threads: List[Thread] = [Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    recorded: int = shared.stats.summary().count
+    checks['lean_threads'].check(calls * 0.99 <= recorded <= calls, lambda: f"{recorded} of {calls} recorded")
+
+    def bare(x: int) -> int:
+        return x * 2
+
+    default: Callable[[int], int] = ExecutionTimer(display_time=False, name='check.lean.default')(bare)
+    costs: Dict[str, float] = {}
+    for label, func in (('bare', bare), ('lean', hot), ('default', default)):
+        start_ns: int = perf_counter_ns()
+        for i in range(calls // 10):
+            func(i)
+        costs[label] = (perf_counter_ns() - start_ns) / (calls // 10)
+    checks['lean_cost'].check(costs['lean'] - costs['bare'] < (costs['default'] - costs['bare']) / 5,
+                              lambda: f"ns per call: {costs}")
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def check_sampling(calls: int = 100_000) -> Dict[str, Dict[str, Any]]:
+    """
+        Checks sampling: with `every_n` exactly one call in n is timed and the count is extrapolated exactly,
+        with `sample_rate` the timed fraction and the extrapolated count are within 1%, the extrapolated total
+        is the scaled total of the timed calls and their median is close to that of timing every call,
+        coroutines are sampled too and bad settings are refused.
+    """
+    import asyncio
+
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'sampling_every_n', 'sampling_rate', 'sampling_total', 'sampling_async', 'sampling_invalid')}
+
+    def work(x: int) -> int:
+        return sum(range(x % 7 + 200))
+
+    every: Callable[[int], int] = ExecutionTimer(lean=True, every_n=100, name='check.sampling.every')(work)
+    for i in range(calls):
+        every(i)
+    summary: TimerSummary = every.stats.summary()
+    checks['sampling_every_n'].check(summary.count == calls and summary.sampled == calls // 100,
+                                     lambda: f"{summary}")
+
+    timer: ExecutionTimer = ExecutionTimer(display_time=False, sample_rate=0.05, name='check.sampling.rate')
+    rate: Callable[[int], int] = timer(work)
+    for i in range(calls // 10):
+        rate(i)
+    sampled: TimerSummary = rate.stats.summary()
+    checks['sampling_rate'].check(
+        abs(rate.stats.sample_rate - 0.05) < 0.01 and abs(sampled.count / (calls // 10) - 1) < 0.01,
+        lambda: f"rate {rate.stats.sample_rate}: {sampled}")
+
+    # The timed path runs cold when only a few calls take it, so the work is heavy enough to dwarf that
+    # and the medians are compared (a single preempted call of the few timed ones would move the total)
+    def heavy(x: int) -> int:
+        return sum(range(x % 7 + 5_000))
+
+    sampled_heavy: Callable[[int], int] = ExecutionTimer(lean=True, every_n=10, name='check.sampling.heavy')(heavy)
+    full: Callable[[int], int] = ExecutionTimer(lean=True, name='check.sampling.full')(heavy)
+    for i in range(calls // 20):
+        sampled_heavy(i)
+        full(i)
+    extrapolated: TimerSummary = sampled_heavy.stats.summary()
+    expected: TimerSummary = full.stats.summary()
+    checks['sampling_total'].check(
+        summary.total_ns == every.stats.total_ns * 100
+        and abs(extrapolated.p50_ns / expected.p50_ns - 1) < 0.2
+        and extrapolated.total_ns == round(sampled_heavy.stats.total_ns * 10),
+        lambda: f"extrapolated {extrapolated.total_ns} ns (p50 {extrapolated.p50_ns}), "
+                f"all calls {expected.total_ns} ns (p50 {expected.p50_ns})")
+
+    @ExecutionTimer(display_time=False, every_n=4, name='check.sampling.async')
+    async def fetch(x: int) -> int:
+        await asyncio.sleep(0)
+        return x
+
+    async def fetch_all() -> List[int]:
+        return [await fetch(i) for i in range(40)]
+
+    fetched: List[int] = asyncio.run(fetch_all())
+    timed: TimerSummary = fetch.stats.summary()
+    checks['sampling_async'].check(fetched == list(range(40)) and (timed.count, timed.sampled) == (40, 10),
+                                   lambda: f"{timed}")
+
+    for settings in ({'sample_rate': 0}, {'sample_rate': 1.5}, {'every_n': 0}):
+        try:
+            ExecutionTimer(display_time=False, **settings)
+            raised: bool = False
+        except ValueError:
+            raised = True
+        checks['sampling_invalid'].check(raised, lambda: f"no ValueError for {settings}")
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def check_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+        Checks the optional metrics: only the switched on ones are reported, CPU time follows busy work but
+        not sleeping, nested memory timers keep their own peaks, tracemalloc is stopped after the last timer
+        that started it (and left running if it was on before), and decorated calls sum their metrics.
+    """
+    import tracemalloc
+
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'metrics_switches', 'metrics_cpu', 'metrics_memory_nested', 'metrics_tracemalloc', 'metrics_decorated')}
+
+    def busy(seconds: float) -> None:
+        end_ns: int = perf_counter_ns() + int(seconds * 1_000_000_000)
+        while perf_counter_ns() < end_ns:
+            pass
+
+    with ExecutionTimer(display_time=False, name='check.metrics') as plain:
+        busy(0.001)
+    with ExecutionTimer(display_time=False, name='check.metrics', measure_thread_time=True) as thread_only:
+        busy(0.001)
+    checks['metrics_switches'].check(
+        plain.get_metrics() == {} and list(thread_only.get_metrics()) == ['thread_time_ns'],
+        lambda: f"{plain.get_metrics()} {thread_only.get_metrics()}")
+
+    with ExecutionTimer(display_time=False, name='check.metrics', measure_process_time=True,
+                        measure_thread_time=True) as working:
+        busy(0.05)
+    with ExecutionTimer(display_time=False, name='check.metrics', measure_process_time=True) as sleeping:
+        sleep(0.05)
+    checks['metrics_cpu'].check(working.thread_time_ns > 0.5 * working.get_duration_ns()
+                                and working.process_time_ns >= working.thread_time_ns * 0.9,
+                                lambda: f"busy: {working.get_metrics()} in {working.get_duration_ns()} ns")
+    checks['metrics_cpu'].check(sleeping.process_time_ns < 0.5 * sleeping.get_duration_ns(),
+                                lambda: f"sleep: {sleeping.get_metrics()} in {sleeping.get_duration_ns()} ns")
+
+    was_tracing: bool = tracemalloc.is_tracing()
+    with ExecutionTimer(display_time=False, name='check.metrics', measure_memory=True) as outer:
+        block: bytearray = bytearray(20_000_000)
+        del block
+        with ExecutionTimer(display_time=False, name='check.metrics', measure_memory=True) as inner:
+            block = bytearray(1_000_000)
+            del block
+        inner_tracing: bool = tracemalloc.is_tracing()
+    checks['metrics_memory_nested'].check(
+        20_000_000 <= outer.memory_peak_bytes < 21_000_000 and 900_000 <= inner.memory_peak_bytes < 2_000_000,
+        lambda: f"outer {outer.memory_peak_bytes}, inner {inner.memory_peak_bytes}")
+    checks['metrics_tracemalloc'].check(inner_tracing and tracemalloc.is_tracing() == was_tracing,
+                                        lambda: "tracemalloc stopped by the inner timer or left running")
+    tracemalloc.start()
+    try:
+        with ExecutionTimer(display_time=False, name='check.metrics', measure_memory=True):
+            pass
+        checks['metrics_tracemalloc'].check(tracemalloc.is_tracing(), lambda: "tracemalloc started by the user stopped")
+    finally:
+        tracemalloc.stop()
+
+    @ExecutionTimer(display_time=False, name='check.metrics.decorated', measure_thread_time=True, measure_memory=True)
+    def allocate(size: int) -> int:
+        busy(0.002)
+        return len(bytearray(size))
+
+    for size in (1_000_000, 3_000_000, 2_000_000):
+        allocate(size)
+    metrics: Dict[str, int] = allocate.stats.summary().metrics
+    checks['metrics_decorated'].check(
+        2_900_000 <= metrics.get('memory_peak_bytes', 0) < 4_000_000 and metrics.get('thread_time_ns', 0) > 3_000_000,
+        lambda: f"{metrics}")
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def check_profile_dumps() -> Dict[str, Dict[str, Any]]:
+    """
+        Checks the latency-triggered profiling: fast calls leave no dump, slow calls leave a loadable .pstats
+        and a .txt with the call arguments, only the newest `profile_keep` dumps are kept and only every
+        `profile_every_n`-th call is profiled.
+    """
+    import pstats
+
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'profile_threshold', 'profile_report', 'profile_rotation', 'profile_every_n', 'profile_block')}
+
+    def dumps(directory: str, extension: str) -> List[str]:
+        return sorted(file_name for file_name in os.listdir(directory) if file_name.endswith(extension))
+
+    with tempfile.TemporaryDirectory() as directory:
+        @ExecutionTimer(display_time=False, name='check.profiled', profile_threshold_ns=30_000_000,
+                        profile_dir=directory, profile_keep=2)
+        def profiled(seconds: float, label: str) -> None:
+            sleep(seconds)
+
+        profiled(0, 'fast')
+        checks['profile_threshold'].check(not os.listdir(directory),
+                                          lambda: f"fast call dumped: {os.listdir(directory)}")
+        profiled(0.04, 'slow')
+        checks['profile_threshold'].check(len(dumps(directory, '.pstats')) == len(dumps(directory, '.txt')) == 1,
+                                          lambda: f"slow call: {os.listdir(directory)}")
+        if dumps(directory, '.txt'):
+            with open(os.path.join(directory, dumps(directory, '.txt')[0]), encoding='utf-8') as file:
+                report: str = file.read()
+            checks['profile_report'].check("args: (0.04, 'slow')" in report and 'check.profiled' in report,
+                                           lambda: report[:200])
+            loaded: pstats.Stats = pstats.Stats(os.path.join(directory, dumps(directory, '.pstats')[0]))
+            checks['profile_report'].check(any(function == 'profiled' for _, _, function in loaded.stats),
+                                           lambda: f"{list(loaded.stats)[:5]}")
+
+        for _ in range(3):
+            profiled(0.035, 'slow')
+        checks['profile_rotation'].check(len(dumps(directory, '.pstats')) == len(dumps(directory, '.txt')) == 2,
+                                         lambda: f"{os.listdir(directory)}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        @ExecutionTimer(display_time=False, name='check.every', profile_threshold_ns=10_000_000,
+                        profile_every_n=3, profile_dir=directory, profile_keep=100)
+        def every(seconds: float) -> None:
+            sleep(seconds)
+
+        for _ in range(6):
+            every(0.015)
+        checks['profile_every_n'].check(len(dumps(directory, '.pstats')) == 2, lambda: f"{os.listdir(directory)}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        with ExecutionTimer(display_time=False, name='check.block', profile_threshold_ns=10_000_000,
+                            profile_dir=directory) as block:
+            sleep(0.015)
+        checks['profile_block'].check(block.profile_path is not None and os.path.isfile(block.profile_path),
+                                      lambda: f"{block.profile_path} {os.listdir(directory)}")
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def check_exporters(calls: int = 200) -> Dict[str, Dict[str, Any]]:
+    """
+        Checks the timer exporters against local stand-in servers: the Prometheus endpoint is scraped over HTTP
+        and its file is read back, a UDP socket plays the StatsD server. The exported counts and sums must match
+        the statistics of the timed function.
+    """
+    from urllib.request import urlopen
+
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'prometheus_http', 'prometheus_file', 'statsd_udp', 'statsd_packets', 'statsd_repeat',
+        'statsd_restart')}
+
+    @ExecutionTimer(display_time=False, name='exported')
+    def exported(i: int) -> int:
+        return sum(range(i % 1000))
+
+    for i in range(calls):
+        exported(i)
+    summary = exported.stats.summary()
+
+    def parse(text: str) -> Dict[str, float]:
+        samples: Dict[str, float] = {}
+        for line in text.splitlines():
+            if line and not line.startswith('#'):
+                key, _, value = line.rpartition(' ')
+                samples[key] = float(value)
+        return samples
+
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'timers.prom')
+        with PrometheusExporter([exported], labels={'job': 'check'}, path=path, port=0, interval=0.05) as exporter:
+            with urlopen(f'http://127.0.0.1:{exporter.port}/metrics') as response:
+                scraped: Dict[str, float] = parse(response.read().decode('utf-8'))
+        with open(path, encoding='utf-8') as file:
+            written: Dict[str, float] = parse(file.read())
+
+    labels: str = '{job="check",timer="exported"}'
+    for name, samples in (('prometheus_http', scraped), ('prometheus_file', written)):
+        checks[name].check(samples.get(f'execution_timer_duration_seconds_count{labels}') == summary.count,
+                           lambda: f"count {samples.get(f'execution_timer_duration_seconds_count{labels}')}")
+        checks[name].check(
+            abs(samples.get(f'execution_timer_duration_seconds_sum{labels}', -1) - summary.total_ns / 1e9) < 1e-9,
+            lambda: "sum differs")
+        buckets: List[float] = [value for key, value in samples.items() if key.startswith(
+            'execution_timer_duration_seconds_bucket{job="check",timer="exported"')]
+        checks[name].check(buckets == sorted(buckets) and buckets[-1] == summary.count,
+                           lambda: f"buckets not cumulative: {buckets}")
+
+    receiver: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(('127.0.0.1', 0))
+
+    def receive(exporter: StatsDExporter) -> List[bytes]:
+        exporter.flush()
+        packets: List[bytes] = []
+        receiver.settimeout(1)
+        try:
+            while True:
+                packets.append(receiver.recv(65536))
+                receiver.settimeout(0.1)
+        except socket.timeout:
+            return packets
+
+    def timed_calls(lines: List[str]) -> float:
+        total: float = 0
+        for line in lines:
+            head, *parts = line.split('|')
+            if parts and parts[0] == 'ms':
+                rate: float = next((float(part[1:]) for part in parts if part.startswith('@')), 1.0)
+                total += (len(head.split(':')) - 1) / rate
+        return total
+
+    @ExecutionTimer(display_time=False, name='exported.metrics', measure_thread_time=True, measure_memory=True)
+    def measured(size: int) -> int:
+        return len(bytearray(size))
+
+    statsd: StatsDExporter = StatsDExporter([exported], port=receiver.getsockname()[1], labels={'job': 'check'})
+    repeat: StatsDExporter = StatsDExporter([measured], port=receiver.getsockname()[1])
+    try:
+        for expected_calls in (summary.count, 10):
+            if expected_calls == 10:
+                for i in range(10):
+                    exported(i)
+            packets: List[bytes] = receive(statsd)
+            received: List[str] = [line for packet in packets for line in packet.decode('utf-8').splitlines()]
+            # One line per bucket with new calls, however many calls it holds
+            checks['statsd_udp'].check(
+                round(timed_calls(received)) == expected_calls and len(received) <= len(exported.stats.buckets())
+                and all(line.startswith('execution_timer.exported:') and '|ms' in line
+                        and line.endswith('|#job:check') for line in received),
+                lambda: f"{timed_calls(received)} calls sent in {len(received)} lines, "
+                        f"{expected_calls} expected: {received[:3]}")
+            checks['statsd_packets'].check(all(len(packet) <= StatsDExporter.MAX_PACKET for packet in packets),
+                                           lambda: f"packet sizes {[len(packet) for packet in packets]}")
+
+        for i in range(5):
+            measured(1000 * i)
+        first: List[str] = [line for packet in receive(repeat) for line in packet.decode('utf-8').splitlines()]
+        second: List[bytes] = receive(repeat)
+        checks['statsd_repeat'].check(
+            round(timed_calls(first)) == 5 and any('.thread_time_ns:' in line for line in first)
+            and any('.memory_peak_bytes:' in line for line in first) and not second,
+            lambda: f"first flush {first}, second flush {second}")
+
+        # A stopped exporter opens its socket again when it is started again
+        repeat.stop()
+        repeat.start()
+        measured(1000)
+        restarted: List[bytes] = receive(repeat)
+        checks['statsd_restart'].check(bool(restarted), lambda: "nothing sent after stop and start")
+    finally:
+        statsd.stop()
+        repeat.stop()
+        receiver.close()
+
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def check_history(days: int = 5, runs: int = 200, seed: int = 1) -> Dict[str, Dict[str, Any]]:
+    """
+        Checks the timer history on a database in a temporary directory: rows written in batches by the writer
+        and by a decorated function, the percentiles of the daily trends against the recorded durations,
+        the slowest runs, the reopened database, and errors of the writer raised to the caller instead of hanging it.
+    """
+    from threading import Thread
+
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'history_rows', 'history_trends', 'history_slowest', 'history_decorated', 'history_reopened',
+        'history_errors')}
+    rng: random.Random = random.Random(seed)
+
+    noon: datetime = datetime.now().replace(hour=12, minute=0, second=0, microsecond=0)
+    recorded: Dict[str, List[int]] = {}
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'history.sqlite3')
+        with TimerHistory(path, batch_size=64, flush_interval=0.05) as history:
+            for day in range(days, 0, -1):
+                start: datetime = noon - timedelta(days=day)
+                # A different number of runs every day, the nearest ranks fall on odd and even counts
+                durations: List[int] = [rng.randrange(1, 10_000_000) for _ in range(runs + day)]
+                recorded[f'{start:%Y-%m-%d}'] = sorted(durations)
+                for duration_ns in durations:
+                    history.record('stage', {'day': day}, start, duration_ns, duration_ns // 2)
+
+            @ExecutionTimer(display_time=False, name='decorated', history=history, tags={'check': 'history'})
+            def decorated(i: int) -> int:
+                return sum(range(i))
+
+            for i in range(50):
+                decorated(i)
+            history.flush()
+
+            trends: List[HistoryPeriod] = history.trends('stage')
+            checks['history_rows'].check(sum(row.count for row in trends) == sum(map(len, recorded.values())),
+                                         lambda: f"{sum(row.count for row in trends)} rows")
+            for row in trends:
+                durations = recorded.get(row.period, [])
+                checks['history_trends'].check(
+                    row.count == len(durations) and row.p50_ns == exact_percentile(durations, 50)
+                    and row.p95_ns == exact_percentile(durations, 95) and row.max_ns == durations[-1]
+                    and row.cpu_ns == sum(duration_ns // 2 for duration_ns in durations),
+                    lambda: f"{row} does not match the recorded durations")
+
+            # Only the recorded stage, a decorated run slowed down by the machine could be among the slowest
+            slowest: List[HistoryRun] = history.slowest('stage', limit=3)
+            expected: List[int] = sorted((d for durations in recorded.values() for d in durations), reverse=True)[:3]
+            checks['history_slowest'].check([run.duration_ns for run in slowest] == expected,
+                                            lambda: f"{slowest} != {expected}")
+            decorated_runs: List[HistoryRun] = history.slowest('decorated', limit=100)
+            checks['history_decorated'].check(
+                len(decorated_runs) == 50
+                and all(run.tags == {'check': 'history'} and run.cpu_ns is not None for run in decorated_runs),
+                lambda: f"{len(decorated_runs)} runs: {decorated_runs[:1]}")
+
+        with TimerHistory(path) as history:
+            checks['history_reopened'].check(history.names() == ['decorated', 'stage'],
+                                             lambda: f"names {history.names()}")
+
+    def outcome(action: Callable[[], Any]) -> str:
+        # In a daemon thread, so a call that hangs fails the check instead of stopping the harness
+        result: List[str] = ['hung']
+
+        def run() -> None:
+            try:
+                action()
+                result[0] = 'returned'
+            except Exception as error:
+                result[0] = type(error).__name__
+
+        thread: Thread = Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(5)
+        return result[0]
+
+    with tempfile.TemporaryDirectory() as directory:
+        opened: str = outcome(lambda: TimerHistory(directory))
+        checks['history_errors'].check(opened == 'OperationalError', lambda: f"a directory as the database {opened}")
+    broken: TimerHistory = TimerHistory(':memory:')
+    broken.record('broken', None, None, [1])  # a row SQLite cannot bind stops the writer
+    flushed: str = outcome(broken.flush)
+    queried: str = outcome(broken.names)
+    closed: str = outcome(broken.close)
+    checks['history_errors'].check((flushed, queried, closed) == ('RuntimeError', 'RuntimeError', 'returned'),
+                                   lambda: f"writer stopped: flush {flushed}, names {queried}, close {closed}")
+
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def check_streams(items: int = 20, producer_s: float = 0.004, consumer_s: float = 0.002
+                  ) -> Dict[str, Dict[str, Any]]:
+    """
+        Checks the timed iteration of generators: counts of items and runs (also for iterations closed early,
+        failing and longer than a latency batch), values sent, exceptions thrown and values returned through
+        the timer, and the split of the wall time between a sleeping producer and a sleeping consumer.
+    """
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'stream_items', 'stream_split', 'stream_send', 'stream_throw', 'stream_runs', 'stream_iterate',
+        'stream_owner')}
+
+    @ExecutionTimer(display_time=False, name='slow')
+    def slow(n: int) -> Any:
+        for item in range(n):
+            sleep(producer_s)
+            yield item
+
+    for _ in slow(items):
+        sleep(consumer_s)
+    summary: StreamSummary = slow.stream.summary()
+    checks['stream_items'].check(summary.runs == 1 and summary.items == items, lambda: f"{summary}")
+    checks['stream_split'].check(
+        summary.producer_ns + summary.consumer_ns == summary.total_ns
+        and summary.producer_ns >= items * producer_s * 1e9 and summary.consumer_ns >= items * consumer_s * 1e9
+        and summary.first_item_ns >= producer_s * 1e9 and summary.item_p50_ns >= producer_s * 1e9,
+        lambda: f"{summary}")
+
+    @ExecutionTimer(lean=True, name='echo')
+    def echo() -> Any:
+        received: Any = yield 'ready'
+        while received != 'stop':
+            received = yield received * 2
+        return 'stopped'
+
+    def delegate() -> Any:
+        return (yield from echo())
+
+    generator: Any = delegate()
+    answers: List[Any] = [next(generator), generator.send(21), generator.send('ab')]
+    try:
+        generator.send('stop')
+        returned: Any = None
+    except StopIteration as stop:
+        returned = stop.value
+    checks['stream_send'].check(answers == ['ready', 42, 'abab'] and returned == 'stopped'
+                                and echo.stream.summary().items == 3, lambda: f"{answers} {returned}")
+
+    events: List[str] = []
+
+    @contextmanager
+    @ExecutionTimer(lean=True, name='guarded')
+    def guarded() -> Any:
+        try:
+            yield 'resource'
+        except KeyError:
+            events.append('handled')
+        finally:
+            events.append('cleanup')
+
+    try:
+        with guarded():
+            raise KeyError('missing')
+    except KeyError:
+        events.append('leaked')
+    checks['stream_throw'].check(events == ['handled', 'cleanup'], lambda: f"events {events}")
+
+    @ExecutionTimer(lean=True, name='recovering')
+    def recovering() -> Any:
+        while True:
+            try:
+                yield 'item'
+            except ValueError as error:
+                yield f'recovered {error}'
+
+    generator = recovering()
+    try:
+        thrown: List[Any] = [next(generator), generator.throw(ValueError('bad')), next(generator)]
+    except ValueError as error:
+        thrown = [f'leaked {error!r}']
+    generator.close()
+    checks['stream_throw'].check(thrown == ['item', 'recovered bad', 'item'] and recovering.stream.summary().items == 3
+                                 and recovering.stream.summary().runs == 1, lambda: f"{thrown}")
+
+    @ExecutionTimer(lean=True, name='numbers')
+    def numbers(n: int, fail_at: Optional[int] = None) -> Any:
+        for item in range(n):
+            if item == fail_at:
+                raise ValueError(item)
+            yield item
+
+    for item in numbers(100):
+        if item == 9:
+            break
+    try:
+        list(numbers(100, fail_at=5))
+    except ValueError:
+        pass
+    total: int = sum(numbers(10_000))
+    stream: StreamSummary = numbers.stream.summary()
+    checks['stream_runs'].check(stream.runs == 3 and stream.items == 10 + 5 + 10_000 and total == 49_995_000,
+                                lambda: f"{stream}")
+    checks['stream_runs'].check(numbers.stream.first_item.count == 3, lambda: "first items not once per run")
+
+    timer: ExecutionTimer = ExecutionTimer(display_time=False, name='check.work')
+    walked: List[str] = list(timer.iterate(['a', 'b', 'c'], 'letters'))
+    letters: StreamSummary = timer.get_stream_stats('letters')['letters']
+    checks['stream_iterate'].check(walked == ['a', 'b', 'c'] and letters.items == 3, lambda: f"{walked} {letters}")
+
+    # Iterables given to `iterate` belong to the caller: neither running out nor closing the timed iteration
+    # closes them, while the generator of a decorated function is closed with its timed iteration
+    with tempfile.TemporaryDirectory() as directory:
+        path: str = os.path.join(directory, 'lines.txt')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('a\nb\nc\n')
+        with open(path, encoding='utf-8') as file:
+            read_lines: List[str] = list(timer.iterate(file, 'lines'))
+            checks['stream_owner'].check(len(read_lines) == 3 and not file.closed, lambda: "the file was closed")
+        with open(path, encoding='utf-8') as file:
+            partial: Any = timer.iterate(file, 'lines')
+            next(partial)
+            partial.close()
+            checks['stream_owner'].check(not file.closed and next(file) == 'b\n', lambda: "the file was closed")
+    held: Any = (letter for letter in 'abc')
+    partial = timer.iterate(held, 'held')
+    next(partial)
+    partial.close()
+    checks['stream_owner'].check(next(held, None) == 'b', lambda: "the generator of the caller was closed")
+
+    cleaned: List[str] = []
+
+    @ExecutionTimer(lean=True, name='owned')
+    def owned() -> Any:
+        try:
+            yield from 'abc'
+        finally:
+            cleaned.append('cleanup')
+
+    generator = owned()
+    next(generator)
+    generator.close()
+    checks['stream_owner'].check(cleaned == ['cleanup'], lambda: f"{cleaned}")
+
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def check_registry() -> Dict[str, Dict[str, Any]]:
+    """
+        Checks the process-wide registry: timers of one name (decorated, sampled and context manager blocks)
+        merged into one summary, a Prometheus exporter without sources exporting the registry
+        and the rows of the dashboard table.
+    """
+    checks: Dict[str, CheckCounter] = {name: CheckCounter() for name in (
+        'registry_merge', 'registry_top', 'registry_exporter', 'registry_dashboard')}
+
+    @ExecutionTimer(display_time=False, name='registry.check')
+    def decorated() -> None:
+        pass
+
+    @ExecutionTimer(lean=True, every_n=10, name='registry.check')
+    def sampled() -> None:
+        pass
+
+    for _ in range(30):
+        decorated()
+    for _ in range(1000):
+        sampled()
+    for _ in range(5):
+        with ExecutionTimer(display_time=False, name='registry.check'):
+            pass
+    with ExecutionTimer(display_time=False, name='registry.slow'):
+        sleep(0.01)
+
+    summaries: Dict[str, TimerSummary] = TIMER_REGISTRY.summaries()
+    merged: Optional[TimerSummary] = summaries.get('registry.check')
+    checks['registry_merge'].check(merged is not None and merged.count == 30 + 1000 + 5, lambda: f"{merged}")
+    checks['registry_merge'].check(
+        merged is not None and merged.total_ns == decorated.stats.summary().total_ns
+        + sampled.stats.summary().total_ns + TIMER_REGISTRY.block_stats('registry.check').total_ns,
+        lambda: "total is not the sum of the timers")
+    slowest: TimerSummary = TIMER_REGISTRY.top(1, key='max_ns')[0]
+    checks['registry_top'].check(slowest.max_ns >= summaries['registry.slow'].max_ns >= 10_000_000,
+                                 lambda: f"{slowest}")
+
+    exporter: PrometheusExporter = PrometheusExporter()
+    exposition: str = exporter.render()
+    checks['registry_exporter'].check(
+        f'execution_timer_duration_seconds_count{{timer="registry.check"}} {merged.count if merged else -1}'
+        in exposition, lambda: "registry.check is not exported")
+
+    dashboard: TimerDashboard = TimerDashboard(top=2, sort='max_ns')
+    rows: int = dashboard.render().row_count
+    checks['registry_dashboard'].check(rows == 2, lambda: f"{rows} rows")
+    return {name: check.as_dict() for name, check in checks.items()}
+
+
+def main() -> None:
+    """
+        Runs the harness from the command line, prints the report and exits with 1 on failures or regressions.
+    """
+    parser: ArgumentParser = ArgumentParser(description="NumberInWords correctness and throughput harness")
+    parser.add_argument('--count', type=int, default=10_000, help="random inputs per check")
+    parser.add_argument('--repeat', type=int, default=5, help="benchmark runs, the best one is reported")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', dest='json_path', help="save the report to this JSON file")
+    parser.add_argument('--baseline', help="JSON report to compare the throughput with")
+    parser.add_argument('--tolerance', type=float, default=0.10, help="allowed slowdown, 0.10 - 10%%")
+    parser.add_argument('--release', action='store_true', help="run the release benchmarks instead")
+    parser.add_argument('--release-baseline', help="JSON file with the release benchmark baseline")
+    parser.add_argument('--update-baseline', action='store_true', help="store the results in the baseline")
+    parser.add_argument('--timers', action='store_true',
+                        help="run the ExecutionTimer checks instead")
+    args: Namespace = parser.parse_args()
+
+    if args.timers:
+        results: Dict[str, Dict[str, Any]] = {
+            **check_timer_stats(), **check_spans(), **check_async_timers(), **check_lean_timer(),
+            **check_sampling(), **check_metrics(), **check_profile_dumps(), **check_exporters(),
+            **check_history(), **check_streams(), **check_registry()}
+        for name, result in results.items():
+            print(f"{name}: {result['cases']} cases, {result['failures']} failures")
+            for example in result.get('examples', []):
+                print(f"    {example}")
+        sys.exit(1 if any(result['failures'] for result in results.values()) else 0)
+
+    if args.release:
+        bench_results: List[BenchResult] = release_benchmarks(
+            args.release_baseline, args.tolerance, args.update_baseline)
+        sys.exit(1 if any(result.regression for result in bench_results) else 0)
+
+    report: Dict[str, Any] = run_harness(args.count, args.repeat, args.seed)
+    failed: bool = False
+    for name, result in report['correctness'].items():
+        print(f"{name}: {result['cases']} cases, {result['failures']} failures")
+        for example in result.get('examples', []):
+            print(f"    {example}")
+        failed = failed or result['failures'] > 0
+    for name, result in report['throughput'].items():
+        print(f"{name}: {result['ns_per_item']:.0f} ns/item ({result['items_per_second']:.0f}/s)")
+
+    if args.json_path:
+        save_report(report, args.json_path)
+    if args.baseline:
+        for regression in compare_reports(report, load_report(args.baseline), args.tolerance):
+            print(f"Regression: {regression}")
+            failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -17,10 +17,23 @@
         print(chunks)
         ['This is', ' a', 'sample text', '.', 'It has',
             ' multiple', 'sentences.', 'We will', ' chunk', 'it.']
+
+        # Single-pass chunking of a file with numbers expanded into words (limit applies after expansion)
+        from utils.number_in_words import NumberInWords
+        with open('book.txt', encoding='utf-8') as book:
+            for chunk in chunk_text_stream(book, method='char', limit=750,
+                                           normalize=NumberInWords().convert_numbers_in_text):
+                print(chunk)
 """
 
 import re
-from typing import List, Dict, Optional, Pattern, Union
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Pattern, Union
+
+
+PARAGRAPH_SEPARATOR: str = '((?:\r?\n\s*){2,})'
+SENTENCE_SEPARATOR: str = '([.!?]+[\s\u200b]+|…\s+)'
+# Every character a paragraph or sentence separator can consist of (all of \s, \u200b and .!?…)
+SEPARATOR_CHARS: str = ''.join(char for char in map(chr, range(0x3001)) if re.match('[\\s\u200b.!?…]', char))
 
 
 class LatinPunctuator:
@@ -39,7 +52,7 @@ class LatinPunctuator:
             Returns:
                 List of paragraph strings
         """
-        return self._recombine(re.split('((?:\r?\n\s*){2,})', text))
+        return self._recombine(re.split(PARAGRAPH_SEPARATOR, text))
 
     def getSentences(self, text: str) -> List[str]:
         """
@@ -52,7 +65,68 @@ class LatinPunctuator:
             Returns:
                 List of sentence strings
         """
-        return self._recombine(re.split('([.!?]+[\s\u200b]+|…\s+)', text), r'\b(\w|[A-Z][a-z]|Assn|Ave|Capt|Col|Comdr|Corp|Cpl|Gen|Gov|Hon|Inc|Lieut|Ltd|Rev|Mr|Ms|Mrs|Dr|No|Univ|Jan|Feb|Mar|Apr|Aug|Sept|Oct|Nov|Dec|dept|ed|est|vol|vs)\.\s+$')
+        return self._recombine(re.split(SENTENCE_SEPARATOR, text), r'\b(\w|[A-Z][a-z]|Assn|Ave|Capt|Col|Comdr|Corp|Cpl|Gen|Gov|Hon|Inc|Lieut|Ltd|Rev|Mr|Ms|Mrs|Dr|No|Univ|Jan|Feb|Mar|Apr|Aug|Sept|Oct|Nov|Dec|dept|ed|est|vol|vs)\.\s+$')
+
+    def iterParagraphs(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+            Split a stream of text into paragraphs, yielding each one as soon as it is complete.
+
+            Args:
+                chunks: Iterable of text pieces (lines or buffers of any size)
+
+            Returns:
+                Iterator of paragraph strings, the same as getParagraphs on the joined text
+        """
+        return self._iterSplit(chunks, re.compile(PARAGRAPH_SEPARATOR), self.getParagraphs)
+
+    def iterSentences(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+            Split a stream of text into sentences, yielding each one as soon as it is complete.
+
+            Args:
+                chunks: Iterable of text pieces (lines or buffers of any size)
+
+            Returns:
+                Iterator of sentence strings, the same as getSentences on the joined text
+        """
+        return self._iterSplit(chunks, re.compile(SENTENCE_SEPARATOR), self.getSentences)
+
+    def _iterSplit(self, chunks: Iterable[str], separator: Pattern, split: Callable[[str], List[str]]) -> Iterator[str]:
+        """
+            Buffer a stream of text and split it after the last separator that cannot grow any more
+            (one followed by other text), keeping the rest for the next chunk.
+            Only the new chunk and the run of SEPARATOR_CHARS before it are searched, as a separator can
+            begin nowhere else; the text since the last cut is kept as a list of pieces and joined once.
+
+            Args:
+                chunks: Iterable of text pieces
+                separator: Compiled separator pattern used by split, matching only SEPARATOR_CHARS
+                split: Method splitting a complete piece of text
+
+            Returns:
+                Iterator of text segments
+        """
+        parts: List[str] = []
+        tail: str = ''
+        for chunk in chunks:
+            tail += chunk
+            cut: int = 0
+            for match in separator.finditer(tail):
+                if match.end() < len(tail):
+                    cut = match.end()
+            if cut:
+                parts.append(tail[:cut])
+                yield from split(''.join(parts))
+                parts = []
+                tail = tail[cut:]
+            keep: int = len(tail.rstrip(SEPARATOR_CHARS))
+            if keep:
+                parts.append(tail[:keep])
+                tail = tail[keep:]
+        parts.append(tail)
+        rest: str = ''.join(parts)
+        if rest:
+            yield from split(rest)
 
     def getPhrases(self, sentence: str) -> List[str]:
         """
@@ -315,29 +389,38 @@ class CharBreaker:
             Returns:
                 List of merged chunks
         """
-        result: List[str] = []
-        group: Dict[str, Union[List[str], int]] = {'parts': [], 'charCount': 0}
+        return list(self.iterMerge(parts, breakPart, combineThreshold))
 
-        def flush() -> None:
-            if group['parts']:
-                result.append(''.join(group['parts']))
-                group['parts'] = []
-                group['charCount'] = 0
+    def iterMerge(self, parts: Iterable[str], breakPart: callable, combineThreshold: Optional[int] = None) -> Iterator[str]:
+        """
+            Merge a stream of text parts into character-limited chunks, yielding each chunk once it is full.
+
+            Args:
+                parts: Iterable of text parts to merge
+                breakPart: Function to break oversized parts
+                combineThreshold: Optional threshold for combining chunks
+
+            Returns:
+                Iterator of merged chunks
+        """
+        group: Dict[str, Union[List[str], int]] = {'parts': [], 'charCount': 0}
 
         for part in parts:
             charCount: int = len(part)
             if charCount > self.charLimit:
-                flush()
-                subParts: List[str] = breakPart(part)
-                for subPart in subParts:
-                    result.append(subPart)
+                if group['parts']:
+                    yield ''.join(group['parts'])
+                    group = {'parts': [], 'charCount': 0}
+                yield from breakPart(part)
             else:
                 if (group['charCount'] + charCount) > (combineThreshold or self.charLimit):
-                    flush()
+                    if group['parts']:
+                        yield ''.join(group['parts'])
+                        group = {'parts': [], 'charCount': 0}
                 group['parts'].append(part)
                 group['charCount'] += charCount
-        flush()
-        return result
+        if group['parts']:
+            yield ''.join(group['parts'])
 
 
 def chunk_text(text: str, method: str = 'char', limit: int = 750) -> List[str]:
@@ -356,13 +439,11 @@ def chunk_text(text: str, method: str = 'char', limit: int = 750) -> List[str]:
             >>> text = "This is a sample text. It has multiple sentences. We will chunk it."
             >>> chunks = chunk_text(text, method='char', limit=20)
             >>> print(chunks)
-            ['This is a sample', 'text.', 'It has multiple',
-                'sentences.', 'We will chunk it.']
+            ['This is a sample ', 'text.', 'It has multiple ', 'sentences.', 'We will chunk it.']
 
             >>> chunks = chunk_text(text, method='word', limit=3)
             >>> print(chunks)
-            ['This is', ' a', 'sample text', '.', 'It has',
-                ' multiple', 'sentences.', 'We will', ' chunk', 'it.']
+            ['This is', ' a ', 'sample text', '.', 'It has', ' multiple ', 'sentences.', 'We will', ' chunk ', 'it.']
     """
     punctuator: LatinPunctuator = LatinPunctuator()
     if method == 'char':
@@ -371,6 +452,49 @@ def chunk_text(text: str, method: str = 'char', limit: int = 750) -> List[str]:
         return WordBreaker(limit, punctuator).breakText(text)
 
 
+def chunk_text_stream(chunks: Union[str, Iterable[str]], method: str = 'char', limit: int = 750,
+                      normalize: Optional[Callable[[str], str]] = None) -> Iterator[str]:
+    """
+        Split a stream of text into chunks in a single pass, optionally normalizing it on the way
+        (e.g. expanding numbers into words for TTS). Each paragraph (char method) or sentence (word method)
+        is normalized as soon as it is read and measured after normalization, so chunks respect the limit
+        of the expanded text. The result is the same as chunk_text(normalize(text)), without building
+        the whole normalized text.
+
+        Args:
+            chunks: Input text, or an iterable of text pieces (e.g. an open file)
+            method: Chunking method ('char' or 'word')
+            limit: Maximum chunk size (in characters or words) after normalization
+            normalize: Optional function applied to every paragraph or sentence before chunking;
+                it must not add or remove line breaks
+
+        Returns:
+            Iterator of text chunks
+
+        Examples:
+            >>> from utils.number_in_words import NumberInWords
+            >>> pieces = ['Jan ma 2 ko', 'ty. Ala ma 15 lat.']  # e.g. an open file
+            >>> list(chunk_text_stream(pieces, method='char', limit=20,
+            ...                        normalize=NumberInWords().convert_numbers_in_text))
+            ['Jan ma dwa koty. ', 'Ala ma piętnaście ', 'lat.']
+    """
+    if isinstance(chunks, str):
+        chunks = [chunks]
+    punctuator: LatinPunctuator = LatinPunctuator()
+    if method == 'char':
+        parts: Iterator[str] = punctuator.iterParagraphs(chunks)
+        if normalize:
+            parts = map(normalize, parts)
+        breaker: CharBreaker = CharBreaker(limit, punctuator)
+        return breaker.iterMerge(parts, breaker.breakParagraph, breaker.paragraphCombineThreshold)
+    elif method == 'word':
+        parts: Iterator[str] = punctuator.iterSentences(chunks)
+        if normalize:
+            parts = map(normalize, parts)
+        breaker: WordBreaker = WordBreaker(limit, punctuator)
+        return (phrase for sentence in parts for phrase in breaker.breakSentence(sentence))
+
+
 def main() -> None:
     """
         Test chunk_text function with sample text
@@ -0,0 +1,135 @@
+"""
+    Module timer_dashboard shows the hottest timers of the process in a live rich table:
+        every ExecutionTimer reports into TIMER_REGISTRY, the dashboard redraws the top N names
+        by total time (or calls, p95, ...) a few times a minute, so it can stay on during long batch jobs.
+    It uses the console and the theme of utils.rich_styles.
+
+    Examples:
+        # Live view while the job runs (the EXECUTION TIME boxes of the timers are silenced meanwhile)
+        with TimerDashboard(top=15, sort='total_ns', refresh_per_second=0.5):
+            run_batch_job()
+
+        # One table printed at the end
+        console.print(TimerDashboard(sort='p95_ns').render())
+"""
+
+from threading import Thread
+from typing import List, Optional
+
+from rich.live import Live
+from rich.table import Table
+
+from utils.execution_timer import TIMER_REGISTRY, TimerRegistry, TimerSummary, format_ns, silence_displays
+from utils.rich_styles import console
+
+
+class TimerDashboard:
+    """
+    TimerDashboard renders the top `top` names of a TimerRegistry sorted by a TimerSummary field
+    (total_ns, count, p95_ns, mean_ns, max_ns, ...) and keeps the table live with rich.Live.
+    The registry is read only on refresh, so a low refresh rate keeps the dashboard nearly free.
+
+    Examples:
+        with TimerDashboard(top=10, refresh_per_second=0.5) as dashboard:
+            for chunk in chunks:
+                synthesize(chunk)
+        console.print(dashboard.render())  # the last table
+    """
+
+    COLUMNS: List[str] = ['#', 'name', 'calls', 'total', 'share', 'mean', 'p50', 'p95', 'p99', 'max']
+
+    def __init__(self, registry: Optional[TimerRegistry] = None, top: int = 10, sort: str = 'total_ns',
+                 refresh_per_second: float = 0.5, quiet: bool = True, title: str = 'EXECUTION TIME') -> None:
+        if sort not in TimerSummary._fields:
+            raise ValueError(f"Unknown summary field: {sort}")
+        self.registry: TimerRegistry = registry or TIMER_REGISTRY
+        self.top: int = top
+        self.sort: str = sort
+        self.refresh_per_second: float = refresh_per_second
+        self.quiet: bool = quiet
+        self.title: str = title
+        self._live: Optional[Live] = None
+        self._silenced: bool = False
+
+    def render(self) -> Table:
+        """Returns the table of the hottest timers"""
+        summaries: List[TimerSummary] = list(self.registry.summaries().values())
+        all_total_ns: int = sum(summary.total_ns for summary in summaries) or 1
+        summaries.sort(key=lambda summary: getattr(summary, self.sort), reverse=True)
+        table: Table = Table(
+            title=f'[white_bold]{self.title}[/white_bold] [gray_bold]top {self.top} by {self.sort}',
+            border_style='ruby_red_bold', header_style='yellow_bold')
+        for column in self.COLUMNS:
+            table.add_column(column, justify='left' if column == 'name' else 'right',
+                             style='red_bold' if column == self._sort_column() else None)
+        for place, summary in enumerate(summaries[:self.top], 1):
+            table.add_row(
+                str(place), f'[white_bold]{summary.name}', f'{summary.count:,}', format_ns(summary.total_ns),
+                f'{summary.total_ns / all_total_ns:.1%}', format_ns(summary.mean_ns), format_ns(summary.p50_ns),
+                format_ns(summary.p95_ns), format_ns(summary.p99_ns), format_ns(summary.max_ns))
+        return table
+
+    def _sort_column(self) -> str:
+        return {'count': 'calls', 'total_ns': 'total', 'mean_ns': 'mean', 'p50_ns': 'p50', 'p95_ns': 'p95',
+                'p99_ns': 'p99', 'max_ns': 'max'}.get(self.sort, '')
+
+    def start(self) -> 'TimerDashboard':
+        """Starts the live table (rich refreshes it in its own thread)"""
+        if self._live is None:
+            if self.quiet:
+                self._silenced = not silence_displays(True)
+            self._live = Live(get_renderable=self.render, console=console,
+                              refresh_per_second=self.refresh_per_second)
+            self._live.start(refresh=True)
+        return self
+
+    def stop(self) -> None:
+        """Draws the table for the last time and stops the live view"""
+        if self._live is not None:
+            self._live.refresh()
+            self._live.stop()
+            self._live = None
+            if self._silenced:
+                silence_displays(False)
+                self._silenced = False
+
+    def __enter__(self) -> 'TimerDashboard':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+
+def main() -> None:
+    """
+        Example: a few threads of timed stages with the live dashboard on
+    """
+    import random
+    import time
+
+    from utils.execution_timer import ExecutionTimer
+
+    @ExecutionTimer(name='extract')
+    def extract(size: int) -> List[float]:
+        return sorted(random.random() for _ in range(size))
+
+    @ExecutionTimer(name='synthesize')
+    def synthesize(chunk: List[float]) -> None:
+        time.sleep(len(chunk) / 100_000)
+
+    def worker(seconds: float) -> None:
+        end: float = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            with ExecutionTimer(name='chunk'):
+                synthesize(extract(random.randrange(100, 5_000)))
+
+    with TimerDashboard(top=5, refresh_per_second=2):
+        threads: List[Thread] = [Thread(target=worker, args=(3,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+
+if __name__ == '__main__':
+    main()
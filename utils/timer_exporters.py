@@ -0,0 +1,364 @@
+"""
+    Module timer_exporters publishes the aggregated statistics of ExecutionTimers
+        as histograms with labels, for Prometheus (text exposition format, as a file
+        or a small local HTTP endpoint) and for StatsD (UDP).
+    Exporting runs in a background thread, timed code only updates its TimerStats.
+
+    Examples:
+        # Prometheus: http://127.0.0.1:9464/metrics and a file for the node_exporter textfile collector
+        @ExecutionTimer(display_time=False)
+        def synthesize(chunk):
+            ...
+
+        exporter = PrometheusExporter([synthesize], labels={'job': 'tts'}, port=9464,
+                                      path='working_space/output/timers.prom', interval=15)
+        exporter.start()
+        ...
+        exporter.stop()
+
+        # StatsD (DogStatsD tags are added when labels are given)
+        with StatsDExporter([synthesize], host='127.0.0.1', port=8125, interval=10):
+            ...
+
+        # Without sources every timer of the process is exported, one series per name (TIMER_REGISTRY)
+        with PrometheusExporter(port=9464):
+            ...
+"""
+
+import os
+import socket
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Lock, Thread
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from utils.execution_timer import TIMER_REGISTRY, ExecutionTimer, TimerStats
+
+
+# Upper bounds of the Prometheus histogram buckets in seconds
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0
+)
+
+Source = Union[ExecutionTimer, TimerStats, Any]
+
+
+def collect_stats(sources: Iterable[Source]) -> List[TimerStats]:
+    """
+        Returns the TimerStats of the sources: ExecutionTimers (all functions they decorate),
+        decorated functions (their `stats`) and TimerStats themselves.
+    """
+    collected: List[TimerStats] = []
+    for source in sources:
+        if isinstance(source, TimerStats):
+            collected.append(source)
+        elif isinstance(source, ExecutionTimer):
+            collected.extend(source.stats.values())
+        elif isinstance(getattr(source, 'stats', None), TimerStats):
+            collected.append(source.stats)
+        else:
+            raise TypeError(f"Not a timer source: {source!r}")
+    return collected
+
+
+def _escape_label(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    return '{' + ','.join(f'{key}="{_escape_label(str(value))}"' for key, value in labels.items()) + '}'
+
+
+class _BackgroundExporter(ABC):
+    """
+        Base of the exporters: keeps the sources and calls `flush` every `interval` seconds in a daemon thread.
+        Without sources all timers of TIMER_REGISTRY are exported, merged by name.
+    """
+
+    def __init__(self, sources: Optional[Iterable[Source]] = None, labels: Optional[Dict[str, str]] = None,
+                 interval: float = 10.0) -> None:
+        self.sources: List[Source] = list(sources or [])
+        self.labels: Dict[str, str] = dict(labels or {})
+        self.interval: float = interval
+        self._stop: Event = Event()
+        self._thread: Optional[Thread] = None
+        self._lock: Lock = Lock()
+
+    def add(self, source: Source) -> None:
+        """Adds an ExecutionTimer, a decorated function or a TimerStats to export"""
+        with self._lock:
+            self.sources.append(source)
+
+    def stats(self) -> List[TimerStats]:
+        with self._lock:
+            if not self.sources:
+                return TIMER_REGISTRY.all_stats()
+            return collect_stats(self.sources)
+
+    @abstractmethod
+    def flush(self) -> None:
+        """Exports what the timers measured"""
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def start(self) -> '_BackgroundExporter':
+        """Starts flushing in a background thread"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = Thread(target=self._run, name=type(self).__name__, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the background thread and flushes for the last time"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def __enter__(self) -> '_BackgroundExporter':
+        return self.start()
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.stop()
+
+
+class PrometheusExporter(_BackgroundExporter):
+    """
+    PrometheusExporter renders the timers in the Prometheus text exposition format:
+    a histogram `<namespace>_duration_seconds` with the label `timer` (plus the given labels)
+    and counters of the optional metrics (process/thread CPU seconds, RSS bytes).
+
+    With `path` the text is rewritten atomically every `interval` seconds (textfile collector),
+    with `port` it is served at http://host:port/metrics (port 0 - a free port, see `port`).
+
+    Examples:
+        >>> @ExecutionTimer(display_time=False, name='work')
+        ... def work():
+        ...     pass
+        >>> work()
+        >>> exporter = PrometheusExporter([work], labels={'job': 'tts'})
+        >>> print(exporter.render().splitlines()[1])
+        # TYPE execution_timer_duration_seconds histogram
+        >>> [line for line in exporter.render().splitlines() if line.startswith('execution_timer_duration_seconds_c')]
+        ['execution_timer_duration_seconds_count{job="tts",timer="work"} 1']
+    """
+
+    def __init__(self, sources: Optional[Iterable[Source]] = None, labels: Optional[Dict[str, str]] = None,
+                 buckets: Iterable[float] = DEFAULT_BUCKETS, namespace: str = 'execution_timer',
+                 path: Optional[str] = None, port: Optional[int] = None, host: str = '127.0.0.1',
+                 interval: float = 15.0) -> None:
+        super().__init__(sources, labels, interval)
+        self.buckets: List[float] = sorted(buckets)
+        self.namespace: str = namespace
+        self.path: Optional[str] = path
+        self.host: str = host
+        self.port: Optional[int] = port
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._server_thread: Optional[Thread] = None
+
+    def render(self) -> str:
+        """Returns the current statistics in the text exposition format"""
+        duration: str = f'{self.namespace}_duration_seconds'
+        lines: List[str] = [f'# HELP {duration} Duration of timed calls.', f'# TYPE {duration} histogram']
+        counters: Dict[str, List[str]] = {}
+        bounds_ns: List[int] = [round(bound * 1_000_000_000) for bound in self.buckets]
+        for stats in self.stats():
+            summary = stats.summary()
+            scale: float = 1 / stats.sample_rate
+            labels: Dict[str, str] = {**self.labels, 'timer': stats.name}
+            histogram: List[Tuple[int, int]] = stats.buckets()
+            cumulative: int = 0
+            position: int = 0
+            for bound, bound_ns in zip(self.buckets, bounds_ns):
+                while position < len(histogram) and histogram[position][0] <= bound_ns:
+                    cumulative += histogram[position][1]
+                    position += 1
+                lines.append(f'{duration}_bucket{_format_labels({**labels, "le": repr(bound)})} '
+                             f'{round(cumulative * scale)}')
+            lines.append(f'{duration}_bucket{_format_labels({**labels, "le": "+Inf"})} {summary.count}')
+            lines.append(f'{duration}_sum{_format_labels(labels)} {summary.total_ns / 1_000_000_000!r}')
+            lines.append(f'{duration}_count{_format_labels(labels)} {summary.count}')
+            for key, value in summary.metrics.items():
+                if key.endswith('_ns'):
+                    metric, number = f'{self.namespace}_{key[:-3]}_seconds_total', value / 1_000_000_000
+                elif key == 'memory_peak_bytes':
+                    metric, number = f'{self.namespace}_{key}', value
+                else:
+                    metric, number = f'{self.namespace}_{key}_total', value
+                counters.setdefault(metric, []).append(f'{metric}{_format_labels(labels)} {number!r}')
+        for metric, samples in counters.items():
+            kind: str = 'gauge' if metric.endswith('_memory_peak_bytes') else 'counter'
+            lines.append(f'# TYPE {metric} {kind}')
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+    def flush(self) -> None:
+        """Rewrites the file (if any) with the current statistics"""
+        if self.path is None:
+            return
+        directory: str = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        temporary: str = self.path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            file.write(self.render())
+        os.replace(temporary, self.path)
+
+    def start(self) -> 'PrometheusExporter':
+        """Starts the file flushing thread (with `path`) and the HTTP endpoint (with `port`)"""
+        if self.path is not None:
+            super().start()
+        if self.port is not None and self._server is None:
+            exporter: PrometheusExporter = self
+
+            class MetricsHandler(BaseHTTPRequestHandler):
+                def do_GET(self) -> None:
+                    if self.path.split('?')[0] not in ('/', '/metrics'):
+                        self.send_error(404)
+                        return
+                    body: bytes = exporter.render().encode('utf-8')
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, format: str, *args: Any) -> None:
+                    pass
+
+            self._server = ThreadingHTTPServer((self.host, self.port), MetricsHandler)
+            self._server.daemon_threads = True
+            self.port = self._server.server_address[1]
+            self._server_thread = Thread(target=self._server.serve_forever, name='PrometheusEndpoint', daemon=True)
+            self._server_thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the HTTP endpoint and the flushing thread, writing the file for the last time"""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server_thread.join()
+            self._server = None
+            self._server_thread = None
+        super().stop()
+
+
+class StatsDExporter(_BackgroundExporter):
+    """
+    StatsDExporter sends what the timers measured since the previous flush over UDP:
+    the histogram as timings, one line per bucket with new calls standing for all of them through
+    its sample rate (`<prefix>.<timer>:<ms>|ms|@<rate>`), so a flush costs the same for ten calls or a million,
+    and the optional metrics as counters (the memory peak as a gauge).
+    Labels are sent as DogStatsD tags (`|#key:value`).
+
+    Examples:
+        with StatsDExporter([work], host='127.0.0.1', port=8125, prefix='tts', interval=10):
+            work()
+    """
+
+    MAX_PACKET: int = 1432
+
+    def __init__(self, sources: Optional[Iterable[Source]] = None, labels: Optional[Dict[str, str]] = None,
+                 host: str = '127.0.0.1', port: int = 8125, prefix: str = 'execution_timer',
+                 interval: float = 10.0) -> None:
+        super().__init__(sources, labels, interval)
+        self.address: Tuple[str, int] = (host, port)
+        self.prefix: str = prefix
+        self._sent: Dict[Union[int, str], Tuple[Dict[int, int], Dict[str, int]]] = {}
+        # Opened on the first send, so the exporter can be started again after `stop`
+        self._socket: Optional[socket.socket] = None
+
+    def _metric_name(self, name: str) -> str:
+        cleaned: str = ''.join(char if char.isalnum() or char in '-_' else '_' for char in name)
+        return f'{self.prefix}.{cleaned}'
+
+    def lines(self) -> List[str]:
+        """Returns the StatsD lines of everything measured since the previous call"""
+        tags: str = ('|#' + ','.join(f'{key}:{value}' for key, value in self.labels.items())) if self.labels else ''
+        lines: List[str] = []
+        # The registry merges into new TimerStats on every read, their names are the stable keys
+        by_name: bool = not self.sources
+        for stats in self.stats():
+            summary = stats.summary()
+            key: Union[int, str] = stats.name if by_name else id(stats)
+            previous_buckets, previous_metrics = self._sent.get(key, ({}, {}))
+            name: str = self._metric_name(stats.name)
+            buckets: Dict[int, int] = dict(stats.buckets())
+            timed: bool = False
+            for value_ns, total in buckets.items():
+                calls: int = total - previous_buckets.get(value_ns, 0)
+                if calls > 0:
+                    timed = True
+                    rate: float = stats.sample_rate / calls
+                    sampled: str = f'|@{rate:.6g}' if rate < 1 else ''
+                    lines.append(f'{name}:{value_ns / 1_000_000:.6g}|ms{sampled}{tags}')
+            for metric, value in summary.metrics.items():
+                delta: int = value - previous_metrics.get(metric, 0)
+                if metric == 'memory_peak_bytes':
+                    if timed:
+                        lines.append(f'{name}.{metric}:{value}|g{tags}')
+                elif delta:
+                    lines.append(f'{name}.{metric}:{delta}|c{tags}')
+            self._sent[key] = (buckets, dict(summary.metrics))
+        return lines
+
+    def flush(self) -> None:
+        """Sends the new measurements in packets of at most MAX_PACKET bytes"""
+        packet: List[bytes] = []
+        size: int = 0
+        for line in self.lines():
+            data: bytes = line.encode('utf-8')
+            if packet and size + len(data) + 1 > self.MAX_PACKET:
+                self._send(b'\n'.join(packet))
+                packet, size = [], 0
+            packet.append(data)
+            size += len(data) + 1
+        if packet:
+            self._send(b'\n'.join(packet))
+
+    def _send(self, data: bytes) -> None:
+        if self._socket is None:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            self._socket.sendto(data, self.address)
+        except OSError:  # StatsD is fire and forget, a missing server must not break the timed code
+            pass
+
+    def stop(self) -> None:
+        super().stop()
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+
+
+def main() -> None:
+    """
+        Example: exports a decorated function to a file, a local HTTP endpoint and StatsD
+    """
+    import time
+    from urllib.request import urlopen
+
+    @ExecutionTimer(display_time=False, measure_process_time=True)
+    def work(delay: float) -> None:
+        time.sleep(delay)
+
+    with PrometheusExporter([work], labels={'job': 'example'}, port=0, interval=1) as exporter:
+        for i in range(20):
+            work(0.001 * i)
+        with urlopen(f'http://127.0.0.1:{exporter.port}/metrics') as response:
+            print(response.read().decode('utf-8'))
+
+    receiver: socket.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(('127.0.0.1', 0))
+    with StatsDExporter([work], port=receiver.getsockname()[1], labels={'job': 'example'}, interval=60):
+        work(0.002)
+    print(receiver.recv(65536).decode('utf-8'))
+    receiver.close()
+
+
+if __name__ == '__main__':
+    main()
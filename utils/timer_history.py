@@ -0,0 +1,364 @@
+"""
+    Module timer_history keeps the finished measurements of ExecutionTimers in a local SQLite database
+        (name, tags, start, duration, CPU time) and reports per-name trends, percentiles over time
+        and the slowest runs, so runs of different days can be compared without external services.
+    Rows are inserted in batches by a background writer thread, timed code only puts them in a queue.
+
+    Examples:
+        # Recording (every finished call of the timer is one row, CPU time is measured too)
+        history = TimerHistory('working_space/output/timer_history.sqlite3')
+
+        @ExecutionTimer(display_time=False, history=history, tags={'stage': 'tts'})
+        def synthesize(chunk):
+            ...
+
+        with ExecutionTimer(name='pipeline', history=history, tags={'book': 'pan_tadeusz'}):
+            ...
+        history.close()
+
+        # Reading
+        with TimerHistory('working_space/output/timer_history.sqlite3') as history:
+            for period in history.trends('synthesize', since=datetime.now() - timedelta(days=14), period='day'):
+                print(period.period, period.count, period.p50_ns, period.p95_ns)
+            print(history.slowest('synthesize', limit=5))
+            history.report(days=14)
+
+        # Command line
+        python -m utils.timer_history report --days 14 --period day --slowest 10
+        python -m utils.timer_history report --db timer_history.sqlite3 --name synthesize
+        python -m utils.timer_history demo
+"""
+
+import json
+import math
+import os
+import sqlite3
+from argparse import ArgumentParser, Namespace
+from datetime import datetime, timedelta
+from queue import Empty, SimpleQueue
+from threading import Event, Thread
+from time import monotonic
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from rich.console import Console
+from rich.table import Table
+
+from utils.execution_timer import format_ns
+
+try:
+    from constant.constant import WORKING_SPACE_OUTPUT
+except ImportError:  # run outside of the project root
+    WORKING_SPACE_OUTPUT = os.path.join(os.getcwd(), 'working_space', 'output')
+
+
+DEFAULT_HISTORY_PATH: str = os.path.join(WORKING_SPACE_OUTPUT, 'timer_history.sqlite3')
+
+# Period: strftime format of the SQLite grouping key
+PERIODS: Dict[str, str] = {
+    'hour': '%Y-%m-%d %H:00',
+    'day': '%Y-%m-%d',
+    'week': '%Y-W%W',
+    'month': '%Y-%m',
+}
+
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    start REAL NOT NULL,
+    duration_ns INTEGER NOT NULL,
+    cpu_ns INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_name_start ON runs (name, start);
+"""
+
+
+class HistoryPeriod(NamedTuple):
+    name: str
+    period: str
+    count: int
+    mean_ns: float
+    p50_ns: int
+    p95_ns: int
+    max_ns: int
+    cpu_ns: Optional[int]
+    change: Optional[float]
+
+
+class HistoryRun(NamedTuple):
+    name: str
+    tags: Dict[str, str]
+    start: datetime
+    duration_ns: int
+    cpu_ns: Optional[int]
+
+
+def _percentile(durations: List[int], percent: float) -> int:
+    """Returns the nearest-rank percentile of sorted durations"""
+    return durations[max(math.ceil(percent * len(durations) / 100) - 1, 0)] if durations else 0
+
+
+class TimerHistory:
+    """
+    TimerHistory appends measurements to a SQLite database through a background writer
+    and answers trend queries on it. The writer inserts up to `batch_size` rows in one transaction,
+    at least every `flush_interval` seconds, so a timed call only pays for a queue put.
+
+    Examples:
+        >>> history = TimerHistory(':memory:')
+        >>> history.record('work', {'stage': 'a'}, datetime.now(), 1_500_000, 1_000_000)
+        >>> history.flush()
+        >>> history.slowest('work')[0].duration_ns
+        1500000
+        >>> history.close()
+    """
+
+    def __init__(self, path: Optional[str] = None, batch_size: int = 500, flush_interval: float = 1.0) -> None:
+        self.path: str = path or DEFAULT_HISTORY_PATH
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # The writer owns the only connection, queries are sent to it like the rows
+        self._queue: SimpleQueue = SimpleQueue()
+        self._ready: Event = Event()
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[Thread] = Thread(target=self._run, name='TimerHistory', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:  # the database could not be opened
+            self._thread.join()
+            self._thread = None
+            raise self._error
+
+    def record(self, name: str, tags: Optional[Dict[str, Any]], start: Union[datetime, float, None],
+               duration_ns: int, cpu_ns: Optional[int] = None) -> None:
+        """
+            Queues one finished measurement.
+
+            Args:
+                - name - name of the timer
+                - tags - labels of the run, e.g. {'book': 'pan_tadeusz'}
+                - start - start of the run, a datetime or a Unix timestamp (None - now)
+                - duration_ns - wall time
+                - cpu_ns - process CPU time, if measured
+        """
+        if isinstance(start, datetime):
+            start = start.timestamp()
+        elif start is None:
+            start = datetime.now().timestamp()
+        self._queue.put((name, json.dumps(tags or {}, sort_keys=True, default=str), start, duration_ns, cpu_ns))
+
+    def _run(self) -> None:
+        """The writer: opens the database and writes the rows, the error that stops it is kept for the callers"""
+        connection: Optional[sqlite3.Connection] = None
+        try:
+            connection = sqlite3.connect(self.path)
+            if self.path != ':memory:':
+                connection.execute('PRAGMA journal_mode=WAL')
+            connection.executescript(SCHEMA)
+            self._ready.set()
+            self._write(connection)
+        except BaseException as error:
+            self._error = error
+        finally:
+            self._ready.set()
+            if connection is not None:
+                connection.close()
+
+    def _write(self, connection: sqlite3.Connection) -> None:
+        """Writes the queued rows in batches and answers the queries until close"""
+        rows: List[Tuple[Any, ...]] = []
+        deadline: float = 0.0
+        running: bool = True
+        while running:
+            try:
+                item: Any = self._queue.get(timeout=max(deadline - monotonic(), 0) if rows else None)
+            except Empty:
+                item = ()
+            if isinstance(item, tuple) and item:
+                if not rows:
+                    deadline = monotonic() + self.flush_interval
+                rows.append(item)
+                if len(rows) < self.batch_size:
+                    continue
+            if rows:
+                connection.executemany(
+                    'INSERT INTO runs (name, tags, start, duration_ns, cpu_ns) VALUES (?, ?, ?, ?, ?)', rows)
+                connection.commit()
+                rows = []
+            if item is None:
+                running = False
+            elif isinstance(item, list):
+                # A query: [sql, parameters, reply event], the result or the error is appended
+                sql, parameters, done = item
+                try:
+                    item.append(connection.execute(sql, parameters).fetchall())
+                except sqlite3.Error as error:
+                    item.append(error)
+                done.set()
+
+    def flush(self) -> None:
+        """Waits until all queued measurements are written"""
+        self._query('SELECT 1', ())
+
+    def _query(self, sql: str, parameters: Tuple[Any, ...]) -> List[Tuple[Any, ...]]:
+        """Runs a query on the writer connection after the rows queued before it are written"""
+        if self._thread is None:
+            raise RuntimeError("TimerHistory is closed")
+        request: List[Any] = [sql, parameters, Event()]
+        self._queue.put(request)
+        while not request[2].wait(0.1):
+            if not self._thread.is_alive():
+                raise RuntimeError(f"TimerHistory writer stopped: {self._error!r}") from self._error
+        if isinstance(request[3], sqlite3.Error):
+            raise request[3]
+        return request[3]
+
+    def close(self) -> None:
+        """Writes the queued measurements and stops the writer"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> 'TimerHistory':
+        return self
+
+    def __exit__(self, exc_type: Any, exc_val: Any, exc_tb: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def _where(name: Optional[str], since: Optional[datetime], until: Optional[datetime]
+               ) -> Tuple[str, Tuple[Any, ...]]:
+        conditions: List[str] = []
+        parameters: List[Any] = []
+        if name is not None:
+            conditions.append('name = ?')
+            parameters.append(name)
+        if since is not None:
+            conditions.append('start >= ?')
+            parameters.append(since.timestamp())
+        if until is not None:
+            conditions.append('start < ?')
+            parameters.append(until.timestamp())
+        return (' WHERE ' + ' AND '.join(conditions) if conditions else ''), tuple(parameters)
+
+    def names(self) -> List[str]:
+        """Returns the recorded timer names"""
+        return [row[0] for row in self._query('SELECT DISTINCT name FROM runs ORDER BY name', ())]
+
+    def trends(self, name: Optional[str] = None, since: Optional[datetime] = None, until: Optional[datetime] = None,
+               period: str = 'day') -> List[HistoryPeriod]:
+        """
+            Returns the runs of every name grouped by hour, day, week or month (local time):
+            count, mean, p50, p95, max, total CPU time and the change of p50 against the previous period.
+        """
+        if period not in PERIODS:
+            raise ValueError(f"Unknown period: {period}, expected one of {', '.join(PERIODS)}")
+        where, parameters = self._where(name, since, until)
+        rows: List[Tuple[Any, ...]] = self._query(
+            f"SELECT name, strftime(?, start, 'unixepoch', 'localtime') AS period, duration_ns, cpu_ns "
+            f"FROM runs{where} ORDER BY name, period, duration_ns", (PERIODS[period], *parameters))
+
+        groups: Dict[Tuple[str, str], Tuple[List[int], List[int]]] = {}
+        for row_name, row_period, duration_ns, cpu_ns in rows:
+            durations, cpu = groups.setdefault((row_name, row_period), ([], []))
+            durations.append(duration_ns)
+            if cpu_ns is not None:
+                cpu.append(cpu_ns)
+
+        periods: List[HistoryPeriod] = []
+        previous: Dict[str, int] = {}
+        for (row_name, row_period), (durations, cpu) in groups.items():
+            p50_ns: int = _percentile(durations, 50)
+            before: Optional[int] = previous.get(row_name)
+            periods.append(HistoryPeriod(
+                name=row_name, period=row_period, count=len(durations),
+                mean_ns=sum(durations) / len(durations), p50_ns=p50_ns, p95_ns=_percentile(durations, 95),
+                max_ns=durations[-1], cpu_ns=sum(cpu) if cpu else None,
+                change=p50_ns / before - 1 if before else None))
+            previous[row_name] = p50_ns
+        return periods
+
+    def slowest(self, name: Optional[str] = None, since: Optional[datetime] = None,
+                until: Optional[datetime] = None, limit: int = 10) -> List[HistoryRun]:
+        """Returns the slowest runs, the slowest first"""
+        where, parameters = self._where(name, since, until)
+        rows: List[Tuple[Any, ...]] = self._query(
+            f'SELECT name, tags, start, duration_ns, cpu_ns FROM runs{where} ORDER BY duration_ns DESC LIMIT ?',
+            (*parameters, limit))
+        return [HistoryRun(row_name, json.loads(tags), datetime.fromtimestamp(start), duration_ns, cpu_ns)
+                for row_name, tags, start, duration_ns, cpu_ns in rows]
+
+    def report(self, name: Optional[str] = None, days: Optional[float] = 7, period: str = 'day',
+               limit: int = 10, console: Optional[Console] = None) -> None:
+        """
+            Prints the trends of the last `days` (None - all) and the slowest runs as rich tables.
+        """
+        console = console or Console()
+        since: Optional[datetime] = datetime.now() - timedelta(days=days) if days is not None else None
+
+        trends: Table = Table(title=f'EXECUTION TIME TRENDS (per {period})', title_style='bold white')
+        for column in ('name', period, 'runs', 'mean', 'p50', 'p95', 'max', 'CPU', 'p50 change'):
+            trends.add_column(column, justify='left' if column in ('name', period) else 'right')
+        for row in self.trends(name, since, period=period):
+            change: str = ''
+            if row.change is not None:
+                change = f"[{'bright_red' if row.change > 0 else 'green'} bold]{row.change:+.1%}"
+            trends.add_row(row.name, row.period, str(row.count), format_ns(row.mean_ns), format_ns(row.p50_ns),
+                           format_ns(row.p95_ns), format_ns(row.max_ns),
+                           format_ns(row.cpu_ns) if row.cpu_ns is not None else '', change)
+        console.print(trends)
+
+        slowest: Table = Table(title='SLOWEST RUNS', title_style='bold white')
+        for column in ('name', 'start', 'time', 'CPU', 'tags'):
+            slowest.add_column(column, justify='right' if column in ('time', 'CPU') else 'left')
+        for run in self.slowest(name, since, limit=limit):
+            slowest.add_row(run.name, f'{run.start:%Y-%m-%d %H:%M:%S}', format_ns(run.duration_ns),
+                            format_ns(run.cpu_ns) if run.cpu_ns is not None else '',
+                            ', '.join(f'{key}={value}' for key, value in run.tags.items()))
+        console.print(slowest)
+
+
+def main() -> None:
+    """
+        Command line: `report` prints the trends and the slowest runs, `demo` records a few runs and reports them
+    """
+    parser: ArgumentParser = ArgumentParser(description="Trends and slowest runs of the ExecutionTimer history.")
+    parser.add_argument('command', nargs='?', choices=('report', 'demo'), default='report')
+    parser.add_argument('--db', default=DEFAULT_HISTORY_PATH, help="path of the SQLite database")
+    parser.add_argument('--name', help="only this timer")
+    parser.add_argument('--days', type=float, default=7, help="only the last days (0 - all)")
+    parser.add_argument('--period', choices=tuple(PERIODS), default='day', help="grouping of the trends")
+    parser.add_argument('--slowest', type=int, default=10, help="number of the slowest runs")
+    args: Namespace = parser.parse_args()
+
+    if args.command == 'demo':
+        import random
+        import time
+
+        from utils.execution_timer import ExecutionTimer
+
+        with TimerHistory(args.db) as history:
+            now: float = time.time()
+            for day in range(6, 0, -1):
+                for _ in range(50):
+                    duration_ns: int = int(random.lognormvariate(17 + day * -0.05, 0.3))
+                    history.record('synthesize', {'stage': 'tts'}, now - day * 86_400 + random.random() * 3_600,
+                                   duration_ns, duration_ns // 2)
+
+            @ExecutionTimer(display_time=False, name='sleep', history=history, tags={'stage': 'demo'})
+            def sleep() -> None:
+                time.sleep(random.random() / 100)
+
+            for _ in range(50):
+                sleep()
+
+    with TimerHistory(args.db) as history:
+        history.report(args.name, args.days or None, args.period, args.slowest)
+
+
+if __name__ == '__main__':
+    main()